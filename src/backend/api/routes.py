@@ -1,20 +1,43 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, Header, HTTPException
+from typing import List, Dict, Optional
 from datetime import datetime
 from ..services.data_service import DataIntegrationService
+from ..services.streaming import negotiate, stream_response
 
 router = APIRouter()
-service = DataIntegrationService()
+_service = None
+
+def get_service() -> DataIntegrationService:
+    """Integration service, built on the first request rather than at import"""
+    global _service
+    if _service is None:
+        _service = DataIntegrationService()
+    return _service
 
 @router.post("/analyze")
 async def analyze_data(
     ticker: str,
     location: str,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    series: Optional[str] = None,
+    accept: Optional[str] = Header(None)
 ):
+    fmt = negotiate(accept)
+    if fmt != "json":
+        # NDJSON carries every series; Arrow carries the one named by ?series= (the first available by default)
+        try:
+            summary, frames = await get_service().analysis_frames(
+                ticker, location, start_date, end_date
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        try:
+            return stream_response(fmt, summary, frames, series)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     try:
-        analysis_results = await service.perform_analysis(
+        analysis_results = await get_service().perform_analysis(
             ticker, location, start_date, end_date
         )
         return analysis_results
@@ -27,7 +50,7 @@ async def get_predictions(
     days: int = 7
 ):
     try:
-        predictions = await service.generate_future_predictions(ticker, days)
+        predictions = await get_service().generate_future_predictions(ticker, days)
         return predictions
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -35,7 +58,7 @@ async def get_predictions(
 @router.get("/weather-alerts/{location}")
 async def get_weather_alerts(location: str):
     try:
-        alerts = await service.get_weather_alerts(location)
+        alerts = await get_service().get_weather_alerts(location)
         return alerts
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
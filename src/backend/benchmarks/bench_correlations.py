@@ -0,0 +1,74 @@
+"""
+Scaling of CorrelationAnalyzer.batch_correlations with matrix size,
+compared with a per-column scipy.stats.pearsonr loop on the smallest size.
+
+    python -m src.backend.benchmarks.bench_correlations --days 2520 --sizes 50x10,200x50,1000x100
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ..services.correlation_service import CorrelationAnalyzer
+
+
+def synthetic_matrices(days: int, tickers: int, variables: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2015-01-01", periods=days)
+    weather = pd.DataFrame(
+        rng.normal(size=(days, variables)),
+        index=index,
+        columns=[f"city{i // 5}/var{i % 5}" for i in range(variables)],
+    )
+    returns = pd.DataFrame(
+        rng.normal(scale=0.01, size=(days, tickers)) + 0.001 * weather.iloc[:, :1].to_numpy(),
+        index=index,
+        columns=[f"T{i:04d}" for i in range(tickers)],
+    )
+    returns = returns.mask(rng.random(returns.shape) < 0.01)  # sprinkle missing bars
+    return returns, weather
+
+
+def loop_baseline(returns: pd.DataFrame, weather: pd.DataFrame):
+    for ticker in returns.columns:
+        for variable in weather.columns:
+            pair = pd.concat([returns[ticker], weather[variable]], axis=1).dropna()
+            stats.pearsonr(pair.iloc[:, 0], pair.iloc[:, 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--sizes", default="50x10,200x50,1000x100,2000x200")
+    parser.add_argument("--lags", default="0,1,2,3,5")
+    args = parser.parse_args()
+
+    analyzer = CorrelationAnalyzer()
+    lags = [int(lag) for lag in args.lags.split(",")]
+    sizes = [tuple(int(v) for v in size.split("x")) for size in args.sizes.split(",")]
+
+    print(f"days={args.days} lags={lags}")
+    print(f"{'tickers':>8} {'vars':>6} {'pairs':>10} {'batch_s':>9} {'pairs/s':>12} {'loop_s':>9}")
+    for i, (tickers, variables) in enumerate(sizes):
+        returns, weather = synthetic_matrices(args.days, tickers, variables)
+        start = time.perf_counter()
+        analyzer.batch_correlations(returns, weather, lags=lags)
+        batch_seconds = time.perf_counter() - start
+        pairs = tickers * variables * len(lags)
+
+        loop_column = ""
+        if i == 0:
+            start = time.perf_counter()
+            for lag in lags:
+                loop_baseline(returns, weather.shift(lag))
+            loop_column = f"{time.perf_counter() - start:>9.3f}"
+        print(
+            f"{tickers:>8} {variables:>6} {pairs:>10} {batch_seconds:>9.3f} "
+            f"{pairs / batch_seconds:>12.0f} {loop_column:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cold-start cost of the API process.
+
+Each repeat uses a fresh interpreter. It reports the time to import
+src.backend.main, the interpreter's peak RSS after the import, and which
+heavy libraries the import pulled in. With --serve it also starts the app
+under uvicorn and measures the time from spawn until /api/health and
+/api/ready first answer 200.
+
+    python -m src.backend.benchmarks.bench_import --repeats 5
+    python -m src.backend.benchmarks.bench_import --serve
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+HEAVY_MODULES = ["torch", "transformers", "sklearn", "scipy", "yfinance", "joblib"]
+
+PROBE = f"""
+import json, resource, sys, time
+start = time.perf_counter()
+import src.backend.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def bench_env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env["WEATHER_IMPACT_CACHE_DIR"] = os.path.join(workdir, "cache")
+    return env
+
+
+def measure_import(env: dict) -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_serve(env: dict, timeout: float) -> dict:
+    """Seconds from spawning uvicorn until each probe path first returns 200 (None if it never does)"""
+    port = free_port()
+    paths = {"/api/health": None, "/api/ready": None}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout and None in paths.values():
+            for path, seen in paths.items():
+                if seen is not None:
+                    continue
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                        if response.status == 200:
+                            paths[path] = time.perf_counter() - start
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    pass
+            time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {f"{path.rsplit('/', 1)[-1]}_s": seen for path, seen in paths.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--serve", action="store_true", help="also time uvicorn until /api/health and /api/ready answer")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="write the measurements as JSON")
+    args = parser.parse_args()
+
+    env = bench_env(tempfile.mkdtemp(prefix="bench-import-"))
+    measure_import(env)  # warm the OS page cache so repeats compare like with like
+    imports = [measure_import(env) for _ in range(args.repeats)]
+    report = {
+        "import_s": statistics.median(run["import_s"] for run in imports),
+        "rss_mb": statistics.median(run["rss_mb"] for run in imports),
+        "heavy_modules": imports[-1]["heavy"],
+    }
+    print(f"import src.backend.main: {report['import_s']:.3f}s (median of {args.repeats}), "
+          f"peak RSS {report['rss_mb']:.0f} MB")
+    print(f"heavy modules loaded at import: {', '.join(report['heavy_modules']) or 'none'}")
+
+    if args.serve:
+        serves = [measure_serve(env, args.timeout) for _ in range(args.repeats)]
+        for key in serves[0]:
+            values = [run[key] for run in serves if run[key] is not None]
+            report[key] = statistics.median(values) if values else None
+            shown = f"{report[key]:.3f}s" if report[key] is not None else "never (within timeout)"
+            print(f"spawn -> {key[:-2]} 200: {shown}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
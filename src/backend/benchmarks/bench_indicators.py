@@ -0,0 +1,79 @@
+"""
+IndicatorEngine over a wide (date x ticker) price array, compared with the
+per-ticker pandas approach on a subset, plus the append-one-bar mode.
+
+    python -m src.backend.benchmarks.bench_indicators --tickers 3000 --years 10
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..models.indicators import IndicatorEngine
+
+
+def synthetic_prices(days: int, tickers: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(days, tickers)), axis=0))
+    # Stagger listing dates and sprinkle missing bars like a real universe
+    listed = rng.integers(0, days // 4, size=tickers)
+    prices[np.arange(days)[:, None] < listed] = np.nan
+    prices[rng.random(prices.shape) < 0.001] = np.nan
+    return prices
+
+
+def pandas_per_ticker(prices: np.ndarray):
+    for column in range(prices.shape[1]):
+        close = pd.Series(prices[:, column]).ffill()
+        df = pd.DataFrame({"Close": close})
+        df["sma_20"] = close.rolling(20).mean()
+        df["sma_50"] = close.rolling(50).mean()
+        df["ema_12"] = close.ewm(span=12, adjust=False, min_periods=12).mean()
+        df["ema_26"] = close.ewm(span=26, adjust=False, min_periods=26).mean()
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        df["rsi_14"] = 100 - 100 / (1 + gain / loss)
+        df["volatility_20"] = close.pct_change(fill_method=None).rolling(20).std()
+        mid, std = close.rolling(20).mean(), close.rolling(20).std(ddof=0)
+        df["bb_upper_20"], df["bb_lower_20"] = mid + 2 * std, mid - 2 * std
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=3000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--pandas-subset", type=int, default=200)
+    parser.add_argument("--appends", type=int, default=250)
+    args = parser.parse_args()
+
+    days = 252 * args.years
+    prices = synthetic_prices(days, args.tickers)
+    engine = IndicatorEngine()
+    print(f"days={days} tickers={args.tickers} indicators={len(engine.indicators)}")
+
+    start = time.perf_counter()
+    engine.compute(prices)
+    batch_seconds = time.perf_counter() - start
+    print(f"engine batch:       {batch_seconds:8.3f}s  ({days * args.tickers / batch_seconds / 1e6:.1f}M cells/s)")
+
+    subset = prices[:, :args.pandas_subset]
+    start = time.perf_counter()
+    pandas_per_ticker(subset)
+    pandas_seconds = time.perf_counter() - start
+    projected = pandas_seconds * args.tickers / subset.shape[1]
+    print(f"pandas per-ticker:  {pandas_seconds:8.3f}s for {subset.shape[1]} tickers "
+          f"(~{projected:.1f}s projected for {args.tickers})")
+
+    history, tail = prices[:-args.appends], prices[-args.appends:]
+    stream = engine.stream(history)
+    start = time.perf_counter()
+    for bar in tail:
+        stream.append(bar)
+    append_seconds = time.perf_counter() - start
+    print(f"append one bar:     {append_seconds / len(tail) * 1000:8.3f}ms per bar across all tickers")
+
+
+if __name__ == "__main__":
+    main()
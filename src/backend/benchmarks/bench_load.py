@@ -0,0 +1,370 @@
+"""
+Offline end-to-end load benchmark of the API.
+
+Starts the fake OpenWeatherMap/NewsAPI server from fake_upstreams.py in
+this process and the backend (main.py plus api/routes.py, see load_app.py)
+in a child process. Then it drives each endpoint with a fixed number of
+requests from --concurrency closed-loop clients. For every endpoint it
+reports throughput, latency percentiles, status codes, upstream calls and
+the backend's RSS (start, sampled peak, end). Results are written as JSON
+so runs can be compared across commits with --compare.
+
+    python -m src.backend.benchmarks.bench_load --requests 200 --concurrency 16
+    python -m src.backend.benchmarks.bench_load --endpoints analyze,correlations --upstream-latency-ms 150
+    python -m src.backend.benchmarks.bench_load --compare bench_results/load-<before>.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import uvicorn
+
+from .bench_sentiment_batch import synthetic_headlines
+from .fake_upstreams import create_upstream_app, write_price_fixtures
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+RequestSpec = Tuple[str, str, Dict]
+
+
+def scenarios(tickers: List[str], locations: List[str], start: date, end: date) -> Dict[str, Callable[[int], RequestSpec]]:
+    """Endpoint name -> request i; tickers and locations rotate so caches see realistic repeats"""
+    headlines = synthetic_headlines(512, seed=1)
+
+    def pick(i: int):
+        return tickers[i % len(tickers)], locations[i % len(locations)]
+
+    def analyze(i):
+        ticker, location = pick(i)
+        body = {"ticker": ticker, "location": location,
+                "start_date": f"{start}T00:00:00", "end_date": f"{end}T00:00:00"}
+        return "POST", "/api/analyze", {"json": body}
+
+    def pipeline_analyze(i):
+        ticker, location = pick(i)
+        params = {"ticker": ticker, "location": location,
+                  "start_date": f"{start}T00:00:00", "end_date": f"{end}T00:00:00"}
+        return "POST", "/api/pipeline/analyze", {"params": params}
+
+    return {
+        "health": lambda i: ("GET", "/api/health", {}),
+        "analyze": analyze,
+        "correlations": lambda i: ("GET", f"/api/correlations/{pick(i)[0]}", {"params": {"location": pick(i)[1]}}),
+        "sentiment_text": lambda i: ("POST", "/api/sentiment", {"params": {"text": headlines[i % len(headlines)]}}),
+        "sentiment_news": lambda i: ("GET", f"/api/sentiment/{pick(i)[0]}", {}),
+        "pipeline_analyze": pipeline_analyze,
+        "weather_alerts": lambda i: ("GET", f"/api/pipeline/weather-alerts/{pick(i)[1]}", {}),
+        "metrics": lambda i: ("GET", "/api/metrics", {}),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class UpstreamServer:
+    """Runs the fake upstream app with uvicorn on a background thread"""
+
+    def __init__(self, app, port: int):
+        self.app = app
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Fake upstream server failed to start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process from /proc (Linux); None elsewhere"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    """Samples a process's RSS on a thread and keeps the peak"""
+
+    def __init__(self, pid: int, interval: float = 0.02):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            value = rss_mb(self.pid)
+            if value is not None and (self.peak is None or value > self.peak):
+                self.peak = value
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_scenario(client: httpx.AsyncClient, build: Callable[[int], RequestSpec],
+                       requests: int, concurrency: int, offset: int = 0) -> Dict:
+    """Issue requests from concurrency closed-loop workers; latency per request, statuses by code"""
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses = Counter()
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            method, url, kwargs = build(offset + i)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    values = np.array(latencies) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "statuses": dict(statuses),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(float(values.mean()), 2),
+            "p50": round(float(np.percentile(values, 50)), 2),
+            "p90": round(float(np.percentile(values, 90)), 2),
+            "p99": round(float(np.percentile(values, 99)), 2),
+            "max": round(float(values.max()), 2),
+        },
+    }
+
+
+def start_backend(args, workdir: str, upstream_port: int, fixtures: str) -> Tuple[subprocess.Popen, str, str]:
+    port = free_port()
+    upstream = f"http://127.0.0.1:{upstream_port}"
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")])),
+        "WEATHER_IMPACT_CACHE_DIR": os.path.join(workdir, "cache"),
+        "OPENWEATHER_BASE_URL": f"{upstream}/data/2.5",
+        "OPENWEATHER_GEO_URL": f"{upstream}/geo/1.0/direct",
+        "NEWS_API_URL": f"{upstream}/v2/everything",
+        "PRICE_PROVIDER": "fixture",
+        "PRICE_FIXTURE_DIR": fixtures,
+        "BENCH_PORT": str(port),
+        "BENCH_PRICE_LATENCY_MS": str(args.price_latency_ms),
+        "BENCH_SENTIMENT_OVERHEAD_MS": str(args.sentiment_overhead_ms),
+        "BENCH_SENTIMENT_PER_TEXT_MS": str(args.sentiment_per_text_ms),
+        "BENCH_REAL_SENTIMENT": "1" if args.real_sentiment else "0",
+    })
+    if not args.gazetteer:
+        env["GEOCODE_GAZETTEER_PATH"] = ""
+    if not args.result_cache:
+        env["RESULT_CACHE_SIZE"] = "0"
+    log_path = os.path.join(workdir, "backend.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.backend.benchmarks.load_app"],
+        cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return process, f"http://127.0.0.1:{port}", log_path
+
+
+async def wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("Backend exited during startup")
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Backend not ready after {timeout}s")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> Dict:
+    end = date.today()
+    start = end - timedelta(days=args.days)
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+    locations = [f"Benchville {i:02d}" for i in range(args.locations)]
+    workdir = tempfile.mkdtemp(prefix="bench-load-")
+    fixtures = args.price_fixtures or os.path.join(workdir, "prices")
+    if not args.price_fixtures:
+        write_price_fixtures(fixtures, tickers, start - timedelta(days=120), end)
+
+    upstream_app = create_upstream_app(args.upstream_latency_ms, args.upstream_jitter_ms,
+                                       args.articles, args.replay)
+    upstream = UpstreamServer(upstream_app, free_port())
+    upstream.start()
+    process, base_url, log_path = start_backend(args, workdir, upstream.server.config.port, fixtures)
+    specs = scenarios(tickers, locations, start, end)
+    names = args.endpoints.split(",") if args.endpoints else list(specs)
+    results = {}
+    try:
+        await wait_ready(base_url, process)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            for name in names:
+                build = specs[name]
+                if args.warmup:
+                    await run_scenario(client, build, args.warmup, min(args.concurrency, args.warmup))
+                calls_before = Counter(upstream_app.state.calls)
+                rss_start = rss_mb(process.pid)
+                with RssSampler(process.pid) as sampler:
+                    result = await run_scenario(client, build, args.requests, args.concurrency, offset=args.warmup)
+                result["rss_mb"] = {"start": rss_start, "peak": sampler.peak, "end": rss_mb(process.pid)}
+                result["upstream_calls"] = dict(Counter(upstream_app.state.calls) - calls_before)
+                results[name] = result
+                print_row(name, result)
+    except RuntimeError:
+        with open(log_path) as log:
+            sys.stderr.write(log.read()[-4000:])
+        raise
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        upstream.stop()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+
+HEADER = f"{'endpoint':<18} {'req/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'errors':>7} {'peak MB':>9}  upstream"
+
+
+def print_row(name: str, result: Dict):
+    latency, rss = result["latency_ms"], result["rss_mb"]
+    peak = f"{rss['peak']:.1f}" if rss["peak"] is not None else "-"
+    upstream = " ".join(f"{route}={count}" for route, count in sorted(result["upstream_calls"].items()))
+    print(f"{name:<18} {result['throughput_rps']:>9.1f} {latency['p50']:>9.1f} {latency['p90']:>9.1f} "
+          f"{latency['p99']:>9.1f} {result['errors']:>7} {peak:>9}  {upstream}")
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print throughput and p99 changes against a previous run; returns endpoints that regressed"""
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'endpoint':<18} {'req/s':>16} {'p99 ms':>20}")
+    regressed = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        rps_change = result["throughput_rps"] / before["throughput_rps"] - 1
+        p99_change = result["latency_ms"]["p99"] / before["latency_ms"]["p99"] - 1
+        flag = ""
+        if rps_change < -threshold or p99_change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<18} {before['throughput_rps']:>7.1f} {rps_change:>+8.1%} "
+              f"{before['latency_ms']['p99']:>9.1f} {p99_change:>+9.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default="", help="comma-separated subset of: " + ",".join(
+        scenarios(["T"], ["L"], date.today(), date.today())))
+    parser.add_argument("--requests", type=int, default=100, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--tickers", type=int, default=8)
+    parser.add_argument("--locations", type=int, default=4)
+    parser.add_argument("--days", type=int, default=30, help="analysis window")
+    parser.add_argument("--articles", type=int, default=20, help="articles per NewsAPI response")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--price-latency-ms", type=float, default=200.0, help="per yfinance-style download")
+    parser.add_argument("--sentiment-overhead-ms", type=float, default=20.0)
+    parser.add_argument("--sentiment-per-text-ms", type=float, default=2.0)
+    parser.add_argument("--real-sentiment", action="store_true", help="use the configured sentiment model")
+    parser.add_argument("--replay", help="directory of recorded geo/timemachine/onecall/news JSON responses")
+    parser.add_argument("--price-fixtures", help="directory of recorded <TICKER>.csv bars (tickers T000, T001, ...)")
+    parser.add_argument("--no-result-cache", dest="result_cache", action="store_false")
+    parser.add_argument("--no-gazetteer", dest="gazetteer", action="store_false")
+    parser.add_argument("--output", help="JSON results path (default bench_results/load-<commit>.json)")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    print(HEADER)
+    report = asyncio.run(run(args))
+
+    output = args.output or os.path.join("bench_results", f"load-{report['meta']['commit'] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressed = compare(report, json.load(handle), args.threshold)
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
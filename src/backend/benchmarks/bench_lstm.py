@@ -0,0 +1,91 @@
+"""
+CPU throughput of the LSTM pipeline: training windows/s per torch thread
+count, and scoring the latest window of many tickers one at a time versus
+in one batched forward pass, eager and TorchScript.
+
+    python -m src.backend.benchmarks.bench_lstm --tickers 500 --days 1000 --threads 1,2,4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from ..models.lstm_pipeline import LSTMPipeline
+
+
+def synthetic_series(tickers: int, days: int, features: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = {}
+    y = {}
+    for i in range(tickers):
+        values = rng.normal(size=(days, features)).astype(np.float32)
+        values[:, 0] = 50 + np.cumsum(rng.normal(0, 1, days))
+        X[f"T{i:04d}"] = values
+        target = np.empty(days, dtype=np.float32)
+        target[:-1] = values[1:, 0]
+        target[-1] = np.nan
+        y[f"T{i:04d}"] = target
+    return X, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--train-tickers", type=int, default=20)
+    parser.add_argument("--sequence-length", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--threads", default="1,2,4")
+    parser.add_argument("--repeat", type=int, default=5, help="batched scoring passes to average")
+    args = parser.parse_args()
+
+    X, y = synthetic_series(args.tickers, args.days, args.features)
+    train_keys = list(X)[:args.train_tickers]
+    print(f"tickers={args.tickers} days={args.days} features={args.features} "
+          f"sequence_length={args.sequence_length} cpus={os.cpu_count()}")
+
+    pipeline = None
+    for threads in [int(t) for t in args.threads.split(",")]:
+        pipeline = LSTMPipeline(sequence_length=args.sequence_length, epochs=1,
+                                batch_size=args.batch_size, num_threads=threads)
+        start = time.perf_counter()
+        pipeline.fit({k: X[k] for k in train_keys}, {k: y[k] for k in train_keys})
+        seconds = time.perf_counter() - start
+        windows = args.train_tickers * (args.days - args.sequence_length)
+        print(f"train  threads={threads:<3} {windows / seconds:>10.0f} windows/s")
+
+    start = time.perf_counter()
+    for ticker, values in X.items():
+        pipeline.predict_latest({ticker: values})
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        pipeline.predict_latest(X)
+    batch_seconds = (time.perf_counter() - start) / args.repeat
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "lstm.pt")
+        pipeline.export_torchscript(path)
+        scripted = LSTMPipeline.load_torchscript(path, args.sequence_length, pipeline.num_threads)
+        for _ in range(2):  # the profiling executor optimizes the graph over the first calls
+            scripted.predict_latest(X)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            scripted_result = scripted.predict_latest(X)
+        script_seconds = (time.perf_counter() - start) / args.repeat
+
+    eager_result = pipeline.predict_latest(X)
+    drift = max(abs(eager_result[t] - scripted_result[t]) for t in X)
+    print(f"score  per-ticker loop  {args.tickers / loop_seconds:>10.0f} tickers/s")
+    print(f"score  batched eager    {args.tickers / batch_seconds:>10.0f} tickers/s")
+    print(f"score  batched script   {args.tickers / script_seconds:>10.0f} tickers/s  (max diff {drift:.2e})")
+
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    main()
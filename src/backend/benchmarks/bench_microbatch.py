@@ -0,0 +1,111 @@
+"""
+Latency and throughput of single-text sentiment requests, one forward pass
+per request (the old /api/sentiment handler) against MicroBatcher.
+
+Requests arrive as a Poisson stream at --rate per second. By default the
+model is a stand-in whose cost is a fixed per-call overhead plus a per-text
+term (sleeping, so like torch it releases the GIL); --real uses NLPAnalyzer.
+
+    python -m src.backend.benchmarks.bench_microbatch --requests 2000 --rate 400 --waits 0,2,5,10
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from ..nlp.micro_batching import MicroBatcher
+from .bench_sentiment_batch import synthetic_headlines
+
+
+class FakeAnalyzer:
+    """analyze_texts costing overhead_ms + per_text_ms per text"""
+
+    def __init__(self, overhead_ms: float, per_text_ms: float):
+        self.overhead = overhead_ms / 1000
+        self.per_text = per_text_ms / 1000
+
+    def analyze_texts(self, texts):
+        time.sleep(self.overhead + self.per_text * len(texts))
+        return [{"sentiment": "neutral", "score": 1.0, "text": text} for text in texts]
+
+
+def make_analyzer(args):
+    if not args.real:
+        return FakeAnalyzer(args.overhead_ms, args.per_text_ms)
+    from ..nlp.sentiment import NLPAnalyzer
+    from ..nlp.sentiment_cache import SentimentCache
+    # Zero-capacity, memory-only cache so every request measures inference
+    analyzer = NLPAnalyzer(cache=SentimentCache(max_entries=0))
+    analyzer.warm_up()
+    return analyzer
+
+
+async def drive(score, texts, rate: float, seed: int = 0):
+    """
+    Submit texts on a fixed Poisson schedule; latency is measured from each
+    request's scheduled arrival, so time spent stuck behind a blocked loop counts.
+    """
+    rng = random.Random(seed)
+    offsets = np.cumsum([rng.expovariate(rate) for _ in texts])
+    latencies = []
+
+    async def one(text, arrival):
+        await score(text)
+        latencies.append(time.perf_counter() - arrival)
+
+    start = time.perf_counter()
+    tasks = []
+    for text, offset in zip(texts, offsets):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(text, start + offset)))
+    await asyncio.gather(*tasks)
+    return np.array(latencies), time.perf_counter() - start
+
+
+def report(label: str, latencies: np.ndarray, elapsed: float, extra: str = ""):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{label:>14} {len(latencies) / elapsed:>10.1f} {p50:>10.1f} {p99:>10.1f}  {extra}")
+
+
+async def run(args):
+    analyzer = make_analyzer(args)
+    texts = synthetic_headlines(args.requests)
+    print(f"requests={args.requests} rate={args.rate}/s max_batch={args.max_batch} "
+          f"model={'real' if args.real else f'fake({args.overhead_ms}+{args.per_text_ms}/text ms)'}")
+    print(f"{'mode':>14} {'req/sec':>10} {'p50 ms':>10} {'p99 ms':>10}  batches")
+
+    async def direct(text):
+        # What the handler used to do: one forward pass per request, on the event loop
+        return analyzer.analyze_texts([text])[0]
+
+    latencies, elapsed = await drive(direct, texts, args.rate)
+    report("direct", latencies, elapsed)
+
+    for wait in [float(w) for w in args.waits.split(",")]:
+        batcher = MicroBatcher(analyzer, max_batch_size=args.max_batch, max_wait_ms=wait)
+        latencies, elapsed = await drive(batcher.analyze, texts, args.rate)
+        stats = batcher.stats()
+        report(f"batched {wait:g}ms", latencies, elapsed,
+               f"n={stats['batches']} mean_size={stats['mean_batch_size']}")
+        await batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=300, help="mean arrivals per second")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--waits", default="0,2,5,10", help="max_wait_ms values to compare")
+    parser.add_argument("--overhead-ms", type=float, default=8.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.5)
+    parser.add_argument("--real", action="store_true", help="use the configured sentiment model")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Latency, memory and fp32 agreement of the sentiment inference backends.
+
+Each backend is measured in a fresh subprocess so resident memory is not
+shared between them.
+
+    python -m src.backend.benchmarks.bench_sentiment_backends --backends torch,torch-int8,onnx
+"""
+import argparse
+import json
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from ..config import SENTIMENT_MODEL
+from .bench_sentiment_batch import synthetic_headlines
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def measure(model_name: str, backend: str, texts, batch_size: int, repeats: int, queue):
+    try:
+        queue.put(_measure(model_name, backend, texts, batch_size, repeats))
+    except Exception as e:
+        queue.put({"backend": backend, "error": repr(e)})
+
+
+def _measure(model_name: str, backend: str, texts, batch_size: int, repeats: int):
+    from ..nlp.model_registry import ModelRegistry
+    from ..nlp.sentiment import NLPAnalyzer
+    from ..nlp.sentiment_cache import SentimentCache
+
+    before = rss_mb()
+    start = time.perf_counter()
+    analyzer = NLPAnalyzer(
+        model_name, backend=backend, batch_size=batch_size,
+        cache=SentimentCache(max_entries=0), registry=ModelRegistry(),
+    )
+    analyzer.warm_up()
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    sent = 0
+    for _ in range(repeats):
+        for offset in range(0, len(texts), batch_size):
+            chunk = texts[offset:offset + batch_size]
+            start = time.perf_counter()
+            analyzer.analyze_texts(chunk)
+            latencies.append((time.perf_counter() - start) * 1000)
+            sent += len(chunk)
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "rss_mb": rss_mb() - before,
+        "batch_p50_ms": float(np.percentile(latencies, 50)),
+        "batch_p99_ms": float(np.percentile(latencies, 99)),
+        "texts_per_sec": sent / (sum(latencies) / 1000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=SENTIMENT_MODEL)
+    parser.add_argument("--backends", default="torch,torch-int8,onnx")
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    from ..nlp.backends import validate_backend
+
+    texts = synthetic_headlines(args.texts)
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in args.backends.split(","):
+        queue = ctx.Queue()
+        proc = ctx.Process(
+            target=measure,
+            args=(args.model, backend, texts, args.batch_size, args.repeats, queue),
+        )
+        proc.start()
+        result = queue.get()
+        proc.join()
+        if "error" in result:
+            print(f"{backend}: {result['error']}")
+            continue
+        result.update(validate_backend(args.model, backend, texts, args.tolerance))
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"model={args.model} texts={len(texts)} batch_size={args.batch_size}")
+    header = f"{'backend':>11} {'load_s':>7} {'rss_mb':>8} {'p50_ms':>8} {'p99_ms':>8} {'texts/s':>8} {'agree':>6} {'ok':>3}"
+    print(header)
+    for r in results:
+        print(
+            f"{r['backend']:>11} {r['load_seconds']:>7.2f} {r['rss_mb']:>8.1f} "
+            f"{r['batch_p50_ms']:>8.2f} {r['batch_p99_ms']:>8.2f} {r['texts_per_sec']:>8.1f} "
+            f"{r['label_agreement']:>6.3f} {'yes' if r['passed'] else 'no':>3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+CPU throughput of NLPAnalyzer.analyze_texts against batch size.
+
+    python -m src.backend.benchmarks.bench_sentiment_batch --texts 512 --batch-sizes 1,8,32,64
+"""
+import argparse
+import random
+import time
+
+import torch
+
+from ..config import SENTIMENT_MODEL
+from ..nlp.sentiment import NLPAnalyzer
+from ..nlp.sentiment_cache import SentimentCache
+
+SUBJECTS = ["Shares", "The company", "Quarterly revenue", "Guidance", "The stock", "Margins"]
+VERBS = ["rally", "slump", "beat expectations", "miss estimates", "hold steady", "surge"]
+CONTEXTS = [
+    "after a heatwave lifts energy demand",
+    "as heavy rain disrupts retail traffic",
+    "amid record cold across the Midwest",
+    "following a strong holiday season",
+    "on weaker than expected shipments in the third quarter",
+    "",
+]
+
+
+def synthetic_headlines(n: int, seed: int = 0):
+    """n distinct headlines; analyze_texts drops duplicates, so repeats would inflate texts/sec"""
+    rng = random.Random(seed)
+    return [
+        " ".join(filter(None, [rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(CONTEXTS), f"(report {i})"]))
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=SENTIMENT_MODEL)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="1,4,8,16,32,64")
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    # Zero-capacity, memory-only cache so every repeat measures inference
+    analyzer = NLPAnalyzer(model_name=args.model, cache=SentimentCache(max_entries=0))
+    texts = synthetic_headlines(args.texts)
+    analyzer.analyze_texts(texts[:8])  # warm-up
+
+    print(f"model={args.model} texts={len(texts)} threads={args.threads}")
+    print(f"{'batch_size':>10} {'seconds':>10} {'texts/sec':>10}")
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            analyzer.analyze_texts(texts, batch_size=batch_size)
+            best = min(best, time.perf_counter() - start)
+        print(f"{batch_size:>10} {best:>10.3f} {len(texts) / best:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Load test for WebSocketManager with in-process clients.
+
+Thousands of fake sockets subscribe to ticker topics; a fraction are slow
+and a fraction die mid-run. Reports how long broadcast() holds the event
+loop, delivery latency for healthy clients, drops/coalescing for slow
+ones, and dead-connection cleanup, next to the old sequential loop.
+
+    python -m src.backend.benchmarks.bench_websocket --clients 5000 --messages 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from ..services.websocket_service import WebSocketManager, topic_name
+
+
+class FakeWebSocket:
+    """Stands in for a Starlette WebSocket; records when each message arrives"""
+
+    def __init__(self, delay: float = 0.0, fail_after: int = -1):
+        self.delay = delay
+        self.fail_after = fail_after
+        self.received = 0
+        self.latencies = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.fail_after >= 0 and self.received >= self.fail_after:
+            raise ConnectionResetError("client went away")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        self.latencies.append(time.perf_counter() - json.loads(text)["sent_at"])
+
+
+def make_clients(count: int, slow_fraction: float, dead_fraction: float, seed: int = 0):
+    rng = random.Random(seed)
+    clients = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < dead_fraction:
+            clients.append(("dead", FakeWebSocket(fail_after=rng.randint(0, 1))))
+        elif roll < dead_fraction + slow_fraction:
+            clients.append(("slow", FakeWebSocket(delay=0.25)))
+        else:
+            clients.append(("fast", FakeWebSocket()))
+    return clients
+
+
+async def run_manager(args) -> None:
+    manager = WebSocketManager(max_queue=args.queue)
+    clients = make_clients(args.clients, args.slow, args.dead)
+    topics = [topic_name("ticker", f"T{i:03d}") for i in range(args.topics)]
+    for i, (_, websocket) in enumerate(clients):
+        await manager.connect(websocket, [topics[i % len(topics)]])
+
+    broadcast_times = []
+    start = time.perf_counter()
+    for i in range(args.messages):
+        name = topics[i % len(topics)]
+        t0 = time.perf_counter()
+        await manager.send_update({"topic": name, "seq": i, "sent_at": time.perf_counter()}, topic=name)
+        broadcast_times.append(time.perf_counter() - t0)
+        await asyncio.sleep(args.interval)
+    await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - start
+
+    fast = [ws for kind, ws in clients if kind == "fast"]
+    latencies = np.concatenate([ws.latencies for ws in fast if ws.latencies]) * 1000
+    stats = manager.stats()
+    print("fan-out manager")
+    print(f"  broadcast call     p50 {np.percentile(broadcast_times, 50) * 1000:7.3f}ms  "
+          f"max {max(broadcast_times) * 1000:7.3f}ms")
+    print(f"  fast-client latency p50 {np.percentile(latencies, 50):7.2f}ms  p99 {np.percentile(latencies, 99):7.2f}ms")
+    print(f"  delivered {sum(ws.received for _, ws in clients)} in {elapsed:.2f}s; "
+          f"dropped {stats['dropped']}, coalesced {stats['coalesced']}, "
+          f"dead removed {stats['removed']}/{sum(kind == 'dead' for kind, _ in clients)}")
+    await manager.close()
+
+
+async def run_sequential(args) -> None:
+    """The previous broadcast: await each client in turn, serialize per call"""
+    clients = [ws for kind, ws in make_clients(args.sequential_clients, args.slow, 0.0)]
+    start = time.perf_counter()
+    for i in range(1):  # one message is enough: slow clients serialize the whole loop
+        message = json.dumps({"seq": i, "sent_at": time.perf_counter()})
+        for websocket in clients:
+            await websocket.send_text(message)
+    per_message = time.perf_counter() - start
+    print(f"sequential loop ({len(clients)} clients, no topics, no dead clients)")
+    print(f"  broadcast call     {per_message * 1000:9.1f}ms per message "
+          f"(~{per_message * args.clients / len(clients):.1f}s projected for {args.clients})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.002, help="seconds between broadcasts")
+    parser.add_argument("--queue", type=int, default=100)
+    parser.add_argument("--slow", type=float, default=0.05, help="fraction of slow clients")
+    parser.add_argument("--dead", type=float, default=0.02, help="fraction of clients that disconnect")
+    parser.add_argument("--sequential-clients", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"clients={args.clients} topics={args.topics} messages={args.messages}")
+    asyncio.run(run_manager(args))
+    asyncio.run(run_sequential(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Local stand-ins for the external services the backend depends on, for
+offline load benchmarks (see bench_load.py).
+
+- OpenWeatherMap (geocoding, onecall, onecall/timemachine) and NewsAPI are
+  served by one FastAPI app with configurable latency. Responses are
+  synthetic but deterministic per request, or replayed verbatim from
+  recorded JSON files.
+- yfinance is replaced by FixtureProvider over synthetic (or recorded)
+  <TICKER>.csv files, behind DelayedProvider for latency.
+- The FinBERT model is replaced by a tokenizer/runner pair with a fixed
+  per-batch plus per-text cost, so sentiment endpoints run without model
+  downloads.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Request
+
+from ..services.price_store import PriceProvider
+from .bench_sentiment_batch import synthetic_headlines
+
+# Recorded responses, if present in the replay directory, are served instead of synthetic ones
+REPLAY_FILES = {
+    "geo": "geo.json",
+    "timemachine": "timemachine.json",
+    "onecall": "onecall.json",
+    "news": "news.json",
+}
+WEATHER_TYPES = [("Clear", "clear sky"), ("Clouds", "broken clouds"), ("Rain", "light rain"), ("Snow", "light snow")]
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32("|".join(str(part) for part in parts).encode("utf-8"))
+
+
+def synthetic_weather(lat: float, lon: float, dt: int) -> Dict:
+    """One onecall/timemachine response; seasonal temperature plus noise, stable per (place, day)"""
+    rng = random.Random(_seed(round(lat, 2), round(lon, 2), dt // 86400))
+    day_of_year = datetime.fromtimestamp(dt, timezone.utc).timetuple().tm_yday
+    temperature = 12 - 0.2 * abs(lat) + 10 * np.sin(2 * np.pi * (day_of_year - 100) / 365) + rng.gauss(0, 3)
+    main, description = rng.choice(WEATHER_TYPES)
+    return {
+        "lat": lat,
+        "lon": lon,
+        "current": {
+            "dt": dt,
+            "temp": round(float(temperature), 2),
+            "feels_like": round(float(temperature) - rng.uniform(0, 3), 2),
+            "humidity": rng.randint(30, 95),
+            "clouds": rng.randint(0, 100),
+            "wind_speed": round(rng.uniform(0, 12), 2),
+            "weather": [{"main": main, "description": description}],
+        },
+    }
+
+
+def synthetic_articles(query: str, start: str, end: str, count: int) -> List[Dict]:
+    first = datetime.fromisoformat(start) if start else datetime.now() - timedelta(days=7)
+    last = datetime.fromisoformat(end) if end else datetime.now()
+    span_seconds = max((last - first).total_seconds(), 1.0) + 86400
+    rng = random.Random(_seed(query, start, end))
+    return [
+        {
+            "title": f"{query}: {headline}",
+            "publishedAt": (first + timedelta(seconds=rng.uniform(0, span_seconds))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source": {"name": "Synthetic Wire"},
+        }
+        for headline in synthetic_headlines(count, seed=_seed(query))
+    ]
+
+
+def create_upstream_app(latency_ms: float = 50.0, jitter_ms: float = 10.0, articles: int = 20,
+                        replay_dir: Optional[str] = None) -> FastAPI:
+    """
+    OpenWeatherMap and NewsAPI stand-in. Every request waits latency_ms
+    (+/- jitter_ms) first. app.state.calls counts requests per route.
+    """
+    app = FastAPI()
+    app.state.calls = Counter()
+    replay = {}
+    for name, filename in REPLAY_FILES.items():
+        path = os.path.join(replay_dir, filename) if replay_dir else None
+        if path and os.path.exists(path):
+            with open(path) as handle:
+                replay[name] = json.load(handle)
+
+    async def delay(name: str):
+        app.state.calls[name] += 1
+        wait = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        if wait > 0:
+            await asyncio.sleep(wait / 1000)
+
+    @app.get("/geo/1.0/direct")
+    async def geocode(q: str):
+        await delay("geo")
+        if "geo" in replay:
+            return replay["geo"]
+        rng = random.Random(_seed(q.casefold()))
+        return [{"name": q, "lat": round(rng.uniform(-60, 60), 4), "lon": round(rng.uniform(-180, 180), 4)}]
+
+    @app.get("/data/2.5/onecall/timemachine")
+    async def timemachine(lat: float, lon: float, dt: int):
+        await delay("timemachine")
+        return replay.get("timemachine") or synthetic_weather(lat, lon, dt)
+
+    @app.get("/data/2.5/onecall")
+    async def onecall(lat: float, lon: float):
+        await delay("onecall")
+        return replay.get("onecall") or {"lat": lat, "lon": lon, "alerts": []}
+
+    @app.get("/v2/everything")
+    async def everything(request: Request):
+        await delay("news")
+        if "news" in replay:
+            return replay["news"]
+        params = request.query_params
+        found = synthetic_articles(params.get("q", ""), params.get("from", ""), params.get("to", ""), articles)
+        return {"status": "ok", "totalResults": len(found), "articles": found}
+
+    return app
+
+
+def write_price_fixtures(directory: str, tickers: List[str], start: date, end: date):
+    """Synthetic daily OHLCV as <TICKER>.csv, the format FixtureProvider reads"""
+    os.makedirs(directory, exist_ok=True)
+    days = pd.bdate_range(start, end, name="Date")
+    for ticker in tickers:
+        rng = np.random.default_rng(_seed(ticker))
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(days))))
+        open_ = close * (1 + rng.normal(0, 0.004, len(days)))
+        frame = pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(days))),
+            "Low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(days))),
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, len(days)),
+        }, index=days)
+        frame.to_csv(os.path.join(directory, f"{ticker}.csv"))
+
+
+class DelayedProvider(PriceProvider):
+    """Wraps a provider with a fixed per-call latency, like a batched yfinance download"""
+
+    def __init__(self, provider: PriceProvider, latency_ms: float):
+        self.provider = provider
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, tickers, start, end):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return self.provider.fetch(tickers, start, end)
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer with the two calls NLPAnalyzer makes on a Hugging Face tokenizer"""
+
+    def __call__(self, texts: List[str], truncation: bool = True, max_length: int = 512) -> Dict:
+        ids = [[101] + [zlib.crc32(word.encode("utf-8")) % 30000 for word in text.split()] + [102] for text in texts]
+        return {"input_ids": [row[:max_length] if truncation else row for row in ids]}
+
+    def pad(self, encoded: Dict, padding: bool = True, return_tensors: str = "np") -> Dict[str, np.ndarray]:
+        rows = encoded["input_ids"]
+        width = max(len(row) for row in rows)
+        input_ids = np.zeros((len(rows), width), dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class FakeRunner:
+    """Costs overhead_ms per forward pass plus per_text_ms per row; sleeps, so it releases the GIL like torch"""
+
+    def __init__(self, overhead_ms: float, per_text_ms: float):
+        self.overhead = overhead_ms / 1000
+        self.per_text = per_text_ms / 1000
+
+    def logits(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        input_ids = batch["input_ids"]
+        time.sleep(self.overhead + self.per_text * len(input_ids))
+        totals = input_ids.sum(axis=1)
+        return np.stack([(totals % 7) / 7.0, (totals % 5) / 5.0, (totals % 3) / 3.0], axis=1)
+
+
+def fake_sentiment_components(overhead_ms: float = 20.0, per_text_ms: float = 2.0) -> Dict:
+    """Components in the shape load_sequence_classifier returns"""
+    return {
+        "tokenizer": FakeTokenizer(),
+        "runner": FakeRunner(overhead_ms, per_text_ms),
+        "id2label": {0: "positive", 1: "negative", 2: "neutral"},
+    }
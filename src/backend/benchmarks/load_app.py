@@ -0,0 +1,51 @@
+"""
+Backend server process for bench_load.py.
+
+Serves main.app with the api/routes.py router mounted under /api/pipeline.
+yfinance and the sentiment model are swapped for the stand-ins in
+fake_upstreams.py; OpenWeatherMap and NewsAPI URLs are pointed at the fake
+upstream server through the usual config variables. It runs in its own
+process so its RSS is measured without the load generator's. bench_load.py
+sets these environment variables:
+
+    BENCH_PORT                     port to serve on
+    BENCH_PRICE_LATENCY_MS         added to every price provider call
+    BENCH_SENTIMENT_OVERHEAD_MS    stand-in model cost per forward pass
+    BENCH_SENTIMENT_PER_TEXT_MS    stand-in model cost per text
+    BENCH_REAL_SENTIMENT=1         use the configured model instead
+"""
+import os
+
+import uvicorn
+
+from ..config import SENTIMENT_BACKEND, SENTIMENT_MODEL
+from ..nlp.model_registry import get_model_registry
+from .fake_upstreams import DelayedProvider, fake_sentiment_components
+
+
+def build_app():
+    from .. import main as backend
+    from ..api import routes
+
+    backend.app.include_router(routes.router, prefix="/api/pipeline")
+
+    latency = float(os.getenv("BENCH_PRICE_LATENCY_MS", "0"))
+    for store in (backend.finance_analyzer.price_store, routes.get_service().finance_analyzer.price_store):
+        store.provider = DelayedProvider(store.provider, latency)
+
+    if os.getenv("BENCH_REAL_SENTIMENT") != "1":
+        overhead = float(os.getenv("BENCH_SENTIMENT_OVERHEAD_MS", "20"))
+        per_text = float(os.getenv("BENCH_SENTIMENT_PER_TEXT_MS", "2"))
+        # Every NLPAnalyzer resolves its model through the shared registry, so this covers them all
+        get_model_registry().get(
+            (SENTIMENT_MODEL, SENTIMENT_BACKEND), lambda: fake_sentiment_components(overhead, per_text)
+        )
+    return backend.app
+
+
+def main():
+    uvicorn.run(build_app(), host="127.0.0.1", port=int(os.environ["BENCH_PORT"]), log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Base directory for on-disk caches and stores
+CACHE_DIR = os.getenv("WEATHER_IMPACT_CACHE_DIR", os.path.join(os.getcwd(), ".cache"))
+
+# OpenWeatherMap endpoints (override to point at a local stand-in API)
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "837e3aa3e9bd23e14852820651a8b516")
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "http://api.openweathermap.org/data/2.5")
+OPENWEATHER_GEO_URL = os.getenv("OPENWEATHER_GEO_URL", "http://api.openweathermap.org/geo/1.0/direct")
+
+WEATHER_STORE_PATH = os.getenv(
+    "WEATHER_STORE_PATH", os.path.join(CACHE_DIR, "weather_history.sqlite")
+)
+
+
+# Outbound HTTP client
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
+
+# Data integration: worker threads for blocking providers and per-source timeouts (seconds)
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "8"))
+SOURCE_TIMEOUTS = {
+    "stock": float(os.getenv("STOCK_FETCH_TIMEOUT", "20")),
+    "weather": float(os.getenv("WEATHER_FETCH_TIMEOUT", "30")),
+    "news": float(os.getenv("NEWS_FETCH_TIMEOUT", "15")),
+}
+
+# Sentiment model
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "ProsusAI/finbert")
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+SENTIMENT_MAX_LENGTH = int(os.getenv("SENTIMENT_MAX_LENGTH", "512"))
+# Inference backend: torch (fp32), torch-int8 (dynamic quantization) or onnx (ONNX Runtime)
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+# Set to an empty string to keep the sentiment cache in memory only
+SENTIMENT_CACHE_PATH = os.getenv(
+    "SENTIMENT_CACHE_PATH", os.path.join(CACHE_DIR, "sentiment_cache.sqlite")
+)
+
+# Model registry: warm-up mode, release after idle seconds or below available MB (0 disables).
+# Warm-up is off (load on first use), background (serve at once; /api/ready turns 200 when done) or blocking (before serving)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "off").lower()
+MODEL_WARMUP = {"1": "blocking", "true": "blocking", "yes": "blocking", "0": "off", "false": "off", "no": "off"}.get(
+    MODEL_WARMUP, MODEL_WARMUP
+)
+if MODEL_WARMUP not in ("off", "background", "blocking"):
+    raise ValueError(f"Unknown MODEL_WARMUP mode: {MODEL_WARMUP!r} (expected off, background or blocking)")
+MODEL_IDLE_SECONDS = float(os.getenv("MODEL_IDLE_SECONDS", "0"))
+MODEL_MIN_AVAILABLE_MB = float(os.getenv("MODEL_MIN_AVAILABLE_MB", "0"))
+
+# Local OHLCV store; PRICE_PROVIDER=fixture serves bars from PRICE_FIXTURE_DIR/<TICKER>.csv
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join(CACHE_DIR, "prices"))
+PRICE_PROVIDER = os.getenv("PRICE_PROVIDER", "yfinance")
+PRICE_FIXTURE_DIR = os.getenv("PRICE_FIXTURE_DIR", os.path.join(CACHE_DIR, "price_fixtures"))
+PRICE_REFRESH_SECONDS = float(os.getenv("PRICE_REFRESH_SECONDS", "900"))
+
+# Trading calendar used to align stock, weather and sentiment series; news after the close counts for the next session
+EXCHANGE_TIMEZONE = os.getenv("EXCHANGE_TIMEZONE", "America/New_York")
+MARKET_CLOSE = os.getenv("MARKET_CLOSE", "16:00")
+
+# Versioned predictor artifacts written by the offline training job (src/backend/jobs/train_predictor.py)
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", os.path.join(CACHE_DIR, "models"))
+PREDICTOR_MODEL_NAME = os.getenv("PREDICTOR_MODEL_NAME", "stock_price_rf")
+# Empty serves the latest version
+PREDICTOR_MODEL_VERSION = os.getenv("PREDICTOR_MODEL_VERSION", "")
+
+# LSTM pipeline: intra-op threads for training and inference (0 keeps torch's default)
+LSTM_NUM_THREADS = int(os.getenv("LSTM_NUM_THREADS", "0"))
+
+# API result cache: entries are reused for these many seconds; ranges reaching today change more often
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_LIVE_TTL = float(os.getenv("RESULT_CACHE_LIVE_TTL", "60"))
+RESULT_CACHE_HISTORICAL_TTL = float(os.getenv("RESULT_CACHE_HISTORICAL_TTL", "21600"))
+
+# WebSocket fan-out: pending messages per client before the oldest are dropped, and per-send timeout (seconds)
+WS_CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", "100"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+
+# Live streaming: poll interval for prices/weather, for headlines, history used to seed new pairs, rolling windows (days)
+LIVE_POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "60"))
+LIVE_NEWS_POLL_SECONDS = float(os.getenv("LIVE_NEWS_POLL_SECONDS", "300"))
+LIVE_HISTORY_DAYS = int(os.getenv("LIVE_HISTORY_DAYS", "120"))
+LIVE_WINDOWS = [int(window) for window in os.getenv("LIVE_WINDOWS", "20,60").split(",")]
+
+# Geocoding: persistent location -> coordinates cache, and an offline gazetteer CSV (name,country,lat,lon; empty disables)
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join(CACHE_DIR, "geocode.sqlite"))
+GEOCODE_GAZETTEER_PATH = os.getenv(
+    "GEOCODE_GAZETTEER_PATH", os.path.join(os.path.dirname(__file__), "data", "gazetteer.csv")
+)
+
+# Micro-batching for single-text sentiment requests: largest batch, and longest a queued text waits for company (ms)
+SENTIMENT_MICROBATCH_SIZE = int(os.getenv("SENTIMENT_MICROBATCH_SIZE", str(SENTIMENT_BATCH_SIZE)))
+SENTIMENT_MICROBATCH_WAIT_MS = float(os.getenv("SENTIMENT_MICROBATCH_WAIT_MS", "5"))
+
+# Streamed analysis responses (NDJSON / Arrow IPC): rows per chunk written to the socket
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "5000"))
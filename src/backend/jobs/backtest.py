@@ -0,0 +1,302 @@
+"""
+Walk-forward backtest of the price predictors.
+
+Each ticker's aligned history is split into rolling train/test folds; every
+(ticker, model, feature set, fold) runs as one task on a process pool. The
+aligned feature matrices are built once per ticker and cached as .npy files
+that the workers memory-map, so folds never rebuild or re-send them.
+Comparing the "all" and "no_weather" feature sets shows whether the weather
+features help; "baseline" predicts that tomorrow closes where today did.
+
+    python -m src.backend.jobs.backtest --synthetic 20 --days 1500 --models baseline,rf,lstm
+    python -m src.backend.jobs.backtest --tickers AAPL MSFT --weather-csv nyc.csv \\
+        --start 2018-01-01 --end 2024-01-01 --output backtest.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import CACHE_DIR
+from ..models.model_store import training_fingerprint
+from ..models.prediction import FEATURE_COLUMNS, StockPricePredictor
+
+WEATHER_FEATURES = ["temperature", "precipitation"]
+FEATURE_SETS = {
+    "all": list(FEATURE_COLUMNS),
+    "no_weather": [feature for feature in FEATURE_COLUMNS if feature not in WEATHER_FEATURES],
+}
+MODELS = ("baseline", "rf", "lstm")
+
+
+def walk_forward_folds(n_rows: int, train_size: int, test_size: int, step: Optional[int] = None,
+                       expanding: bool = False) -> List[Tuple[slice, slice]]:
+    """(train, test) row slices; each test window directly follows its training window"""
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= n_rows:
+        train_start = 0 if expanding else start
+        train_end = start + train_size
+        folds.append((slice(train_start, train_end), slice(train_end, train_end + test_size)))
+        start += step
+    return folds
+
+
+class FeatureCache:
+    """
+    Aligned (day x feature) matrices and targets on disk, keyed by ticker
+    and a fingerprint of their contents, so repeated runs and every fold of
+    a run share one copy.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, ticker: str, X: pd.DataFrame, y: pd.Series) -> Dict:
+        key = f"{ticker}-{training_fingerprint(X, y)[:16]}"
+        paths = {name: os.path.join(self.directory, f"{key}.{name}.npy") for name in ("X", "y")}
+        if not all(os.path.exists(path) for path in paths.values()):
+            np.save(paths["X"], X.to_numpy(dtype=np.float32))
+            np.save(paths["y"], y.to_numpy(dtype=np.float32))
+        return {"X": paths["X"], "y": paths["y"], "columns": list(X.columns),
+                "dates": [day.strftime("%Y-%m-%d") for day in X.index]}
+
+    @staticmethod
+    def get(entry: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        return np.load(entry["X"], mmap_mode="r"), np.load(entry["y"], mmap_mode="r")
+
+
+def _worker_init(torch_threads: int):
+    # One process per core already; nested BLAS/torch threads would oversubscribe
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+
+def _fit_lstm(X: np.ndarray, y: np.ndarray, train: slice, test: slice, params: Dict) -> np.ndarray:
+    """Train on the train slice; predict each test day from the window ending on it"""
+    from ..models.lstm_pipeline import LSTMPipeline
+
+    pipeline = LSTMPipeline(
+        sequence_length=params["sequence_length"], hidden_dim=params["hidden_dim"],
+        num_layers=params["num_layers"], epochs=params["epochs"], batch_size=params["batch_size"],
+        learning_rate=params["learning_rate"], num_threads=1, seed=params["seed"],
+    )
+    pipeline.fit(X[train], y[train])
+    return pipeline.predict(X[test.start - params["sequence_length"] + 1:test.stop])
+
+
+def _run_fold(task: Dict) -> Dict:
+    """One (ticker, model, feature set, fold); runs in a pool worker"""
+    X_all, y_all = FeatureCache.get(task["entry"])
+    columns = task["entry"]["columns"]
+    features = FEATURE_SETS[task["feature_set"]]
+    X = np.asarray(X_all[:, [columns.index(feature) for feature in features]], dtype=np.float64)
+    y = np.asarray(y_all, dtype=np.float64)
+    train, test = slice(*task["train"]), slice(*task["test"])
+    today = np.asarray(X_all[test, columns.index("price")], dtype=np.float64)
+
+    importances = None
+    if task["model"] == "baseline":
+        predicted = today
+    elif task["model"] == "rf":
+        from sklearn.ensemble import RandomForestRegressor
+
+        forest = RandomForestRegressor(
+            n_estimators=task["params"]["n_estimators"], random_state=task["params"]["seed"], n_jobs=1
+        )
+        predictor = StockPricePredictor(forest, features=features)
+        predictor.train_model(pd.DataFrame(X[train], columns=features), y[train])
+        predicted = predictor.predict(pd.DataFrame(X[test], columns=features))
+        importances = dict(zip(features, forest.feature_importances_.tolist()))
+    else:
+        predicted = _fit_lstm(X, y, train, test, task["params"])
+
+    return {**{key: task[key] for key in ("ticker", "model", "feature_set", "fold")},
+            "actual": y[test].tolist(), "predicted": np.asarray(predicted).tolist(),
+            "today": today.tolist(), "importances": importances}
+
+
+def error_metrics(actual: np.ndarray, predicted: np.ndarray, today: np.ndarray) -> Dict:
+    """
+    MAE, RMSE, MAPE (%) and how often the predicted direction of the next
+    move was right, over days where both the price and the prediction move
+    """
+    error = predicted - actual
+    moved = (actual != today) & (predicted != today)
+    return {
+        "mae": float(np.mean(np.abs(error))),
+        "rmse": float(np.sqrt(np.mean(error * error))),
+        "mape": float(np.mean(np.abs(error) / np.abs(actual)) * 100),
+        "directional_accuracy": float(np.mean(
+            np.sign(predicted[moved] - today[moved]) == np.sign(actual[moved] - today[moved])
+        )) if moved.any() else None,
+        "predictions": int(len(actual)),
+    }
+
+
+def summarize(fold_results: List[Dict]) -> Dict:
+    """Per ticker, model and feature set: metrics over all test days and mean importances"""
+    grouped: Dict[Tuple[str, str, str], List[Dict]] = {}
+    for result in fold_results:
+        grouped.setdefault((result["ticker"], result["model"], result["feature_set"]), []).append(result)
+
+    report: Dict = {}
+    for (ticker, model, feature_set), results in sorted(grouped.items()):
+        results.sort(key=lambda result: result["fold"])
+        actual, predicted, today = (
+            np.concatenate([result[key] for result in results]) for key in ("actual", "predicted", "today")
+        )
+        entry = {**error_metrics(actual, predicted, today), "folds": len(results)}
+        importances = [result["importances"] for result in results if result["importances"]]
+        if importances:
+            entry["feature_importances"] = {
+                feature: float(np.mean([imp[feature] for imp in importances])) for feature in importances[0]
+            }
+        report.setdefault(ticker, {}).setdefault(model, {})[feature_set] = entry
+    return report
+
+
+def run_backtest(histories: Dict[str, Tuple[pd.DataFrame, pd.DataFrame, object]],
+                 models: Sequence[str] = ("baseline", "rf"),
+                 feature_sets: Sequence[str] = ("all", "no_weather"),
+                 train_size: int = 500, test_size: int = 60, step: Optional[int] = None,
+                 expanding: bool = False, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None, params: Optional[Dict] = None) -> Dict:
+    """
+    Backtest every ticker in histories ({ticker: (stock, weather, sentiment)})
+    and return the summarize() report.
+    """
+    params = {"n_estimators": 100, "seed": 0, "sequence_length": 20, "hidden_dim": 32,
+              "num_layers": 1, "epochs": 5, "batch_size": 64, "learning_rate": 1e-3, **(params or {})}
+    cache = FeatureCache(cache_dir or os.path.join(CACHE_DIR, "backtest_features"))
+    builder = StockPricePredictor()
+
+    tasks = []
+    for ticker, (stock, weather, sentiment) in histories.items():
+        X, y = builder.prepare_features(stock, weather, sentiment)
+        entry = cache.put(ticker, X, y)
+        folds = walk_forward_folds(len(X), train_size, test_size, step, expanding)
+        if "lstm" in models:
+            # LSTM test windows need sequence_length - 1 rows of history before the fold
+            folds = [(train, test) for train, test in folds if test.start >= params["sequence_length"] - 1]
+        for model in models:
+            for feature_set in (feature_sets if model != "baseline" else ["all"]):
+                for fold, (train, test) in enumerate(folds):
+                    tasks.append({
+                        "ticker": ticker, "model": model, "feature_set": feature_set, "fold": fold,
+                        "train": (train.start, train.stop), "test": (test.start, test.stop),
+                        "entry": entry, "params": params,
+                    })
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_worker_init, initargs=(1,),
+    ) as pool:
+        for future in as_completed([pool.submit(_run_fold, task) for task in tasks]):
+            results.append(future.result())
+    return summarize(results)
+
+
+def synthetic_histories(tickers: int, days: int, seed: int = 0) -> Dict:
+    """Random-walk prices whose daily returns carry a small temperature effect"""
+    rng = np.random.default_rng(seed)
+    calendar_days = pd.date_range("2015-01-01", periods=int(days * 7 / 5) + 7)
+    season = 12 * np.sin(2 * np.pi * calendar_days.dayofyear / 365.25)
+    weather = pd.DataFrame({
+        "date": calendar_days,
+        "temperature": 12 + season + rng.normal(0, 3, len(calendar_days)),
+        "precipitation": rng.gamma(0.4, 4, len(calendar_days)),
+    })
+    trading = pd.bdate_range(calendar_days[0], periods=days)
+    anomaly = (weather.set_index("date")["temperature"] - 12 - pd.Series(season, index=calendar_days))
+    anomaly = anomaly.reindex(trading).to_numpy()
+
+    histories = {}
+    for i in range(tickers):
+        beta = rng.normal(0, 0.002)
+        returns = beta * anomaly + rng.normal(0.0003, 0.015, days)
+        close = 50 * np.exp(np.cumsum(returns))
+        stock = pd.DataFrame({"Close": close, "Volume": rng.lognormal(14, 0.3, days)}, index=trading)
+        news_days = trading[rng.random(days) < 0.3]
+        sentiment = pd.DataFrame({"date": news_days, "sentiment_score": rng.uniform(-1, 1, len(news_days))})
+        histories[f"SYN{i:03d}"] = (stock, weather, sentiment)
+    return histories
+
+
+def local_histories(tickers: List[str], weather_csv: str, start: str, end: str) -> Dict:
+    """Prices from the local price store and daily weather from a CSV with a date column"""
+    from ..models.finance import FinanceAnalyzer
+
+    stock = FinanceAnalyzer().fetch_many_stock_data(tickers, start, end)
+    weather = pd.read_csv(weather_csv, parse_dates=["date"])
+    return {ticker: (stock[ticker], weather, []) for ticker in tickers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="number of synthetic tickers")
+    parser.add_argument("--days", type=int, default=1500)
+    parser.add_argument("--tickers", nargs="*", default=[])
+    parser.add_argument("--weather-csv")
+    parser.add_argument("--start", default="2018-01-01")
+    parser.add_argument("--end", default=pd.Timestamp.today().strftime("%Y-%m-%d"))
+    parser.add_argument("--models", default="baseline,rf")
+    parser.add_argument("--feature-sets", default="all,no_weather")
+    parser.add_argument("--train-size", type=int, default=500)
+    parser.add_argument("--test-size", type=int, default=60)
+    parser.add_argument("--step", type=int)
+    parser.add_argument("--expanding", action="store_true")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--output", help="write the full report as JSON")
+    args = parser.parse_args()
+
+    models = args.models.split(",")
+    for model in models:
+        if model not in MODELS:
+            parser.error(f"unknown model {model}; choose from {', '.join(MODELS)}")
+    if args.synthetic:
+        histories = synthetic_histories(args.synthetic, args.days)
+    elif args.tickers and args.weather_csv:
+        histories = local_histories(args.tickers, args.weather_csv, args.start, args.end)
+    else:
+        parser.error("pass --synthetic N, or --tickers with --weather-csv")
+
+    start = time.perf_counter()
+    report = run_backtest(
+        histories, models, args.feature_sets.split(","), args.train_size, args.test_size,
+        args.step, args.expanding, args.workers,
+        params={"n_estimators": args.n_estimators, "epochs": args.epochs},
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"{'ticker':<10} {'model':<9} {'features':<11} {'folds':>5} {'mae':>9} {'rmse':>9} {'mape%':>7} {'dir_acc':>8}")
+    for ticker, by_model in report.items():
+        for model, by_set in by_model.items():
+            for feature_set, m in by_set.items():
+                direction = "" if m["directional_accuracy"] is None else f"{m['directional_accuracy']:.3f}"
+                print(f"{ticker:<10} {model:<9} {feature_set:<11} {m['folds']:>5} {m['mae']:>9.4f} "
+                      f"{m['rmse']:>9.4f} {m['mape']:>7.3f} {direction:>8}")
+    print(f"{len(histories)} tickers in {elapsed:.1f}s")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
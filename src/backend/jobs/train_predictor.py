@@ -0,0 +1,100 @@
+"""
+Offline training job for StockPricePredictor.
+
+Fetches prices (through the local price store), daily weather and,
+optionally, news sentiment; fits the scaler and random forest on the
+aligned features of every ticker; and saves a new version to the model
+store, which the API picks up as its latest predictor.
+
+    python -m src.backend.jobs.train_predictor --tickers AAPL MSFT --location "New York" \\
+        --start 2022-01-01 --end 2024-01-01
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from ..config import PREDICTOR_MODEL_NAME
+from ..models.finance import FinanceAnalyzer
+from ..models.model_store import ModelStore, get_model_store
+from ..models.prediction import StockPricePredictor
+from ..models.weather import WeatherAnalyzer
+from ..services.http_client import get_http_client
+
+
+async def _sentiment(ticker: str, start: datetime, end: datetime):
+    from ..nlp.sentiment import NLPAnalyzer
+    from ..services.sentiment_service import fetch_news_articles
+
+    articles = [a for a in await fetch_news_articles(ticker, start, end) if a.get('title')]
+    results = NLPAnalyzer().analyze_texts([article['title'] for article in articles])
+    return [
+        {'date': article['publishedAt'], 'sentiment': result['sentiment'], 'score': result['score']}
+        for article, result in zip(articles, results)
+    ]
+
+
+async def load_training_data(tickers, location: str, start: datetime, end: datetime, with_news: bool):
+    """(stock, weather, sentiment) per ticker; weather is shared"""
+    try:
+        stock = FinanceAnalyzer().fetch_many_stock_data(tickers, start, end)
+        weather = await WeatherAnalyzer().fetch_weather_data(location, start, end)
+        sentiment = {ticker: [] for ticker in tickers}
+        if with_news:
+            for ticker, records in zip(tickers, await asyncio.gather(*[
+                _sentiment(ticker, start, end) for ticker in tickers
+            ])):
+                sentiment[ticker] = records
+        return stock, weather, sentiment
+    finally:
+        await get_http_client().aclose()
+
+
+def train(stock, weather, sentiment, n_estimators: int = 100, store: ModelStore = None,
+          name: str = PREDICTOR_MODEL_NAME, metadata=None) -> str:
+    """Fit on the aligned features of every ticker and save a new version"""
+    predictor = StockPricePredictor(RandomForestRegressor(n_estimators=n_estimators, n_jobs=-1))
+    features, targets = [], []
+    for ticker, stock_data in stock.items():
+        X, y = predictor.prepare_features(stock_data, weather, sentiment.get(ticker, []))
+        logging.info(f"{ticker}: {len(X)} training rows")
+        features.append(X)
+        targets.append(y)
+    X, y = pd.concat(features), pd.concat(targets)
+    if len(X) < 2:
+        raise Exception("Error training predictor: not enough aligned rows")
+    predictor.train_model(X, y)
+    return predictor.save(store or get_model_store(), name, metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="+", required=True)
+    parser.add_argument("--location", required=True)
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=datetime.now())
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--with-news", action="store_true",
+                        help="add NewsAPI sentiment (only recent articles are available)")
+    parser.add_argument("--name", default=PREDICTOR_MODEL_NAME)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    stock, weather, sentiment = asyncio.run(
+        load_training_data(args.tickers, args.location, args.start, args.end, args.with_news)
+    )
+    version = train(stock, weather, sentiment, args.n_estimators, name=args.name, metadata={
+        'tickers': args.tickers,
+        'location': args.location,
+        'start': args.start.date().isoformat(),
+        'end': args.end.date().isoformat(),
+        'n_estimators': args.n_estimators,
+    })
+    print(f"Saved {args.name} version {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,28 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from fastapi import FastAPI, Header, HTTPException, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from datetime import datetime
-import yfinance as yf
-from typing import List, Optional
-import pandas as pd
+from typing import Optional
 
 from .models.finance import FinanceAnalyzer
 from .models.weather import WeatherAnalyzer
+from .config import MODEL_WARMUP
+from .nlp.micro_batching import MicroBatcher
+from .nlp.model_registry import get_model_registry
 from .nlp.sentiment import NLPAnalyzer
+from .services.correlation_service import CorrelationAnalyzer
+from .services.alignment import align_sources
+from .services.http_client import get_http_client
+from .services.live_stream import LiveAnalyticsStream
+from .services.result_cache import ResultCache, includes_today, request_key
+from .services.sentiment_service import SentimentAnalyzer
+from .services.streaming import negotiate, stream_response
+from .services.telemetry import get_metrics, observe, profiling, span
+from .services.warmup import Warmup, preload_modules
+from .services.websocket_service import WebSocketManager
 
 app = FastAPI()
 
@@ -21,10 +35,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize analyzers
+# Initialize analyzers. Construction is cheap: heavy libraries are imported
+# where they are used and models load through the shared registry on first
+# use, or from the warm-up task below
 finance_analyzer = FinanceAnalyzer()
 weather_analyzer = WeatherAnalyzer()
 nlp_analyzer = NLPAnalyzer()
+# Single-text sentiment requests are batched together on a dedicated inference thread
+sentiment_batcher = MicroBatcher(nlp_analyzer)
+sentiment_analyzer = SentimentAnalyzer()
+correlation_analyzer = CorrelationAnalyzer()
+# Identical analysis requests within the TTL (or while one is running) share a result
+result_cache = ResultCache()
+# Live updates: one poll per unique ticker/location, fanned out to every subscriber
+websocket_manager = WebSocketManager()
+live_stream = LiveAnalyticsStream(websocket_manager, finance_analyzer, weather_analyzer, nlp_analyzer)
+
+# Start-up work that MODEL_WARMUP runs before or alongside serving
+warmup = Warmup({
+    "modules": preload_modules(["scipy.signal", "scipy.stats", "sklearn.linear_model"]),
+    "sentiment_model": nlp_analyzer.warm_up,
+})
+
+# Component stats exported as gauges on /api/metrics
+metrics = get_metrics()
+metrics.register_stats("result_cache", result_cache.stats)
+metrics.register_stats("sentiment_cache", nlp_analyzer.cache_stats)
+metrics.register_stats("sentiment_batcher", sentiment_batcher.stats)
+metrics.register_stats("weather_store", weather_analyzer.store.stats)
+metrics.register_stats("geocoder", weather_analyzer.geocoder.stats)
+metrics.register_stats("websocket", websocket_manager.stats)
+metrics.register_stats("live_stream", live_stream.stats)
 
 class StockRequest(BaseModel):
     ticker: str
@@ -32,63 +73,161 @@ class StockRequest(BaseModel):
     end_date: datetime
     location: str
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template, not raw path, so tickers do not become series
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    observe("http_request_duration_seconds", time.perf_counter() - start,
+            route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.on_event("startup")
+async def startup():
+    if MODEL_WARMUP == "blocking":
+        await warmup.run()
+    elif MODEL_WARMUP == "background":
+        app.state.warmup = asyncio.create_task(warmup.run())
+    app.state.model_monitor = asyncio.create_task(get_model_registry().monitor())
+    app.state.live_stream = asyncio.create_task(live_stream.run())
+
+@app.on_event("shutdown")
+async def shutdown():
+    if getattr(app.state, "warmup", None) is not None:
+        app.state.warmup.cancel()
+    app.state.model_monitor.cancel()
+    app.state.live_stream.cancel()
+    await sentiment_batcher.close()
+    await websocket_manager.close()
+    await get_http_client().aclose()
+
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy"}
+    # Liveness: answers as soon as the app is up, whatever the warm-up state
+    return {"status": "healthy", "warmup": warmup.state if MODEL_WARMUP != "off" else "off"}
+
+@app.get("/api/ready")
+async def readiness_check():
+    # Readiness: 503 until warm-up has finished (immediately ready when warm-up is off)
+    ready = MODEL_WARMUP == "off" or warmup.ready
+    return JSONResponse(
+        {"ready": ready, "mode": MODEL_WARMUP, **warmup.status()},
+        status_code=200 if ready else 503,
+    )
+
+@app.get("/api/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.post("/api/analyze")
-async def analyze_data(request: StockRequest):
+async def analyze_data(request: StockRequest, profile: bool = False, series: Optional[str] = None,
+                       accept: Optional[str] = Header(None)):
+    fmt = negotiate(accept)
+    if fmt != "json":
+        return await _stream_analysis(request, fmt, series)
+    try:
+        if profile:
+            # Profiled requests skip the result cache so every stage really runs
+            with profiling() as trace:
+                result = await _analyze(request)
+            return {**result, "profile": trace.summary()}
+        key = request_key("analyze", request.ticker, request.location, request.start_date, request.end_date)
+        return await result_cache.get_or_compute(
+            key, lambda: _analyze(request), live=includes_today(request.end_date)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _stream_analysis(request: StockRequest, fmt: str, series: Optional[str]):
+    # Streamed formats carry the daily series as well, so they skip the result cache
     try:
-        # Fetch stock data
-        stock_data = finance_analyzer.fetch_stock_data(
+        stock_data, weather_data = await _fetch_sources(request)
+        with span("analysis.combine"):
+            summary = finance_analyzer.combine_analysis(stock_data, weather_data)
+            frames = {"daily": align_sources(stock_data, weather_data).to_frame()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    try:
+        return stream_response(fmt, summary, frames, series)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _fetch_sources(request: StockRequest):
+    # Fetch stock data (blocking provider, so off the event loop)
+    with span("fetch.stock"):
+        stock_data = await asyncio.get_running_loop().run_in_executor(
+            None,
+            finance_analyzer.fetch_stock_data,
             request.ticker,
             request.start_date,
             request.end_date
         )
-        
-        # Fetch weather data
-        weather_data = weather_analyzer.fetch_weather_data(
+    
+    # Fetch weather data
+    with span("fetch.weather"):
+        weather_data = await weather_analyzer.fetch_weather_data(
             request.location,
             request.start_date,
             request.end_date
         )
-        
-        # Perform analysis
-        combined_analysis = finance_analyzer.combine_analysis(stock_data, weather_data)
-        
-        return combined_analysis
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return stock_data, weather_data
+
+async def _analyze(request: StockRequest):
+    stock_data, weather_data = await _fetch_sources(request)
+    
+    # Perform analysis
+    with span("analysis.combine"):
+        return finance_analyzer.combine_analysis(stock_data, weather_data)
 
 @app.post("/api/sentiment")
 async def analyze_sentiment(text: str):
     try:
-        sentiment = nlp_analyzer.analyze_text(text)
+        sentiment = await sentiment_batcher.analyze(text)
         return sentiment
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+@app.get("/api/stats/sentiment")
+async def sentiment_batcher_stats():
+    return {"batcher": sentiment_batcher.stats(), "cache": nlp_analyzer.cache_stats()}
+
 @app.get("/api/sentiment/{ticker}")
 async def get_sentiment_analysis(ticker: str, days: int = 7):
     try:
-        sentiment_analyzer = SentimentAnalyzer()
-        sentiments = sentiment_analyzer.analyze_news(ticker, days)
+        sentiments = await sentiment_analyzer.analyze_news(ticker, days)
         return {"success": True, "data": sentiments}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/correlations/{ticker}")
-async def get_correlations(ticker: str, location: str):
+async def get_correlations(ticker: str, location: str, profile: bool = False):
     try:
-        correlation_analyzer = CorrelationAnalyzer()
-        stock_data = finance_analyzer.fetch_stock_data(ticker)
-        weather_data = weather_analyzer.fetch_weather_data(location)
-        sentiment_analyzer = SentimentAnalyzer()
-        sentiment_data = sentiment_analyzer.analyze_news(ticker)
-        
-        correlations = correlation_analyzer.analyze_correlations(
-            stock_data, weather_data, sentiment_data
-        )
+        if profile:
+            with profiling() as trace:
+                correlations = await _correlations(ticker, location)
+            return {"success": True, "data": correlations, "profile": trace.summary()}
+        key = request_key("correlations", ticker, location)
+        correlations = await result_cache.get_or_compute(key, lambda: _correlations(ticker, location))
         return {"success": True, "data": correlations}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _correlations(ticker: str, location: str):
+    with span("fetch.stock"):
+        stock_data = await asyncio.get_running_loop().run_in_executor(
+            None, finance_analyzer.fetch_stock_data, ticker
+        )
+    with span("fetch.weather"):
+        weather_data = await weather_analyzer.fetch_weather_data(location)
+    with span("fetch.sentiment"):
+        sentiment_data = await sentiment_analyzer.analyze_news(ticker)
+    
+    with span("analysis.correlations"):
+        return correlation_analyzer.analyze_correlations(
+            stock_data, weather_data, sentiment_data
+        )
+
+@app.websocket("/ws/live/{ticker}")
+async def live_updates(websocket: WebSocket, ticker: str, location: str):
+    await live_stream.serve(websocket, ticker, location)
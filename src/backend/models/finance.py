@@ -1,54 +1,73 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from typing import Dict, List
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ..services.alignment import align_sources
+from ..services.price_store import PriceStore
+from .indicators import IndicatorEngine
 
 class FinanceAnalyzer:
-    def __init__(self):
-        self.scaler = StandardScaler()
+    def __init__(self, price_store: Optional[PriceStore] = None):
+        self.price_store = price_store or PriceStore()
+        self.indicator_engine = IndicatorEngine([("sma", 20), ("sma", 50), ("rsi", 14)])
         
-    def fetch_stock_data(self, ticker: str, start_date, end_date) -> pd.DataFrame:
-        """Fetch stock data using yfinance"""
+    def fetch_stock_data(self, ticker: str, start_date=None, end_date=None) -> pd.DataFrame:
+        """Fetch daily OHLCV, served from the local price store where possible"""
+        end_date = end_date or datetime.now()
+        start_date = start_date or end_date - timedelta(days=30)
         try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(start=start_date, end=end_date)
-            return data
+            return self.price_store.get(ticker, start_date, end_date)
+        except Exception as e:
+            raise Exception(f"Error fetching stock data: {str(e)}")
+
+    def fetch_many_stock_data(self, tickers: List[str], start_date, end_date) -> Dict[str, pd.DataFrame]:
+        """Fetch daily OHLCV for many tickers in one batched provider call"""
+        try:
+            return self.price_store.get_many(tickers, start_date, end_date)
         except Exception as e:
             raise Exception(f"Error fetching stock data: {str(e)}")
     
     def calculate_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators"""
         df = data.copy()
+        indicators = self.indicator_engine.compute(df['Close'].to_numpy())
         
         # Moving averages
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA50'] = df['Close'].rolling(window=50).mean()
+        df['MA20'] = indicators['sma_20'][:, 0]
+        df['MA50'] = indicators['sma_50'][:, 0]
         
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        # Wilder RSI
+        df['RSI'] = indicators['rsi_14'][:, 0]
         
         return df
     
+    def analyze_stock(self, data: pd.DataFrame) -> Dict:
+        """Summarize price action and latest technical indicators"""
+        df = self.calculate_technical_indicators(data)
+        latest = df.iloc[-1]
+        returns = df['Close'].pct_change()
+        summary = {
+            'start_price': df['Close'].iloc[0],
+            'end_price': latest['Close'],
+            'price_change': returns.mean() * 100,
+            'volatility': returns.std() * 100,
+            'MA20': latest['MA20'],
+            'MA50': latest['MA50'],
+            'RSI': latest['RSI']
+        }
+        return {key: None if pd.isna(value) else float(value) for key, value in summary.items()}
+    
     def combine_analysis(self, stock_data: pd.DataFrame, weather_data: pd.DataFrame) -> Dict:
         """Combine stock and weather data analysis"""
         # Calculate correlations
-        combined_data = pd.merge(
-            stock_data,
-            weather_data,
-            left_index=True,
-            right_index=True
-        )
+        combined_data = align_sources(stock_data, weather_data)
         
         correlations = {}
         for weather_col in ['temperature', 'precipitation']:
-            if weather_col in combined_data.columns:
-                corr = combined_data['Close'].corr(combined_data[weather_col])
-                correlations[f'{weather_col}_correlation'] = corr
+            if weather_col in combined_data:
+                corr = combined_data.to_frame(['Close', weather_col]).corr().iloc[0, 1]
+                correlations[f'{weather_col}_correlation'] = None if pd.isna(corr) else float(corr)
         
         # Calculate metrics
         metrics = {
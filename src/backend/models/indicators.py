@@ -0,0 +1,260 @@
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+# (kind, window[, k]) specs understood by IndicatorEngine
+DEFAULT_INDICATORS = [
+    ("sma", 20),
+    ("sma", 50),
+    ("ema", 12),
+    ("ema", 26),
+    ("rsi", 14),
+    ("volatility", 20),
+    ("bollinger", 20, 2.0),
+]
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column (leading NaNs stay NaN)"""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = values[rows, np.arange(values.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    """Row of the first non-NaN value per column (len(values) if none)"""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum along axis 0 via cumulative sums; values must be NaN-free"""
+    csum = np.cumsum(values, axis=0)
+    out = csum.copy()
+    out[window:] -= csum[:-window]
+    return out
+
+
+def _ema(values: np.ndarray, alpha: float, start: np.ndarray) -> np.ndarray:
+    """
+    Recursive EMA (adjust=False) seeded with each column's first valid value,
+    run as a single IIR filter over all columns.
+    """
+    from scipy.signal import lfilter
+
+    rows = np.arange(len(values))[:, None]
+    before = rows < start
+    seed = np.zeros(values.shape[1])
+    has_data = start < len(values)
+    seed[has_data] = values[start[has_data], np.flatnonzero(has_data)]
+    centered = np.where(before, 0.0, values - seed)
+    # Scale the first valid input so the filter output starts exactly at it
+    first = rows == start
+    centered = np.where(first, centered / alpha, centered)
+    out = lfilter([alpha], [1.0, alpha - 1.0], centered, axis=0) + seed
+    out[before] = np.nan
+    return out
+
+
+class IndicatorEngine:
+    """
+    Technical indicators for a wide (date x ticker) price array.
+
+    Every indicator is computed for all tickers at once with cumulative-sum
+    rolling windows and IIR filters along the date axis; there is no loop
+    or frame copy per ticker. Gaps after a ticker's first price are
+    forward-filled; values are NaN until the indicator's window is full.
+
+    Output names: sma_N, ema_N, rsi_N (Wilder), volatility_N (std of daily
+    returns), bb_mid_N / bb_upper_N / bb_lower_N (population std bands).
+    """
+
+    def __init__(self, indicators: Optional[Sequence[Tuple]] = None):
+        self.indicators = [tuple(spec) for spec in (indicators or DEFAULT_INDICATORS)]
+        for spec in self.indicators:
+            if spec[0] not in ("sma", "ema", "rsi", "volatility", "bollinger"):
+                raise ValueError(f"Unknown indicator: {spec[0]}")
+
+    def compute(self, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim == 1:
+            prices = prices[:, None]
+        prices = _ffill(prices)
+        start = _first_valid(prices)
+        rows = np.arange(len(prices))[:, None]
+        seen = rows - start + 1  # number of prices observed so far per column
+
+        # Center on each column's first price so cumulative sums stay well conditioned
+        has_data = start < len(prices)
+        ref = np.zeros(prices.shape[1])
+        ref[has_data] = prices[start[has_data], np.flatnonzero(has_data)]
+        centered = np.nan_to_num(prices - ref)
+
+        returns = np.full_like(prices, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns[1:] = prices[1:] / prices[:-1] - 1
+        delta = np.full_like(prices, np.nan)
+        delta[1:] = prices[1:] - prices[:-1]
+
+        out = {}
+        for spec in self.indicators:
+            kind, window = spec[0], int(spec[1])
+            if kind == "sma":
+                out[f"sma_{window}"] = self._sma(centered, ref, seen, window)
+            elif kind == "ema":
+                ema = _ema(prices, 2.0 / (window + 1), start)
+                ema[seen < window] = np.nan
+                out[f"ema_{window}"] = ema
+            elif kind == "rsi":
+                out[f"rsi_{window}"] = self._rsi(delta, start, seen, window)
+            elif kind == "volatility":
+                out[f"volatility_{window}"] = self._rolling_std(returns, seen - 1, window, ddof=1)
+            else:
+                k = float(spec[2]) if len(spec) > 2 else 2.0
+                mid = self._sma(centered, ref, seen, window)
+                std = self._rolling_std(prices, seen, window, ddof=0)
+                out[f"bb_mid_{window}"] = mid
+                out[f"bb_upper_{window}"] = mid + k * std
+                out[f"bb_lower_{window}"] = mid - k * std
+        return out
+
+    @staticmethod
+    def _sma(centered: np.ndarray, ref: np.ndarray, seen: np.ndarray, window: int) -> np.ndarray:
+        sma = _rolling_sum(centered, window) / window + ref
+        sma[seen < window] = np.nan
+        return sma
+
+    @staticmethod
+    def _rolling_std(values: np.ndarray, seen: np.ndarray, window: int, ddof: int) -> np.ndarray:
+        """Rolling std over `window` observations; `seen` counts observations per row"""
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        ref = filled.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+        centered = np.where(valid, values - ref, 0.0)
+        total = _rolling_sum(centered, window)
+        total_sq = _rolling_sum(centered * centered, window)
+        var = (total_sq - total * total / window) / (window - ddof)
+        std = np.sqrt(np.maximum(var, 0.0))
+        std[seen < window] = np.nan
+        return std
+
+    @staticmethod
+    def _rsi(delta: np.ndarray, start: np.ndarray, seen: np.ndarray, window: int) -> np.ndarray:
+        alpha = 1.0 / window
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+        gains[np.isnan(delta)] = np.nan
+        losses[np.isnan(delta)] = np.nan
+        avg_gain = _ema(gains, alpha, start + 1)
+        avg_loss = _ema(losses, alpha, start + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        rsi[seen - 1 < window] = np.nan
+        return rsi
+
+    def stream(self, history: np.ndarray) -> "IndicatorStream":
+        """Start an incremental stream seeded with a (date x ticker) history"""
+        return IndicatorStream(self, history)
+
+
+class IndicatorStream:
+    """
+    Append-one-bar mode for IndicatorEngine.
+
+    Keeps a tail buffer as long as the largest window plus the EMA and Wilder
+    average states per ticker, so each append() costs O(window x tickers)
+    regardless of how much history came before.
+    """
+
+    def __init__(self, engine: IndicatorEngine, history: np.ndarray):
+        history = np.asarray(history, dtype=np.float64)
+        if history.ndim == 1:
+            history = history[:, None]
+        self.engine = engine
+        self.indicators = engine.indicators
+        history = _ffill(history)
+        self.width = history.shape[1]
+        self.max_window = max(int(spec[1]) for spec in self.indicators) + 1
+        self.buffer = history[-self.max_window:].copy()
+        self.buffer_returns = np.full_like(self.buffer, np.nan)
+        self.buffer_returns[1:] = self.buffer[1:] / self.buffer[:-1] - 1
+        start = _first_valid(history)
+        self.seen = len(history) - start  # prices observed per ticker
+        self.last = history[-1].copy() if len(history) else np.full(self.width, np.nan)
+
+        # Seed recursive states from the batch results over the history
+        self.ema: Dict[int, np.ndarray] = {}
+        self.avg_gain: Dict[int, np.ndarray] = {}
+        self.avg_loss: Dict[int, np.ndarray] = {}
+        for spec in self.indicators:
+            window = int(spec[1])
+            if spec[0] == "ema":
+                self.ema[window] = _ema(history, 2.0 / (window + 1), start)[-1] if len(history) else np.full(self.width, np.nan)
+            elif spec[0] == "rsi":
+                delta = np.full_like(history, np.nan)
+                delta[1:] = history[1:] - history[:-1]
+                gains = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+                losses = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+                self.avg_gain[window] = _ema(gains, 1.0 / window, start + 1)[-1] if len(history) else np.full(self.width, np.nan)
+                self.avg_loss[window] = _ema(losses, 1.0 / window, start + 1)[-1] if len(history) else np.full(self.width, np.nan)
+
+    @staticmethod
+    def _recurse(state: np.ndarray, value: np.ndarray, alpha: float) -> np.ndarray:
+        updated = alpha * value + (1 - alpha) * state
+        seed = np.isnan(state)
+        updated[seed] = value[seed]
+        updated[np.isnan(value)] = state[np.isnan(value)]
+        return updated
+
+    def append(self, bar: np.ndarray) -> Dict[str, np.ndarray]:
+        """Add one bar (one price per ticker, NaN = no trade) and return the latest values"""
+        bar = np.asarray(bar, dtype=np.float64).copy()
+        bar = np.where(np.isnan(bar), self.last, bar)  # forward-fill
+        delta = bar - self.last
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret = bar / self.last - 1
+        self.seen = self.seen + ~np.isnan(bar)
+        self.last = bar
+
+        self.buffer = np.vstack([self.buffer[1 - self.max_window:], bar])
+        self.buffer_returns = np.vstack([self.buffer_returns[1 - self.max_window:], ret])
+
+        out = {}
+        for spec in self.indicators:
+            kind, window = spec[0], int(spec[1])
+            if kind == "sma":
+                out[f"sma_{window}"] = self._window_mean(window)
+            elif kind == "ema":
+                self.ema[window] = self._recurse(self.ema[window], bar, 2.0 / (window + 1))
+                value = self.ema[window].copy()
+                value[self.seen < window] = np.nan
+                out[f"ema_{window}"] = value
+            elif kind == "rsi":
+                gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+                loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+                self.avg_gain[window] = self._recurse(self.avg_gain[window], gain, 1.0 / window)
+                self.avg_loss[window] = self._recurse(self.avg_loss[window], loss, 1.0 / window)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    rsi = 100 - 100 / (1 + self.avg_gain[window] / self.avg_loss[window])
+                rsi[self.seen - 1 < window] = np.nan
+                out[f"rsi_{window}"] = rsi
+            elif kind == "volatility":
+                vol = np.std(self.buffer_returns[-window:], axis=0, ddof=1)
+                vol[self.seen - 1 < window] = np.nan
+                out[f"volatility_{window}"] = vol
+            else:
+                k = float(spec[2]) if len(spec) > 2 else 2.0
+                mid = self._window_mean(window)
+                std = np.std(self.buffer[-window:], axis=0)
+                std[self.seen < window] = np.nan
+                out[f"bb_mid_{window}"] = mid
+                out[f"bb_upper_{window}"] = mid + k * std
+                out[f"bb_lower_{window}"] = mid - k * std
+        return out
+
+    def _window_mean(self, window: int) -> np.ndarray:
+        mean = self.buffer[-window:].mean(axis=0)
+        mean[self.seen < window] = np.nan
+        return mean
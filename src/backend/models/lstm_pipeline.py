@@ -0,0 +1,203 @@
+import warnings
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
+
+from ..config import LSTM_NUM_THREADS
+
+
+# Deep Learning Model
+class LSTMPredictor(nn.Module):
+    def __init__(self, input_dim, hidden_dim, num_layers):
+        super(LSTMPredictor, self).__init__()
+        self.hidden_dim = hidden_dim
+        self.num_layers = num_layers
+        
+        self.lstm = nn.LSTM(input_dim, hidden_dim, num_layers, batch_first=True)
+        self.fc = nn.Linear(hidden_dim, 1)
+        
+    def forward(self, x):
+        lstm_out, _ = self.lstm(x)
+        predictions = self.fc(lstm_out[:, -1, :])
+        return predictions
+
+
+def sliding_windows(values: np.ndarray, sequence_length: int) -> np.ndarray:
+    """
+    (rows - sequence_length + 1, sequence_length, features) view of a
+    (rows, features) array; windows[i] covers rows i .. i + sequence_length - 1.
+    No data is copied.
+    """
+    return np.lib.stride_tricks.sliding_window_view(values, sequence_length, axis=0).transpose(0, 2, 1)
+
+
+class WindowDataset(Dataset):
+    """
+    Windows over several series stacked end to end, skipping any window that
+    would straddle two series. Indexed by a list of window ids so a whole
+    mini-batch is gathered from the strided view in one fancy-index.
+    """
+
+    def __init__(self, series: Sequence[np.ndarray], targets: Optional[Sequence[np.ndarray]], sequence_length: int):
+        self.values = np.ascontiguousarray(np.concatenate(series), dtype=np.float32)
+        self.windows = sliding_windows(self.values, sequence_length)
+        ends, offset = [], 0
+        for part in series:
+            ends.append(np.arange(offset + sequence_length - 1, offset + len(part)))
+            offset += len(part)
+        self.ends = np.concatenate(ends) if ends else np.zeros(0, dtype=np.int64)
+        self.targets = None
+        if targets is not None:
+            self.targets = np.concatenate(targets).astype(np.float32)
+            keep = ~np.isnan(self.targets[self.ends])
+            self.ends = self.ends[keep]
+        self.sequence_length = sequence_length
+
+    def __len__(self):
+        return len(self.ends)
+
+    def __getitem__(self, indices):
+        ends = self.ends[indices]
+        x = torch.from_numpy(self.windows[ends - self.sequence_length + 1])
+        if self.targets is None:
+            return x
+        return x, torch.from_numpy(self.targets[ends])[:, None]
+
+
+class ScaledLSTM(nn.Module):
+    """LSTMPredictor with input scaling and target unscaling built in, so exported models are self-contained"""
+
+    def __init__(self, model: LSTMPredictor, mean: np.ndarray, std: np.ndarray, y_mean: float, y_std: float):
+        super().__init__()
+        self.model = model
+        self.register_buffer("mean", torch.as_tensor(mean, dtype=torch.float32))
+        self.register_buffer("std", torch.as_tensor(std, dtype=torch.float32))
+        self.register_buffer("y_mean", torch.tensor(float(y_mean)))
+        self.register_buffer("y_std", torch.tensor(float(y_std)))
+
+    def forward(self, x):
+        return self.model((x - self.mean) / self.std)[:, 0] * self.y_std + self.y_mean
+
+
+class LSTMPipeline:
+    """
+    Training and inference around LSTMPredictor on aligned feature matrices.
+
+    Inputs are (rows, features) arrays, one per ticker, e.g. from
+    StockPricePredictor.build_features; targets are aligned per row (NaN
+    rows are skipped). Windows are strided views over the scaled features,
+    so memory stays O(rows x features) whatever the sequence length.
+    """
+
+    def __init__(self, sequence_length: int = 20, hidden_dim: int = 32, num_layers: int = 1,
+                 epochs: int = 10, batch_size: int = 64, learning_rate: float = 1e-3,
+                 num_threads: int = LSTM_NUM_THREADS, seed: int = 0):
+        self.sequence_length = sequence_length
+        self.hidden_dim = hidden_dim
+        self.num_layers = num_layers
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.num_threads = num_threads
+        self.seed = seed
+        self.model: Optional[nn.Module] = None
+        self.losses = []
+
+    def _set_threads(self):
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+    @staticmethod
+    def _as_series(X) -> list:
+        if isinstance(X, dict):
+            X = list(X.values())
+        if isinstance(X, np.ndarray) or hasattr(X, "to_numpy"):
+            X = [X]
+        return [np.asarray(part, dtype=np.float32) for part in X]
+
+    def fit(self, X, y) -> "LSTMPipeline":
+        """Fit on one series or a list/dict of per-ticker series with matching targets"""
+        self._set_threads()
+        torch.manual_seed(self.seed)
+        if isinstance(X, dict):
+            y = [y[ticker] for ticker in X]
+        series, targets = self._as_series(X), self._as_series(y)
+        stacked = np.concatenate(series)
+        mean, std = stacked.mean(axis=0), stacked.std(axis=0) + 1e-8
+        target_values = np.concatenate(targets)
+        y_mean, y_std = np.nanmean(target_values), np.nanstd(target_values) + 1e-8
+
+        dataset = WindowDataset(
+            [(part - mean) / std for part in series],
+            [(part - y_mean) / y_std for part in targets],
+            self.sequence_length,
+        )
+        if len(dataset) == 0:
+            raise ValueError(f"Need at least {self.sequence_length} rows with targets to train")
+        loader = DataLoader(
+            dataset, batch_size=None,
+            sampler=BatchSampler(RandomSampler(dataset), self.batch_size, drop_last=False),
+        )
+
+        model = LSTMPredictor(stacked.shape[1], self.hidden_dim, self.num_layers)
+        optimizer = torch.optim.Adam(model.parameters(), lr=self.learning_rate)
+        loss_fn = nn.MSELoss()
+        model.train()
+        self.losses = []
+        for _ in range(self.epochs):
+            total = 0.0
+            for batch_x, batch_y in loader:
+                optimizer.zero_grad()
+                loss = loss_fn(model(batch_x), batch_y)
+                loss.backward()
+                optimizer.step()
+                total += loss.item() * len(batch_x)
+            self.losses.append(total / len(dataset))
+        self.model = ScaledLSTM(model, mean, std, y_mean, y_std).eval()
+        return self
+
+    def predict(self, X, batch_size: int = 1024) -> np.ndarray:
+        """Prediction for every complete window of one series (one value per row from sequence_length - 1 on)"""
+        self._set_threads()
+        dataset = WindowDataset(self._as_series(X), None, self.sequence_length)
+        loader = DataLoader(dataset, batch_size=None,
+                            sampler=BatchSampler(SequentialSampler(dataset), batch_size, drop_last=False))
+        with torch.inference_mode():
+            outputs = [self.model(batch) for batch in loader]
+        return torch.cat(outputs).numpy() if outputs else np.zeros(0, dtype=np.float32)
+
+    def predict_latest(self, histories: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """
+        Score many tickers in one forward pass: the latest window of each
+        history goes into a single (tickers, sequence_length, features) batch.
+        Tickers with fewer rows than sequence_length are left out.
+        """
+        self._set_threads()
+        tickers = [ticker for ticker, values in histories.items() if len(values) >= self.sequence_length]
+        if not tickers:
+            return {}
+        batch = np.stack([
+            np.asarray(histories[ticker], dtype=np.float32)[-self.sequence_length:] for ticker in tickers
+        ])
+        with torch.inference_mode():
+            predictions = self.model(torch.from_numpy(batch)).numpy()
+        return dict(zip(tickers, predictions.tolist()))
+
+    def export_torchscript(self, path: str):
+        """Save the fitted model, scaling included, as TorchScript for serving"""
+        with warnings.catch_warnings():
+            # TorchScript is deprecated upstream but still the simplest self-contained CPU artifact
+            warnings.simplefilter("ignore", FutureWarning)
+            torch.jit.script(self.model).save(path)
+
+    @classmethod
+    def load_torchscript(cls, path: str, sequence_length: int, num_threads: int = LSTM_NUM_THREADS) -> "LSTMPipeline":
+        """Inference-only pipeline around an exported model"""
+        pipeline = cls(sequence_length=sequence_length, num_threads=num_threads)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            pipeline.model = torch.jit.load(path).eval()
+        return pipeline
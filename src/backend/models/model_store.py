@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import MODEL_STORE_DIR
+
+
+def training_fingerprint(X, y) -> str:
+    """Content hash of a training set: feature names, values and target"""
+    digest = hashlib.sha256()
+    if isinstance(X, pd.DataFrame):
+        digest.update(json.dumps(list(map(str, X.columns))).encode())
+    for values in (X, y):
+        array = np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """
+    Versioned on-disk model artifacts.
+
+    Each save writes <root>/<name>/<version>/ with the fitted objects in
+    model.joblib and a metadata.json next to it (feature schema, training
+    fingerprint, library versions), then points <name>/LATEST at it.
+    Artifacts are stored uncompressed so load() can memory-map the large
+    arrays inside them instead of reading them into a buffer first.
+    Objects that keep plain arrays stay backed by the page cache; sklearn
+    trees copy their node tables once out of the map, so a forest loads
+    with a single in-memory copy rather than two.
+    """
+
+    def __init__(self, root: str = MODEL_STORE_DIR):
+        self.root = root
+
+    def _path(self, name: str, version: str) -> str:
+        return os.path.join(self.root, name, version)
+
+    def save(self, name: str, artifact: Any, metadata: Optional[Dict] = None) -> str:
+        """Write a new version of an artifact and make it the latest; returns the version"""
+        version = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        path = self._path(name, version)
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = self._path(name, f"{version}-{suffix}")
+        version = os.path.basename(path)
+
+        import joblib
+        import sklearn
+
+        tmp = f"{path}.tmp"
+        os.makedirs(tmp)
+        joblib.dump(artifact, os.path.join(tmp, "model.joblib"))
+        with open(os.path.join(tmp, "metadata.json"), "w") as f:
+            json.dump({
+                **(metadata or {}),
+                "name": name,
+                "version": version,
+                "created_at": time.time(),
+                "sklearn_version": sklearn.__version__,
+                "numpy_version": np.__version__,
+            }, f, indent=2)
+        os.replace(tmp, path)
+
+        latest = os.path.join(self.root, name, "LATEST")
+        with open(f"{latest}.tmp", "w") as f:
+            f.write(version)
+        os.replace(f"{latest}.tmp", latest)
+        return version
+
+    def versions(self, name: str) -> List[str]:
+        directory = os.path.join(self.root, name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            entry for entry in os.listdir(directory)
+            if os.path.exists(os.path.join(directory, entry, "metadata.json"))
+        )
+
+    def latest(self, name: str) -> Optional[str]:
+        path = os.path.join(self.root, name, "LATEST")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return f.read().strip() or None
+
+    def metadata(self, name: str, version: Optional[str] = None) -> Dict:
+        version = version or self.latest(name)
+        if version is None:
+            raise FileNotFoundError(f"No saved versions of model {name}")
+        with open(os.path.join(self._path(name, version), "metadata.json")) as f:
+            return json.load(f)
+
+    def load(self, name: str, version: Optional[str] = None, mmap_mode: Optional[str] = "r") -> Any:
+        """Load an artifact (the latest version by default), memory-mapping its arrays"""
+        version = version or self.latest(name)
+        if version is None:
+            raise FileNotFoundError(f"No saved versions of model {name}")
+        import joblib
+
+        return joblib.load(os.path.join(self._path(name, version), "model.joblib"), mmap_mode=mmap_mode)
+
+
+_model_store: Optional[ModelStore] = None
+
+
+def get_model_store() -> ModelStore:
+    global _model_store
+    if _model_store is None:
+        _model_store = ModelStore()
+    return _model_store
@@ -1,54 +1,118 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import torch
-import torch.nn as nn
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ..config import PREDICTOR_MODEL_NAME
+from ..services.alignment import align_sources
+from .model_store import ModelStore, get_model_store, training_fingerprint
+
+# sklearn is imported where a predictor is built and torch only by lstm_pipeline,
+# so importing this module (and the services using it) stays cheap
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+# Model feature -> aligned column; the target is the next session's close
+FEATURE_COLUMNS = {
+    'price': 'Close',
+    'volume': 'Volume',
+    'temperature': 'temperature',
+    'precipitation': 'precipitation',
+    'sentiment_score': 'sentiment_score',
+}
+# No reported rain and no news both read as zero rather than as a gap
+FEATURE_DEFAULTS = {'precipitation': 0.0, 'sentiment_score': 0.0}
 
 class StockPricePredictor:
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.rf_model = RandomForestRegressor(n_estimators=100)
-        self.features = ['price', 'volume', 'temperature', 'precipitation', 'sentiment_score']
-        
-    def prepare_features(self, stock_data, weather_data, sentiment_data):
-        """Combine and prepare features for prediction"""
-        combined_data = pd.merge(
-            stock_data,
-            weather_data,
-            on='date'
-        )
-        combined_data = pd.merge(
-            combined_data,
-            sentiment_data,
-            on='date'
-        )
-        
-        X = combined_data[self.features]
-        y = combined_data['target_price']
+    """
+    Random forest over aligned price, weather and sentiment features,
+    predicting the next session's close.
+
+    Fitting happens offline (src/backend/jobs/train_predictor.py); the
+    service loads the fitted scaler and forest from the ModelStore and only
+    runs inference per request.
+    """
+
+    def __init__(self, model: Optional["RandomForestRegressor"] = None,
+                 scaler: Optional["StandardScaler"] = None,
+                 features: Optional[List[str]] = None):
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = scaler if scaler is not None else StandardScaler()
+        self.rf_model = model if model is not None else RandomForestRegressor(n_estimators=100)
+        self.features = list(features or FEATURE_COLUMNS)
+        self.metadata: Dict = {}
         
-        return self.scaler.fit_transform(X), y
+    def build_features(self, stock_data, weather_data, sentiment_data) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Unscaled features for every day with complete inputs, and the next
+        session's close as target (NaN on the latest day, whose next close
+        is not known yet).
+        """
+        aligned = align_sources(stock_data, weather_data, sentiment_data)
+        X = aligned.select(FEATURE_COLUMNS[feature] for feature in self.features)
+        for i, feature in enumerate(self.features):
+            if feature in FEATURE_DEFAULTS:
+                X[np.isnan(X[:, i]), i] = FEATURE_DEFAULTS[feature]
+        y = np.full(len(aligned), np.nan, dtype=np.float32)
+        y[:-1] = aligned.select(['Close'])[1:, 0]
+
+        rows = ~np.isnan(X).any(axis=1)
+        X = pd.DataFrame(X[rows], index=aligned.index[rows], columns=self.features)
+        y = pd.Series(y[rows], index=aligned.index[rows], name='target_price')
+        return X, y
+
+    def prepare_features(self, stock_data, weather_data, sentiment_data) -> Tuple[pd.DataFrame, pd.Series]:
+        """Training rows: days with complete features and a known next close"""
+        X, y = self.build_features(stock_data, weather_data, sentiment_data)
+        known = y.notna().to_numpy()
+        return X[known], y[known]
         
     def train_model(self, X, y):
-        """Train the random forest model"""
-        self.rf_model.fit(X, y)
+        """Fit the scaler and the random forest"""
+        X_scaled = self.scaler.fit_transform(X)
+        self.rf_model.fit(X_scaled, y)
+        self.metadata = {
+            'features': self.features,
+            'training_fingerprint': training_fingerprint(X, y),
+            'training_rows': int(len(X)),
+        }
         
     def predict(self, X):
         """Make predictions"""
+        if isinstance(X, pd.DataFrame) and list(X.columns) != self.features:
+            raise ValueError(f"Expected features {self.features}, got {list(X.columns)}")
         X_scaled = self.scaler.transform(X)
         return self.rf_model.predict(X_scaled)
 
-# Deep Learning Model
-class LSTMPredictor(nn.Module):
-    def __init__(self, input_dim, hidden_dim, num_layers):
-        super(LSTMPredictor, self).__init__()
-        self.hidden_dim = hidden_dim
-        self.num_layers = num_layers
-        
-        self.lstm = nn.LSTM(input_dim, hidden_dim, num_layers, batch_first=True)
-        self.fc = nn.Linear(hidden_dim, 1)
-        
-    def forward(self, x):
-        lstm_out, _ = self.lstm(x)
-        predictions = self.fc(lstm_out[:, -1, :])
-        return predictions
\ No newline at end of file
+    def save(self, store: Optional[ModelStore] = None, name: str = PREDICTOR_MODEL_NAME,
+             metadata: Optional[Dict] = None) -> str:
+        """Persist the fitted scaler and forest as a new version; returns the version"""
+        if not self.metadata:
+            raise ValueError("Predictor has not been trained")
+        store = store or get_model_store()
+        artifact = {'scaler': self.scaler, 'model': self.rf_model, 'features': self.features}
+        return store.save(name, artifact, {**self.metadata, **(metadata or {})})
+
+    @classmethod
+    def load(cls, store: Optional[ModelStore] = None, name: str = PREDICTOR_MODEL_NAME,
+             version: Optional[str] = None) -> "StockPricePredictor":
+        """Load a trained predictor from the store (latest version by default)"""
+        store = store or get_model_store()
+        version = version or store.latest(name)
+        artifact = store.load(name, version)
+        # Per-request batches are a few rows; a thread pool per predict call costs more than it saves
+        artifact['model'].n_jobs = 1
+        predictor = cls(artifact['model'], artifact['scaler'], artifact['features'])
+        predictor.metadata = store.metadata(name, version)
+        return predictor
+
+
+def __getattr__(name):
+    # LSTMPredictor subclasses torch.nn.Module, so it lives in lstm_pipeline
+    # and is only imported when asked for
+    if name == "LSTMPredictor":
+        from .lstm_pipeline import LSTMPredictor
+        return LSTMPredictor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
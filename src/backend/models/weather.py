@@ -2,74 +2,123 @@
 
 import pandas as pd
 import numpy as np
+import asyncio
 from typing import Dict, List, Optional
-import requests
 from datetime import datetime, timedelta
 import logging
-from requests.exceptions import RequestException
+import httpx
+
+from ..config import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_GEO_URL
+from ..services.geocoding import Geocoder, get_geocoder
+from ..services.http_client import AsyncHttpClient, get_http_client
+from ..services.telemetry import count, span
+from ..services.weather_store import WeatherHistoryStore
+from .weather_events import EventRule, ExtremeEventEngine, summarize_columns
+
+WEATHER_STATISTICS = {
+    "temperature": ["mean", "std", "min", "max"],
+    "humidity": ["mean", "std"],
+    "wind_speed": ["mean", "max"],
+}
 
 class WeatherAnalyzer:
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or "837e3aa3e9bd23e14852820651a8b516"  # Replace with your OpenWeatherMap API key
-        self.base_url = "http://api.openweathermap.org/data/2.5"
-        self.geo_url = "http://api.openweathermap.org/geo/1.0/direct"
+    def __init__(self, api_key: Optional[str] = None,
+                 store: Optional[WeatherHistoryStore] = None,
+                 http_client: Optional[AsyncHttpClient] = None,
+                 event_rules: Optional[List[EventRule]] = None,
+                 geocoder: Optional[Geocoder] = None):
+        self.api_key = api_key or OPENWEATHER_API_KEY
+        self.base_url = OPENWEATHER_BASE_URL
+        self.geo_url = OPENWEATHER_GEO_URL
+        self.store = store or WeatherHistoryStore()
+        self.http_client = http_client or get_http_client()
+        self.event_engine = ExtremeEventEngine(event_rules)
+        self.geocoder = geocoder or get_geocoder()
         
-    def get_location_coordinates(self, location: str) -> Dict[str, float]:
-        """Get latitude and longitude for a location."""
+    async def get_location_coordinates(self, location: str) -> Dict[str, float]:
+        """Get latitude and longitude for a location, from the geocoding cache when possible."""
         try:
-            params = {
-                "q": location,
-                "limit": 1,
-                "appid": self.api_key
-            }
-            response = requests.get(self.geo_url, params=params)
-            response.raise_for_status()
-            
-            location_data = response.json()
-            if not location_data:
-                raise ValueError(f"Location not found: {location}")
-                
-            return {
-                "lat": location_data[0]["lat"],
-                "lon": location_data[0]["lon"]
-            }
-        except RequestException as e:
+            return await self.geocoder.resolve(location)
+        except httpx.HTTPError as e:
             logging.error(f"Error fetching location coordinates: {str(e)}")
             raise
 
-    def fetch_historical_weather(self, location: str, start_date: datetime, 
+    async def resolve_locations(self, locations: List[str]) -> Dict[str, Dict[str, float]]:
+        """Coordinates for many locations at once; unknown locations map to None."""
+        results = await self.geocoder.resolve_many(locations, return_exceptions=True)
+        coords = {}
+        for location, result in results.items():
+            if isinstance(result, Exception):
+                logging.error(f"Error fetching location coordinates for {location}: {str(result)}")
+                result = None
+            coords[location] = result
+        return coords
+
+    async def fetch_historical_weather(self, location: str, start_date: datetime, 
                                end_date: datetime) -> pd.DataFrame:
         """
         Fetch historical weather data for a given location and date range.
+
+        Days already in the local store are served from disk; only the
+        missing days are requested from the API concurrently and merged back in.
         """
         try:
-            coords = self.get_location_coordinates(location)
-            weather_data = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                unix_timestamp = int(current_date.timestamp())
-                params = {
-                    "lat": coords["lat"],
-                    "lon": coords["lon"],
-                    "dt": unix_timestamp,
-                    "appid": self.api_key,
-                    "units": "metric"  # Use metric units
-                }
-
-                response = requests.get(f"{self.base_url}/onecall/timemachine", params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                daily_weather = self._process_daily_weather(data, current_date)
-                weather_data.append(daily_weather)
-                current_date += timedelta(days=1)
-
+            coords = await self.get_location_coordinates(location)
+            days = [
+                (start_date + timedelta(days=offset)).date()
+                for offset in range((end_date.date() - start_date.date()).days + 1)
+            ]
+            records = self.store.get_days(coords, days)
+
+            missing = [day for day in days if day not in records]
+            count("weather_days_total", len(records), source="store")
+            count("weather_days_total", len(missing), source="api")
+            with span("weather.api_days"):
+                fetched_days = await asyncio.gather(*[
+                    self._fetch_day(coords, datetime.combine(day, start_date.time(), start_date.tzinfo))
+                    for day in missing
+                ])
+            fetched = dict(zip(missing, fetched_days))
+
+            # Today's observation is still changing, so only persist past days
+            today = datetime.now(start_date.tzinfo).date()
+            self.store.put_days(coords, {day: rec for day, rec in fetched.items() if day < today})
+            records.update(fetched)
+
+            weather_data = [
+                {"date": pd.Timestamp(day), **records[day]} for day in days
+            ]
             return pd.DataFrame(weather_data)
         except Exception as e:
             logging.error(f"Error fetching historical weather data: {str(e)}")
             raise
 
+    async def fetch_weather_data(self, location: str, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Fetch daily weather for a range, defaulting to the last 30 days"""
+        end_date = end_date or datetime.now()
+        start_date = start_date or end_date - timedelta(days=30)
+        return await self.fetch_historical_weather(location, start_date, end_date)
+
+    async def _fetch_day(self, coords: Dict[str, float], current_date: datetime) -> Dict:
+        """Fetch and process a single day of historical weather"""
+        params = {
+            "lat": coords["lat"],
+            "lon": coords["lon"],
+            "dt": int(current_date.timestamp()),
+            "appid": self.api_key,
+            "units": "metric"  # Use metric units
+        }
+        data = await self.http_client.get_json(f"{self.base_url}/onecall/timemachine", params=params)
+
+        daily_weather = self._process_daily_weather(data, current_date)
+        daily_weather.pop("date")
+        return daily_weather
+
+    def cache_stats(self) -> Dict:
+        """Weather history store hit/miss counts"""
+        return self.store.stats()
+
     def _process_daily_weather(self, data: Dict, date: datetime) -> Dict:
         """Process raw weather data into structured format."""
         daily = data.get("current", {})
@@ -84,46 +133,25 @@ class WeatherAnalyzer:
             "weather_description": daily.get("weather", [{}])[0].get("description", None)
         }
 
-    def analyze_weather_patterns(self, weather_data: pd.DataFrame) -> Dict:
+    def analyze_weather_patterns(self, weather_data: pd.DataFrame, include_events: bool = True) -> Dict:
         """
         Analyze weather patterns and identify significant conditions.
+        Callers that want the events as a frame pass include_events=False
+        and use event_engine.detect directly.
         """
         analysis = {
-            "extreme_events": self._detect_extreme_events(weather_data),
             "patterns": self._identify_weather_patterns(weather_data),
             "statistics": self._calculate_weather_statistics(weather_data)
         }
+        if include_events:
+            analysis = {"extreme_events": self._detect_extreme_events(weather_data), **analysis}
         return analysis
 
     def _detect_extreme_events(self, data: pd.DataFrame) -> List[Dict]:
         """
-        Detect extreme weather events based on thresholds.
+        Detect extreme weather events with the configured rules.
         """
-        extreme_events = []
-        
-        # Temperature extremes
-        temp_threshold = 35  # Celsius
-        extreme_temp = data[data["temperature"] > temp_threshold]
-        for _, row in extreme_temp.iterrows():
-            extreme_events.append({
-                "date": row["date"],
-                "type": "extreme_temperature",
-                "value": row["temperature"],
-                "threshold": temp_threshold
-            })
-
-        # Wind extremes
-        wind_threshold = 20  # m/s
-        extreme_wind = data[data["wind_speed"] > wind_threshold]
-        for _, row in extreme_wind.iterrows():
-            extreme_events.append({
-                "date": row["date"],
-                "type": "extreme_wind",
-                "value": row["wind_speed"],
-                "threshold": wind_threshold
-            })
-
-        return extreme_events
+        return self.event_engine.detect_records(data)
 
     def _identify_weather_patterns(self, data: pd.DataFrame) -> Dict:
         """
@@ -138,24 +166,9 @@ class WeatherAnalyzer:
 
     def _calculate_weather_statistics(self, data: pd.DataFrame) -> Dict:
         """
-        Calculate basic weather statistics.
+        Calculate basic weather statistics in a single aggregation.
         """
-        return {
-            "temperature": {
-                "mean": data["temperature"].mean(),
-                "std": data["temperature"].std(),
-                "min": data["temperature"].min(),
-                "max": data["temperature"].max()
-            },
-            "humidity": {
-                "mean": data["humidity"].mean(),
-                "std": data["humidity"].std()
-            },
-            "wind_speed": {
-                "mean": data["wind_speed"].mean(),
-                "max": data["wind_speed"].max()
-            }
-        }
+        return summarize_columns(data, WEATHER_STATISTICS, group_column="location")
 
     def _calculate_trend(self, series: pd.Series) -> str:
         """
@@ -172,12 +185,12 @@ class WeatherAnalyzer:
         else:
             return "stable"
 
-    def get_weather_alerts(self, location: str) -> List[Dict]:
+    async def get_weather_alerts(self, location: str) -> List[Dict]:
         """
         Get current weather alerts for a location.
         """
         try:
-            coords = self.get_location_coordinates(location)
+            coords = await self.get_location_coordinates(location)
             params = {
                 "lat": coords["lat"],
                 "lon": coords["lon"],
@@ -185,10 +198,7 @@ class WeatherAnalyzer:
                 "exclude": "current,minutely,hourly,daily"
             }
             
-            response = requests.get(f"{self.base_url}/onecall", params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self.http_client.get_json(f"{self.base_url}/onecall", params=params)
             alerts = data.get("alerts", [])
             
             return [{
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+
+class EventRule:
+    """
+    A weather event definition evaluated by ExtremeEventEngine.
+
+    kind="threshold"  value above/below threshold
+    kind="zscore"     |z| of value against the trailing `window` rows exceeds threshold
+    kind="run"        at least `min_length` consecutive rows above/below threshold
+                      (e.g. a heatwave on daily data), reported once per run
+    """
+
+    KINDS = ("threshold", "zscore", "run")
+
+    def __init__(self, name: str, column: str, kind: str, threshold: float,
+                 direction: str = "above", window: int = 30, min_length: int = 3):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown rule kind: {kind}")
+        if direction not in ("above", "below"):
+            raise ValueError(f"Unknown rule direction: {direction}")
+        self.name = name
+        self.column = column
+        self.kind = kind
+        self.threshold = threshold
+        self.direction = direction
+        self.window = window
+        self.min_length = min_length
+
+    def __repr__(self):
+        return f"EventRule({self.name!r}, {self.column!r}, {self.kind!r}, {self.threshold})"
+
+
+DEFAULT_EVENT_RULES = [
+    EventRule("extreme_temperature", "temperature", "threshold", 35),  # Celsius
+    EventRule("extreme_wind", "wind_speed", "threshold", 20),  # m/s
+]
+
+
+class ExtremeEventEngine:
+    """
+    Evaluates a set of EventRules over a (optionally multi-location) weather
+    frame with NumPy array operations only.
+
+    The frame is sorted once by (group, time); every rule then works on the
+    same column arrays and group boundaries, so cost is linear in rows with
+    no Python-level row loops.
+    """
+
+    def __init__(self, rules: Optional[List[EventRule]] = None,
+                 time_column: str = "date", group_column: Optional[str] = "location"):
+        self.rules = list(rules) if rules is not None else list(DEFAULT_EVENT_RULES)
+        self.time_column = time_column
+        self.group_column = group_column
+
+    def detect(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return one row per detected event, ordered by rule then group and time"""
+        columns = ["date", "type", "value", "threshold"]
+        grouped = self.group_column is not None and self.group_column in data.columns
+        if grouped:
+            columns.insert(0, self.group_column)
+        if data.empty:
+            return pd.DataFrame(columns=columns)
+
+        sort_keys = [self.group_column, self.time_column] if grouped else [self.time_column]
+        frame = data.sort_values(sort_keys, kind="stable")
+        n = len(frame)
+        times = frame[self.time_column].to_numpy()
+
+        # Start row of each row's group, used to keep windows and runs inside a location
+        if grouped:
+            codes = pd.factorize(frame[self.group_column])[0]
+            new_group = np.r_[True, codes[1:] != codes[:-1]]
+            groups = frame[self.group_column].to_numpy()
+        else:
+            new_group = np.zeros(n, dtype=bool)
+            new_group[0] = True
+            groups = None
+        group_start = np.maximum.accumulate(np.where(new_group, np.arange(n), 0))
+
+        events = []
+        for rule in self.rules:
+            if rule.column not in frame.columns:
+                continue
+            values = frame[rule.column].to_numpy(dtype=float)
+            if rule.kind == "threshold":
+                idx = np.flatnonzero(self._exceeds(values, rule))
+                found = {"date": times[idx], "value": values[idx]}
+            elif rule.kind == "zscore":
+                z = self._trailing_zscore(values, group_start, rule.window)
+                idx = np.flatnonzero(np.abs(z) > rule.threshold)
+                found = {"date": times[idx], "value": values[idx], "zscore": z[idx]}
+            else:
+                idx, found = self._runs(values, times, new_group, rule)
+
+            found["type"] = rule.name
+            found["threshold"] = rule.threshold
+            if grouped:
+                found[self.group_column] = groups[idx]
+            events.append(pd.DataFrame(found, index=pd.RangeIndex(len(idx))))
+
+        if not events:
+            return pd.DataFrame(columns=columns)
+        result = pd.concat(events, ignore_index=True)
+        extra = [column for column in result.columns if column not in columns]
+        return result[columns + extra]
+
+    def detect_records(self, data: pd.DataFrame) -> List[Dict]:
+        """Detected events as a list of dicts, dropping fields a rule does not produce"""
+        events = self.detect(data)
+        return [
+            {key: value for key, value in record.items() if not _is_missing(value)}
+            for record in events.to_dict("records")
+        ]
+
+    @staticmethod
+    def _exceeds(values: np.ndarray, rule: EventRule) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            if rule.direction == "above":
+                return values > rule.threshold
+            return values < rule.threshold
+
+    @staticmethod
+    def _trailing_zscore(values: np.ndarray, group_start: np.ndarray, window: int) -> np.ndarray:
+        """z-score of each value against the previous `window` rows of its group"""
+        n = len(values)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        csum = np.r_[0.0, np.cumsum(filled)]
+        csq = np.r_[0.0, np.cumsum(filled * filled)]
+        ccount = np.r_[0, np.cumsum(valid)]
+
+        hi = np.arange(n)  # exclusive end: window covers rows [lo, i)
+        lo = np.maximum(hi - window, group_start)
+        count = ccount[hi] - ccount[lo]
+        total = csum[hi] - csum[lo]
+        total_sq = csq[hi] - csq[lo]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            var = (total_sq - count * mean * mean) / (count - 1)
+            z = (values - mean) / np.sqrt(var)
+        z[(count < window) | ~np.isfinite(z)] = np.nan
+        return z
+
+    def _runs(self, values: np.ndarray, times: np.ndarray, new_group: np.ndarray, rule: EventRule):
+        """Consecutive in-group rows meeting the rule, at least min_length long"""
+        hit = self._exceeds(values, rule)
+        starts_mask = hit & (new_group | ~np.r_[False, hit[:-1]])
+        ends_mask = hit & np.r_[new_group[1:] | ~hit[1:], True]
+        starts = np.flatnonzero(starts_mask)
+        ends = np.flatnonzero(ends_mask)
+        lengths = ends - starts + 1
+        keep = lengths >= rule.min_length
+        starts, ends, lengths = starts[keep], ends[keep], lengths[keep]
+
+        # Peak value within each run; rows outside kept runs are masked out so
+        # reduceat segments (start to next start) only see their own run
+        if len(starts):
+            marks = np.zeros(len(values) + 1, dtype=int)
+            np.add.at(marks, starts, 1)
+            np.add.at(marks, ends + 1, -1)
+            in_run = np.cumsum(marks[:-1]) > 0
+            signed = values if rule.direction == "above" else -values
+            peaks = np.maximum.reduceat(np.where(in_run, signed, -np.inf), starts)
+            if rule.direction == "below":
+                peaks = -peaks
+        else:
+            peaks = np.array([], dtype=float)
+        return starts, {
+            "date": times[starts],
+            "value": peaks,
+            "end_date": times[ends],
+            "duration": lengths,
+        }
+
+
+def _is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def summarize_columns(data: pd.DataFrame, spec: Dict[str, List[str]],
+                      group_column: Optional[str] = None) -> Dict:
+    """
+    Compute several statistics for several columns in one aggregation.
+
+    spec maps column -> list of statistic names understood by DataFrame.agg.
+    Columns missing from the frame are skipped. With group_column, the same
+    single aggregation runs per group and results are keyed by group.
+    """
+    present = {column: stats for column, stats in spec.items() if column in data.columns}
+    if not present:
+        return {}
+    if group_column is not None and group_column in data.columns:
+        aggregated = data.groupby(group_column).agg(present)
+        return {
+            group: {
+                column: {stat: _to_float(row[(column, stat)]) for stat in stats}
+                for column, stats in present.items()
+            }
+            for group, row in aggregated.iterrows()
+        }
+    aggregated = data.agg(present)
+    return {
+        column: {stat: _to_float(aggregated.at[stat, column]) for stat in stats}
+        for column, stats in present.items()
+    }
+
+
+def _to_float(value):
+    return None if pd.isna(value) else float(value)
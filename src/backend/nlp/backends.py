@@ -0,0 +1,148 @@
+import importlib.util
+import os
+import re
+from typing import Dict, List
+
+import numpy as np
+
+from ..config import CACHE_DIR
+
+# torch and transformers are imported inside the functions that need them, so
+# importing the API does not pay for them before a model is actually loaded
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+class TorchRunner:
+    """Runs a transformers sequence classifier (fp32 or dynamically quantized)"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def logits(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            inputs = {name: torch.from_numpy(values) for name, values in batch.items()}
+            return self.model(**inputs).logits.float().numpy()
+
+
+class OnnxRunner:
+    """Runs an exported classifier with ONNX Runtime on CPU"""
+
+    def __init__(self, path: str):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def logits(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        # The exported graph may require segment ids the padded batch does not carry
+        inputs = {
+            name: batch[name] if name in batch else np.zeros_like(batch["input_ids"])
+            for name in self.input_names
+        }
+        return self.session.run(None, inputs)[0]
+
+
+def _onnx_path(model_name: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name.strip("/"))
+    return os.path.join(CACHE_DIR, "onnx", slug, "model.onnx")
+
+
+def export_onnx(model, tokenizer, path: str):
+    """Export a sequence classifier to ONNX with dynamic batch and sequence axes"""
+    import torch
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sample = dict(tokenizer(["sample text", "a longer sample text"], padding=True, return_tensors="pt"))
+    batch, seq = torch.export.Dim("batch"), torch.export.Dim("seq")
+    program = torch.onnx.export(
+        model,
+        (),
+        kwargs=sample,
+        input_names=list(sample),
+        output_names=["logits"],
+        dynamic_shapes={name: {0: batch, 1: seq} for name in sample},
+        dynamo=True,
+    )
+    program.save(path)
+
+
+def _require_packages(backend: str, *names: str):
+    """Fail before any model is loaded if a backend's packages are not installed"""
+    missing = [name for name in names if importlib.util.find_spec(name) is None]
+    if missing:
+        raise ImportError(
+            f"The {backend} sentiment backend needs {', '.join(missing)}; "
+            f"install with: pip install {' '.join(missing)}"
+        )
+
+
+def load_sequence_classifier(model_name: str, backend: str = "torch") -> Dict:
+    """
+    Load tokenizer and an inference runner for the requested backend.
+
+    torch       fp32 transformers model
+    torch-int8  Linear layers dynamically quantized to int8
+    onnx        exported once to the cache dir, run with ONNX Runtime
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend: {backend} (expected one of {BACKENDS})")
+    if backend == "onnx":
+        # onnxscript is only needed for the one-off export
+        exported = os.path.exists(_onnx_path(model_name))
+        _require_packages(backend, "onnxruntime", *(() if exported else ("onnxscript",)))
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    id2label = model.config.id2label
+
+    if backend == "torch":
+        runner = TorchRunner(model)
+    elif backend == "torch-int8":
+        runner = TorchRunner(
+            torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        )
+    else:
+        path = _onnx_path(model_name)
+        if not os.path.exists(path):
+            export_onnx(model, tokenizer, path)
+        runner = OnnxRunner(path)
+        del model
+
+    return {"tokenizer": tokenizer, "runner": runner, "id2label": id2label}
+
+
+def validate_backend(model_name: str, backend: str, texts: List[str],
+                     tolerance: float = 0.02) -> Dict:
+    """
+    Compare a backend's labels and scores against the fp32 torch baseline.
+
+    Passes when the fraction of disagreeing labels is within tolerance.
+    """
+    from .sentiment import NLPAnalyzer
+    from .sentiment_cache import SentimentCache
+
+    baseline = NLPAnalyzer(model_name, backend="torch", cache=SentimentCache(max_entries=0))
+    candidate = NLPAnalyzer(model_name, backend=backend, cache=SentimentCache(max_entries=0))
+    expected = baseline.analyze_texts(texts)
+    actual = candidate.analyze_texts(texts)
+
+    disagreements = sum(a["sentiment"] != e["sentiment"] for a, e in zip(actual, expected))
+    score_diffs = [abs(a["score"] - e["score"]) for a, e in zip(actual, expected)]
+    mismatch_rate = disagreements / len(texts) if texts else 0.0
+    return {
+        "backend": backend,
+        "texts": len(texts),
+        "label_agreement": 1 - mismatch_rate,
+        "max_score_diff": max(score_diffs, default=0.0),
+        "mean_score_diff": float(np.mean(score_diffs)) if score_diffs else 0.0,
+        "tolerance": tolerance,
+        "passed": mismatch_rate <= tolerance,
+    }
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import SENTIMENT_MICROBATCH_SIZE, SENTIMENT_MICROBATCH_WAIT_MS
+from .sentiment import NLPAnalyzer
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching in front of NLPAnalyzer for single-text requests.
+
+    Concurrent callers of analyze() are queued; a collector task on the
+    event loop closes a batch once it holds max_batch_size texts or the
+    oldest text has waited max_wait_ms, and runs it as one analyze_texts
+    call on a dedicated inference thread. While a batch runs, new texts
+    keep queueing, so batches grow with load and the loop never blocks on
+    a forward pass.
+    """
+
+    def __init__(self, analyzer: NLPAnalyzer, max_batch_size: int = SENTIMENT_MICROBATCH_SIZE,
+                 max_wait_ms: float = SENTIMENT_MICROBATCH_WAIT_MS, history: int = 4096):
+        self.analyzer = analyzer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = Counter()
+        self.latencies = deque(maxlen=history)
+        self.inference_times = deque(maxlen=history)
+        self._pending = deque()
+        self._current: List = []
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment-inference")
+
+    def start(self):
+        """Start the collector on the running loop (done automatically by analyze)"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def analyze(self, text: str) -> Dict:
+        """Sentiment for one text, scored together with whatever else is queued"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future, time.perf_counter()))
+        self.requests += 1
+        self._ready.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    def _take_batch(self) -> List:
+        batch = []
+        while self._pending and len(batch) < self.max_batch_size:
+            item = self._pending.popleft()
+            if not item[1].done():  # the caller gave up while queued
+                batch.append(item)
+        if not self._pending:
+            self._ready.clear()
+        if len(self._pending) < self.max_batch_size:
+            self._full.clear()
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            if self.max_wait and len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._take_batch()
+            if batch:
+                await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List):
+        texts = [text for text, _, _ in batch]
+        self._current = batch
+        started = time.perf_counter()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.analyzer.analyze_texts, texts
+            )
+        except asyncio.CancelledError:
+            self._fail(batch, "Sentiment batcher closed")
+            raise
+        except Exception as e:
+            self.errors += 1
+            self._fail(batch, f"Error in sentiment analysis: {str(e)}")
+            return
+        finally:
+            self._current = []
+
+        finished = time.perf_counter()
+        self.batches += 1
+        self.batch_sizes[len(batch)] += 1
+        self.inference_times.append(finished - started)
+        for (_, future, submitted), result in zip(batch, results):
+            self.latencies.append(finished - submitted)
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(items, message: str):
+        for _, future, _ in items:
+            if not future.done():
+                future.set_exception(Exception(message))
+
+    @staticmethod
+    def _percentiles_ms(samples) -> Dict:
+        if not samples:
+            return {"p50": None, "p99": None}
+        p50, p99 = np.percentile(np.fromiter(samples, dtype=float), [50, 99]) * 1000
+        return {"p50": round(float(p50), 3), "p99": round(float(p99), 3)}
+
+    def stats(self) -> Dict:
+        """Queue depth, batch-size histogram and request/inference latency percentiles"""
+        completed = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": len(self._pending),
+            "in_flight": len(self._current),
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": round(completed / self.batches, 3) if self.batches else None,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "latency_ms": self._percentiles_ms(self.latencies),
+            "inference_ms": self._percentiles_ms(self.inference_times),
+        }
+
+    async def close(self):
+        """Stop the collector and fail anything still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._fail(self._pending, "Sentiment batcher closed")
+        self._pending.clear()
+        self._ready.clear()
+        self._full.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,126 @@
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from ..config import MODEL_IDLE_SECONDS, MODEL_MIN_AVAILABLE_MB
+
+
+def available_memory_mb() -> Optional[float]:
+    """Available system memory in MB, or None if it cannot be determined"""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models.
+
+    Each model is loaded lazily on first use, exactly once, and shared by
+    every caller. Models can be released explicitly, after an idle period,
+    or when available memory drops below a threshold; the next get()
+    reloads them.
+    """
+
+    def __init__(self):
+        self._models: Dict[Hashable, Any] = {}
+        self._last_used: Dict[Hashable, float] = {}
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the model for key, loading it with loader() if needed"""
+        with self._lock:
+            if key in self._models:
+                self._last_used[key] = time.monotonic()
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Per-key lock so concurrent first callers share one load
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._last_used[key] = time.monotonic()
+                    return self._models[key]
+            logging.info(f"Loading model {key}")
+            start = time.perf_counter()
+            model = loader()
+            logging.info(f"Loaded model {key} in {time.perf_counter() - start:.2f}s")
+            with self._lock:
+                self._models[key] = model
+                self._last_used[key] = time.monotonic()
+            return model
+
+    def is_loaded(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def loaded(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._models)
+
+    def release(self, key: Hashable) -> bool:
+        """Drop the registry's reference to a model"""
+        with self._lock:
+            released = self._models.pop(key, None) is not None
+            self._last_used.pop(key, None)
+        if released:
+            gc.collect()
+            logging.info(f"Released model {key}")
+        return released
+
+    def release_idle(self, max_idle_seconds: float) -> List[Hashable]:
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, used in self._last_used.items() if now - used > max_idle_seconds]
+        return [key for key in idle if self.release(key)]
+
+    def release_under_memory_pressure(self, min_available_mb: float) -> List[Hashable]:
+        """Release least recently used models until available memory is above the threshold"""
+        released = []
+        while True:
+            available = available_memory_mb()
+            if available is None or available >= min_available_mb:
+                break
+            with self._lock:
+                if not self._last_used:
+                    break
+                key = min(self._last_used, key=self._last_used.get)
+            logging.warning(f"Available memory {available:.0f}MB below {min_available_mb}MB")
+            if self.release(key):
+                released.append(key)
+        return released
+
+    async def monitor(self, interval: float = 30.0,
+                      min_available_mb: float = MODEL_MIN_AVAILABLE_MB,
+                      max_idle_seconds: float = MODEL_IDLE_SECONDS):
+        """Periodically release idle models and models under memory pressure"""
+        while True:
+            await asyncio.sleep(interval)
+            if max_idle_seconds > 0:
+                self.release_idle(max_idle_seconds)
+            if min_available_mb > 0:
+                self.release_under_memory_pressure(min_available_mb)
+
+
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
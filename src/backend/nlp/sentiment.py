@@ -1,33 +1,122 @@
-from transformers import pipeline
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from ..config import SENTIMENT_BACKEND, SENTIMENT_BATCH_SIZE, SENTIMENT_MAX_LENGTH, SENTIMENT_MODEL
+from ..services.telemetry import count, span
+from .backends import load_sequence_classifier
+from .model_registry import ModelRegistry, get_model_registry
+from .sentiment_cache import SentimentCache, cache_key, get_sentiment_cache
 
 class NLPAnalyzer:
-    def __init__(self):
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="ProsusAI/finbert"
+    def __init__(self, model_name: str = SENTIMENT_MODEL,
+                 batch_size: int = SENTIMENT_BATCH_SIZE,
+                 max_length: int = SENTIMENT_MAX_LENGTH,
+                 cache: Optional[SentimentCache] = None,
+                 registry: Optional[ModelRegistry] = None,
+                 backend: str = SENTIMENT_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+        # Backends can disagree slightly, so cached results are per backend
+        self.model_id = f"{model_name}@{backend}"
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache = cache if cache is not None else get_sentiment_cache()
+        # The model itself lives in the shared registry and is loaded on first use
+        self.registry = registry or get_model_registry()
+
+    def _components(self) -> Dict:
+        return self.registry.get(
+            (self.model_name, self.backend),
+            lambda: load_sequence_classifier(self.model_name, self.backend)
         )
-        
+
+    def warm_up(self):
+        """Load the model now instead of on the first request"""
+        self._components()
+
     def analyze_text(self, text: str) -> Dict:
         """Analyze sentiment of financial text"""
         try:
-            result = self.sentiment_analyzer(text)[0]
-            return {
-                'sentiment': result['label'],
-                'score': result['score'],
-                'text': text
-            }
+            return self.analyze_texts([text])[0]
         except Exception as e:
             raise Exception(f"Error in sentiment analysis: {str(e)}")
-    
+
     def analyze_news_batch(self, news_items: List[str]) -> List[Dict]:
         """Analyze sentiment for a batch of news items"""
         try:
-            results = []
-            for item in news_items:
-                sentiment = self.analyze_text(item)
-                results.append(sentiment)
-            return results
+            return self.analyze_texts(news_items)
         except Exception as e:
-            raise Exception(f"Error in batch sentiment analysis: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error in batch sentiment analysis: {str(e)}")
+
+    def analyze_texts(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Sentiment for many texts, served from the cache where possible.
+
+        Only texts with no cached result (deduplicated) go through inference.
+        """
+        if not texts:
+            return []
+        keys = [cache_key(text, self.model_id) for text in texts]
+        cached = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+        count("sentiment_texts_total", len(texts) - len(pending), result="cached")
+        count("sentiment_texts_total", len(pending), result="inferred")
+        if pending:
+            with span("model.sentiment", backend=self.backend):
+                inferred = self._infer(list(pending.values()), batch_size)
+            fresh = {
+                key: {'sentiment': result['sentiment'], 'score': result['score']}
+                for key, result in zip(pending, inferred)
+            }
+            self.cache.put_many(fresh)
+            cached.update(fresh)
+
+        return [{**cached[key], 'text': text} for key, text in zip(keys, texts)]
+
+    def cache_stats(self) -> Dict:
+        """Sentiment cache hit ratio and eviction counts"""
+        return self.cache.stats()
+
+    def _infer(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Batched sentiment inference.
+
+        Texts are tokenized once, sorted by token length and split into
+        batches so each batch is only padded to its own longest text.
+        Results are returned in input order.
+        """
+        if not texts:
+            return []
+        batch_size = batch_size or self.batch_size
+        components = self._components()
+        tokenizer, runner = components['tokenizer'], components['runner']
+        id2label = components['id2label']
+
+        encodings = tokenizer(
+            list(texts), truncation=True, max_length=self.max_length
+        )["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+
+        results: List[Optional[Dict]] = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {"input_ids": [encodings[i] for i in indices]},
+                padding=True,
+                return_tensors="np",
+            )
+            logits = runner.logits({name: values.astype(np.int64) for name, values in batch.items()})
+            exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            probs = exp / exp.sum(axis=-1, keepdims=True)
+            for i, label, score in zip(indices, probs.argmax(axis=-1), probs.max(axis=-1)):
+                results[i] = {
+                    'sentiment': id2label[int(label)],
+                    'score': float(score),
+                    'text': texts[i]
+                }
+        return results
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from ..config import SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_SIZE
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivial variants share a key"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(text: str, model_id: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-tier sentiment result cache keyed by normalized-text hash and model id.
+
+    The in-memory tier is a bounded LRU; the optional persistent tier is a
+    SQLite file that survives restarts and refills the LRU on lookup.
+    """
+
+    def __init__(self, max_entries: int = SENTIMENT_CACHE_SIZE, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = None
+        if path:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _remember(self, key: str, result: Dict):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Look up keys in memory, then on disk; return the ones found"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if self._conn is not None:
+                # Chunk to stay under SQLite's bound-parameter limit
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows = self._conn.execute(
+                        f"SELECT key, result FROM sentiment_cache WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, result in rows:
+                        found[key] = json.loads(result)
+                        self._remember(key, found[key])
+                    self.disk_hits += len(rows)
+
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, results: Dict[str, Dict]):
+        if not results:
+            return
+        with self._lock:
+            for key, result in results.items():
+                self._remember(key, result)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?)",
+                    [(key, json.dumps(result)) for key, result in results.items()],
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment_cache")
+                self._conn.commit()
+
+
+_sentiment_cache: Optional[SentimentCache] = None
+
+
+def get_sentiment_cache() -> SentimentCache:
+    """Return the process-wide sentiment cache shared by all analyzers"""
+    global _sentiment_cache
+    if _sentiment_cache is None:
+        _sentiment_cache = SentimentCache(path=SENTIMENT_CACHE_PATH or None)
+    return _sentiment_cache
@@ -0,0 +1,207 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..config import EXCHANGE_TIMEZONE, MARKET_CLOSE
+
+# How hourly/intraday weather readings collapse to one value per day (default: mean)
+WEATHER_AGGREGATIONS = {
+    "precipitation": "sum",
+    "rain": "sum",
+    "snow": "sum",
+    "wind_speed": "max",
+}
+
+# Signed sentiment: the label sets the sign, the model's confidence the magnitude
+SENTIMENT_SIGNS = {"positive": 1.0, "negative": -1.0, "neutral": 0.0}
+
+STOCK_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def to_exchange_time(values, timezone: str = EXCHANGE_TIMEZONE) -> pd.DatetimeIndex:
+    """
+    Parse timestamps to naive wall-clock time in the exchange timezone.
+
+    Timezone-aware input (e.g. NewsAPI's "2024-01-02T21:15:00Z") is converted;
+    naive input is taken to be exchange-local already.
+    """
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(values))
+    except (TypeError, ValueError):
+        # Mixed formats or mixed naive/aware strings: parse each one, reading them as UTC
+        index = pd.DatetimeIndex(pd.to_datetime(values, format="mixed", utc=True))
+    if index.tz is not None:
+        index = index.tz_convert(timezone).tz_localize(None)
+    return index
+
+
+def session_days(values, calendar: Optional[pd.DatetimeIndex] = None,
+                 timezone: str = EXCHANGE_TIMEZONE, market_close: str = MARKET_CLOSE) -> pd.DatetimeIndex:
+    """
+    Trading session each timestamp belongs to.
+
+    Anything at or after the close counts for the next session, as does
+    anything on a day the market is shut. With a calendar (e.g. the stock's
+    own dates) days roll forward to the next date in it, and timestamps past
+    its end map to NaT; without one they roll to the next weekday.
+    """
+    local = to_exchange_time(values, timezone)
+    days = local.normalize()
+    after_close = np.asarray(local - days >= pd.Timedelta(market_close + ":00"))
+    days = days + pd.to_timedelta(after_close.astype(np.int64), unit="D")
+    if calendar is None:
+        rolled = np.busday_offset(days.values.astype("datetime64[D]"), 0, roll="forward")
+        return pd.DatetimeIndex(rolled.astype("datetime64[ns]"))
+    positions = calendar.searchsorted(days)
+    inside = positions < len(calendar)
+    sessions = np.full(len(days), np.datetime64("NaT"), dtype="datetime64[ns]")
+    sessions[inside] = calendar.values[positions[inside]].astype("datetime64[ns]")
+    return pd.DatetimeIndex(sessions)
+
+
+def _times(frame: pd.DataFrame, column: Optional[str] = None):
+    """The frame's timestamp column, or its index when there is none"""
+    for name in ([column] if column else ["date", "Date", "publishedAt", "timestamp"]):
+        if name in frame.columns:
+            return frame[name]
+    return frame.index
+
+
+def daily_stock(stock_data: pd.DataFrame, timezone: str = EXCHANGE_TIMEZONE) -> pd.DataFrame:
+    """OHLCV plus the daily close-to-close return, one row per trading day"""
+    if stock_data is None or len(stock_data) == 0:
+        return pd.DataFrame(columns=STOCK_COLUMNS + ["return"], dtype=np.float64)
+    days = to_exchange_time(_times(stock_data), timezone).normalize()
+    columns = [column for column in STOCK_COLUMNS if column in stock_data.columns]
+    daily = pd.DataFrame(stock_data[columns].to_numpy(dtype=np.float64), index=days, columns=columns)
+    daily = daily[~daily.index.duplicated(keep="last")].sort_index()
+    if "Close" in daily.columns:
+        daily["return"] = daily["Close"].pct_change(fill_method=None)
+    return daily
+
+
+def daily_weather(weather_data: pd.DataFrame, timezone: str = EXCHANGE_TIMEZONE,
+                  aggregations: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Numeric weather columns reduced to one row per calendar day in the
+    exchange timezone; several readings a day (hourly data, several
+    locations) are combined per WEATHER_AGGREGATIONS.
+    """
+    if weather_data is None or len(weather_data) == 0:
+        return pd.DataFrame(dtype=np.float64)
+    days = to_exchange_time(_times(weather_data), timezone).normalize()
+    numeric = weather_data.select_dtypes(include="number")
+    aggregations = {**WEATHER_AGGREGATIONS, **(aggregations or {})}
+    spec = {column: aggregations.get(column, "mean") for column in numeric.columns}
+    daily = numeric.astype(np.float64).groupby(days).agg(spec)
+    daily.index = pd.DatetimeIndex(daily.index)
+    return daily
+
+
+def daily_sentiment(sentiment_data: Union[pd.DataFrame, List[Dict], None],
+                    calendar: Optional[pd.DatetimeIndex] = None,
+                    timezone: str = EXCHANGE_TIMEZONE, market_close: str = MARKET_CLOSE) -> pd.DataFrame:
+    """
+    Per-article sentiment (SentimentAnalyzer.analyze_news records or a frame
+    with a sentiment_score column) averaged per trading session, with the
+    number of articles behind each value.
+    """
+    frame = sentiment_data if isinstance(sentiment_data, pd.DataFrame) else pd.DataFrame(sentiment_data or [])
+    if len(frame) == 0:
+        return pd.DataFrame(columns=["sentiment_score", "news_count"], dtype=np.float64)
+    if "sentiment_score" in frame.columns:
+        scores = frame["sentiment_score"].to_numpy(dtype=np.float64)
+    else:
+        signs = frame["sentiment"].str.lower().map(SENTIMENT_SIGNS).to_numpy(dtype=np.float64)
+        scores = signs * frame["score"].to_numpy(dtype=np.float64)
+    sessions = session_days(_times(frame), calendar, timezone, market_close)
+    daily = pd.DataFrame({"sentiment_score": scores, "news_count": 1.0}, index=sessions)
+    daily = daily[daily.index.notna()].groupby(level=0).agg({"sentiment_score": "mean", "news_count": "sum"})
+    daily.index = pd.DatetimeIndex(daily.index)
+    return daily
+
+
+class AlignedFeatures:
+    """
+    A float32 (day x feature) matrix on one trading-day index.
+
+    Built once per request by align_sources; analyzers read columns as
+    array views instead of merging frames. The index can be passed back to
+    align_sources to put other series (e.g. more tickers) on the same days.
+    """
+
+    def __init__(self, index: pd.DatetimeIndex, columns: List[str], values: np.ndarray):
+        self.index = index
+        self.columns = list(columns)
+        self.values = values
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._positions
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.values[:, self._positions[column]]
+
+    def select(self, columns: Iterable[str]) -> np.ndarray:
+        """Matrix of the given columns; ones that are absent come back as NaN"""
+        columns = list(columns)
+        out = np.full((len(self.index), len(columns)), np.nan, dtype=self.values.dtype)
+        for i, column in enumerate(columns):
+            if column in self._positions:
+                out[:, i] = self.values[:, self._positions[column]]
+        return out
+
+    def complete_rows(self, columns: Iterable[str]) -> np.ndarray:
+        """Boolean mask of days on which every given column has a value"""
+        return ~np.isnan(self.select(columns)).any(axis=1)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame(self.select(columns), index=self.index, columns=columns)
+
+
+def align_sources(stock_data: Optional[pd.DataFrame] = None,
+                  weather_data: Optional[pd.DataFrame] = None,
+                  sentiment_data: Union[pd.DataFrame, List[Dict], None] = None,
+                  index: Optional[pd.DatetimeIndex] = None,
+                  timezone: str = EXCHANGE_TIMEZONE,
+                  market_close: str = MARKET_CLOSE) -> AlignedFeatures:
+    """
+    Put stock, weather and sentiment series on one trading-day index.
+
+    The index is the one given, else the stock's trading days, else every
+    weekday the other sources cover. Each source is reduced to daily values
+    and written into a preallocated float32 matrix by integer position, so
+    there is no merge and no object-dtype intermediate. Days a source does
+    not cover are NaN, except news_count which is 0.
+    """
+    stock = daily_stock(stock_data, timezone)
+    weather = daily_weather(weather_data, timezone)
+    if index is None:
+        if len(stock):
+            index = stock.index
+        else:
+            sentiment = daily_sentiment(sentiment_data, None, timezone, market_close)
+            days = weather.index[weather.index.dayofweek < 5].union(sentiment.index)
+            index = pd.DatetimeIndex(days, name="Date")
+    index = pd.DatetimeIndex(index).rename("Date")
+    sentiment = daily_sentiment(sentiment_data, index, timezone, market_close)
+
+    sources = [frame for frame in (stock, weather, sentiment) if len(frame.columns)]
+    columns = [column for frame in sources for column in frame.columns]
+    values = np.full((len(index), len(columns)), np.nan, dtype=np.float32)
+    offset = 0
+    for frame in sources:
+        width = len(frame.columns)
+        rows = index.get_indexer(frame.index)
+        keep = rows >= 0
+        values[rows[keep], offset:offset + width] = frame.to_numpy(dtype=np.float32)[keep]
+        offset += width
+    if "news_count" in columns:
+        counts = values[:, columns.index("news_count")]
+        counts[np.isnan(counts)] = 0
+    return AlignedFeatures(index, columns, values)
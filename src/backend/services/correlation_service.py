@@ -1,18 +1,55 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .alignment import align_sources
+
+def pearson_matrix(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete Pearson correlation of every column of x against every
+    column of y, with two-sided p-values, in a handful of matrix products.
+
+    x is (T, a), y is (T, b); NaNs are excluded pair by pair. Returns
+    (correlation, p_value, n), each of shape (a, b).
+    """
+    from scipy import stats
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    # Center by column means first for numerical stability; r is shift-invariant.
+    # An all-NaN column (e.g. a lag past the history) is centered on 0 instead of warning
+    x0 = np.where(mx, x - np.where(mx, x, 0.0).sum(axis=0) / np.maximum(mx.sum(axis=0), 1), 0.0)
+    y0 = np.where(my, y - np.where(my, y, 0.0).sum(axis=0) / np.maximum(my.sum(axis=0), 1), 0.0)
+    mxf, myf = mx.astype(np.float64), my.astype(np.float64)
+
+    n = mxf.T @ myf
+    sx = x0.T @ myf
+    sy = mxf.T @ y0
+    sxx = (x0 * x0).T @ myf
+    syy = mxf.T @ (y0 * y0)
+    sxy = x0.T @ y0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        r = np.clip(cov / np.sqrt(var), -1.0, 1.0)
+        dof = n - 2
+        t = r * np.sqrt(dof / np.maximum(1.0 - r * r, 1e-300))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    r[n < 3] = np.nan
+    p[np.isnan(r)] = np.nan
+    return r, p, n.astype(np.int64)
 
 class CorrelationAnalyzer:
     def analyze_correlations(self, 
                            stock_data: pd.DataFrame, 
                            weather_data: pd.DataFrame,
-                           sentiment_data: pd.DataFrame) -> Dict:
+                           sentiment_data: Union[pd.DataFrame, List[Dict]]) -> Dict:
         """Analyze correlations between different factors"""
         
-        # Merge all data on date
-        combined_data = pd.merge(stock_data, weather_data, on='date')
-        combined_data = pd.merge(combined_data, sentiment_data, on='date')
+        # Put all sources on the stock's trading days
+        combined_data = align_sources(stock_data, weather_data, sentiment_data).to_frame()
         
         correlations = {
             'weather': self._analyze_weather_correlation(combined_data),
@@ -22,32 +59,65 @@ class CorrelationAnalyzer:
         
         return correlations
     
+    def batch_correlations(self,
+                           returns: pd.DataFrame,
+                           weather: pd.DataFrame,
+                           lags: Sequence[int] = (0,)) -> Dict[int, Dict[str, pd.DataFrame]]:
+        """
+        Correlate every ticker against every weather variable in one pass.
+
+        returns is a (date x ticker) frame and weather a (date x variable)
+        frame, e.g. columns like "NYC/temperature" for many cities. Rows are
+        aligned on the date index. For each lag k, weather at t-k is compared
+        with returns at t. Returns {lag: {"correlation", "p_value", "n"}},
+        each a (ticker x variable) frame.
+        """
+        returns, weather = returns.align(weather, join='inner', axis=0)
+        weather_values = weather.to_numpy(dtype=np.float64)
+        results = {}
+        rows = len(weather_values)
+        for lag in lags:
+            # Lags at least as long as the history leave no overlap: all NaN, n = 0
+            lagged = np.full_like(weather_values, np.nan)
+            if 0 <= lag < rows:
+                lagged[lag:] = weather_values[:rows - lag]
+            elif -rows < lag < 0:
+                lagged[:lag] = weather_values[-lag:]
+            r, p, n = pearson_matrix(returns.to_numpy(dtype=np.float64), lagged)
+            results[lag] = {
+                'correlation': pd.DataFrame(r, index=returns.columns, columns=weather.columns),
+                'p_value': pd.DataFrame(p, index=returns.columns, columns=weather.columns),
+                'n': pd.DataFrame(n, index=returns.columns, columns=weather.columns),
+            }
+        return results
+
     def _analyze_weather_correlation(self, data: pd.DataFrame) -> Dict:
         """Analyze correlation between weather and stock price"""
-        weather_corr = {}
-        for column in ['temperature', 'precipitation', 'humidity']:
-            if column in data.columns:
-                correlation, p_value = stats.pearsonr(
-                    data['Close'], 
-                    data[column]
-                )
-                weather_corr[column] = {
-                    'correlation': correlation,
-                    'p_value': p_value
-                }
-        return weather_corr
+        columns = [c for c in ['temperature', 'precipitation', 'humidity'] if c in data.columns]
+        if not columns:
+            return {}
+        r, p, _ = pearson_matrix(data[['Close']].to_numpy(), data[columns].to_numpy())
+        return {
+            column: {'correlation': float(r[0, i]), 'p_value': float(p[0, i])}
+            for i, column in enumerate(columns)
+        }
     
     def _analyze_sentiment_correlation(self, data: pd.DataFrame) -> Dict:
         """Analyze correlation between sentiment and stock price"""
         sentiment_corr = {}
         if 'sentiment_score' in data.columns:
+            pair = data[['Close', 'sentiment_score']].dropna()
+            if len(pair) < 3:
+                return sentiment_corr
+            from scipy import stats
+
             correlation, p_value = stats.pearsonr(
-                data['Close'],
-                data['sentiment_score']
+                pair['Close'],
+                pair['sentiment_score']
             )
             sentiment_corr['sentiment'] = {
-                'correlation': correlation,
-                'p_value': p_value
+                'correlation': float(correlation),
+                'p_value': float(p_value)
             }
         return sentiment_corr
     
@@ -56,16 +126,19 @@ class CorrelationAnalyzer:
         from sklearn.linear_model import LinearRegression
         
         # Prepare features
-        features = ['temperature', 'precipitation', 'sentiment_score']
-        X = data[features]
-        y = data['Close']
+        features = [c for c in ['temperature', 'precipitation', 'sentiment_score'] if c in data.columns]
+        rows = data[features + ['Close']].dropna()
+        if not features or len(rows) < len(features) + 2:
+            return {}
+        X = rows[features]
+        y = rows['Close']
         
         # Fit regression
         model = LinearRegression()
         model.fit(X, y)
         
         # Get coefficients
-        effects = dict(zip(features, model.coef_))
-        effects['r_squared'] = model.score(X, y)
+        effects = {feature: float(coef) for feature, coef in zip(features, model.coef_)}
+        effects['r_squared'] = float(model.score(X, y))
         
         return effects
\ No newline at end of file
@@ -1,48 +1,204 @@
 import pandas as pd
 import asyncio
-from typing import Dict, List
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+from ..config import BLOCKING_IO_WORKERS, PREDICTOR_MODEL_NAME, PREDICTOR_MODEL_VERSION, SOURCE_TIMEOUTS
 from ..models.finance import FinanceAnalyzer
+from ..models.model_store import ModelStore, get_model_store
 from ..models.weather import WeatherAnalyzer
+from ..nlp.model_registry import get_model_registry
 from ..nlp.sentiment import NLPAnalyzer
-from ..models.prediction import StockPricePredictor, LSTMPredictor
+from ..models.prediction import StockPricePredictor
+from .sentiment_service import fetch_news_articles
+from .telemetry import span
 
 class DataIntegrationService:
-    def __init__(self):
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None,
+                 model_store: Optional[ModelStore] = None):
         self.finance_analyzer = FinanceAnalyzer()
         self.weather_analyzer = WeatherAnalyzer()
         self.nlp_analyzer = NLPAnalyzer()
-        self.predictor = StockPricePredictor()
-        
+        # Trained offline; loaded from the model store on first use
+        self.model_store = model_store or get_model_store()
+        # Bounded pool for blocking providers (yfinance) so they never run on the event loop
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="data-fetch"
+        )
+        self.source_timeouts = dict(SOURCE_TIMEOUTS)
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def _fetch_source(self, name: str, awaitable: Awaitable, default: Any) -> Tuple[Any, Optional[str]]:
+        """Await one source under its timeout; on failure return the default and the error"""
+        try:
+            with span(f"fetch.{name}"):
+                return await asyncio.wait_for(awaitable, timeout=self.source_timeouts[name]), None
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.source_timeouts[name]}s"
+        except Exception as e:
+            error = str(e)
+        logging.error(f"Error fetching {name} data: {error}")
+        return default, error
+
     async def fetch_all_data(self, ticker: str, location: str, start_date, end_date):
-        """Fetch all required data concurrently"""
-        tasks = [
-            self.finance_analyzer.fetch_stock_data(ticker, start_date, end_date),
-            self.weather_analyzer.fetch_weather_data(location, start_date, end_date),
-            self.fetch_news_data(ticker, start_date, end_date)
+        """
+        Fetch all required data concurrently.
+
+        Returns stock, weather and news data plus a dict of per-source errors;
+        a source that fails or times out yields an empty result instead of
+        failing the whole request.
+        """
+        results = await asyncio.gather(
+            self._fetch_source(
+                "stock",
+                self._run_blocking(self.finance_analyzer.fetch_stock_data, ticker, start_date, end_date),
+                pd.DataFrame(),
+            ),
+            self._fetch_source(
+                "weather",
+                self.weather_analyzer.fetch_weather_data(location, start_date, end_date),
+                pd.DataFrame(),
+            ),
+            self._fetch_source(
+                "news",
+                self.fetch_news_data(ticker, start_date, end_date),
+                [],
+            ),
+        )
+
+        (stock_data, stock_error), (weather_data, weather_error), (news_data, news_error) = results
+        errors = {
+            name: error
+            for name, error in (("stock", stock_error), ("weather", weather_error), ("news", news_error))
+            if error is not None
+        }
+        return stock_data, weather_data, news_data, errors
+
+    async def fetch_news_data(self, ticker: str, start_date, end_date) -> List[Dict]:
+        """Fetch news articles (title and publish time) for a ticker"""
+        articles = await fetch_news_articles(ticker, start_date, end_date)
+        return [
+            {'title': article['title'], 'publishedAt': article.get('publishedAt')}
+            for article in articles if article.get('title')
         ]
-        
-        stock_data, weather_data, news_data = await asyncio.gather(*tasks)
-        return stock_data, weather_data, news_data
-        
+
     async def perform_analysis(self, ticker: str, location: str, start_date, end_date):
         """Perform comprehensive analysis"""
         # Fetch data
-        stock_data, weather_data, news_data = await self.fetch_all_data(
+        stock_data, weather_data, news_data, errors = await self.fetch_all_data(
             ticker, location, start_date, end_date
         )
-        
-        # Analyze data
-        analysis_results = {
-            'stock_analysis': self.finance_analyzer.analyze_stock(stock_data),
-            'weather_impact': self.weather_analyzer.analyze_weather_patterns(weather_data),
-            'sentiment_analysis': self.nlp_analyzer.analyze_news_batch(news_data),
-            'predictions': self.generate_predictions(stock_data, weather_data, news_data)
-        }
-        
+
+        # Analyze whatever sources are available
+        analysis_results = {}
+        if not stock_data.empty:
+            with span("analysis.stock"):
+                analysis_results['stock_analysis'] = self.finance_analyzer.analyze_stock(stock_data)
+        if not weather_data.empty:
+            with span("analysis.weather"):
+                analysis_results['weather_impact'] = self.weather_analyzer.analyze_weather_patterns(weather_data)
+        sentiments, sentiment_data = self._score_news(news_data)
+        if news_data:
+            analysis_results['sentiment_analysis'] = sentiments
+        if not errors:
+            with span("model.predictor"):
+                analysis_results['predictions'] = self.generate_predictions(stock_data, weather_data, sentiment_data)
+        analysis_results['errors'] = errors
+
         return analysis_results
-        
-    def generate_predictions(self, stock_data, weather_data, news_data):
-        """Generate price predictions"""
-        X, y = self.predictor.prepare_features(stock_data, weather_data, news_data)
-        predictions = self.predictor.predict(X)
-        return predictions.tolist()
\ No newline at end of file
+
+    async def analysis_frames(self, ticker: str, location: str, start_date,
+                              end_date) -> Tuple[Dict, Dict[str, pd.DataFrame]]:
+        """
+        The same analysis as perform_analysis, for streamed responses: a small
+        summary plus the time series as frames (stock with indicators, weather,
+        extreme events, scored headlines, predictions), never turned into rows.
+        """
+        stock_data, weather_data, news_data, errors = await self.fetch_all_data(
+            ticker, location, start_date, end_date
+        )
+
+        summary, frames = {}, {}
+        if not stock_data.empty:
+            with span("analysis.stock"):
+                summary['stock_analysis'] = self.finance_analyzer.analyze_stock(stock_data)
+                frames['stock'] = self.finance_analyzer.calculate_technical_indicators(stock_data)
+        if not weather_data.empty:
+            with span("analysis.weather"):
+                summary['weather_impact'] = self.weather_analyzer.analyze_weather_patterns(
+                    weather_data, include_events=False
+                )
+                frames['weather'] = weather_data
+                frames['extreme_events'] = self.weather_analyzer.event_engine.detect(weather_data)
+        sentiments, sentiment_data = self._score_news(news_data)
+        if news_data:
+            frames['sentiment'] = pd.DataFrame({
+                'publishedAt': pd.to_datetime([article['publishedAt'] for article in news_data], utc=True),
+                'title': [article['title'] for article in news_data],
+                'sentiment': [result['sentiment'] for result in sentiments],
+                'score': [result['score'] for result in sentiments],
+            })
+        if not errors:
+            with span("model.predictor"):
+                predicted = self.predict_frame(stock_data, weather_data, sentiment_data)
+            if predicted is not None:
+                summary['model_version'], frames['predictions'] = predicted
+        summary['errors'] = errors
+
+        return summary, frames
+
+    def _score_news(self, news_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Sentiment per headline, and the dated records the predictor's features use"""
+        if not news_data:
+            return [], []
+        with span("analysis.sentiment"):
+            sentiments = self.nlp_analyzer.analyze_news_batch([article['title'] for article in news_data])
+        sentiment_data = [
+            {'date': article['publishedAt'], 'sentiment': result['sentiment'], 'score': result['score']}
+            for article, result in zip(news_data, sentiments) if article['publishedAt']
+        ]
+        return sentiments, sentiment_data
+
+    async def get_weather_alerts(self, location: str) -> List[Dict]:
+        """Get current weather alerts for a location"""
+        return await self.weather_analyzer.get_weather_alerts(location)
+
+    def load_predictor(self) -> Optional[StockPricePredictor]:
+        """The pre-trained predictor, shared through the model registry; None if none is trained"""
+        version = PREDICTOR_MODEL_VERSION or self.model_store.latest(PREDICTOR_MODEL_NAME)
+        if version is None:
+            return None
+        return get_model_registry().get(
+            ("predictor", PREDICTOR_MODEL_NAME, version),
+            lambda: StockPricePredictor.load(self.model_store, PREDICTOR_MODEL_NAME, version)
+        )
+
+    def predict_frame(self, stock_data, weather_data,
+                      sentiment_data) -> Optional[Tuple[Optional[str], pd.DataFrame]]:
+        """Model version and a per-day predicted_next_close frame; None if no model is trained"""
+        predictor = self.load_predictor()
+        if predictor is None:
+            logging.warning(
+                "No trained price predictor; run python -m src.backend.jobs.train_predictor"
+            )
+            return None
+        X, _ = predictor.build_features(stock_data, weather_data, sentiment_data)
+        predictions = predictor.predict(X) if len(X) else []
+        frame = pd.DataFrame({'predicted_next_close': predictions}, index=X.index, dtype='float64')
+        return predictor.metadata.get('version'), frame
+
+    def generate_predictions(self, stock_data, weather_data, sentiment_data) -> Optional[Dict]:
+        """Predict the next session's close for each day, using the pre-trained model"""
+        predicted = self.predict_frame(stock_data, weather_data, sentiment_data)
+        if predicted is None:
+            return None
+        version, frame = predicted
+        return {
+            'model_version': version,
+            'dates': [day.strftime('%Y-%m-%d') for day in frame.index],
+            'predicted_next_close': frame['predicted_next_close'].tolist(),
+        }
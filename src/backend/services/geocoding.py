@@ -0,0 +1,201 @@
+import asyncio
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional
+
+from ..config import GEOCODE_CACHE_PATH, GEOCODE_GAZETTEER_PATH, OPENWEATHER_API_KEY, OPENWEATHER_GEO_URL
+from .http_client import AsyncHttpClient, get_http_client
+
+
+def normalize_location(location: str) -> str:
+    """
+    Canonical cache key for a location string: Unicode-normalized, accents
+    stripped, case-folded, whitespace collapsed and no spaces around commas,
+    so "São Paulo , BR" and "sao paulo,br" share one entry.
+    """
+    text = unicodedata.normalize("NFKD", location)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = unicodedata.normalize("NFKC", text).casefold()
+    parts = [" ".join(part.split()) for part in text.split(",")]
+    return ",".join(part for part in parts if part)
+
+
+def load_gazetteer(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Read a name,country,lat,lon CSV into normalized keys. Each city is
+    reachable both as "name" and "name,country"; on a bare-name clash the
+    first row wins, so list the most commonly meant city first.
+    """
+    entries: Dict[str, Dict[str, float]] = {}
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            coords = {"lat": float(row["lat"]), "lon": float(row["lon"])}
+            name = normalize_location(row["name"])
+            entries.setdefault(name, coords)
+            if row.get("country"):
+                entries.setdefault(normalize_location(f"{row['name']},{row['country']}"), coords)
+    return entries
+
+
+class GeocodingCache:
+    """
+    Location -> coordinates lookup keyed by normalized location string.
+
+    Lookups go to an in-memory dict, then the offline gazetteer, then a
+    SQLite file that keeps every geocoding result across restarts.
+    Coordinates never go stale, so entries have no expiry.
+    """
+
+    def __init__(self, path: Optional[str] = None, gazetteer_path: Optional[str] = None):
+        self.path = path or GEOCODE_CACHE_PATH
+        self.gazetteer_path = GEOCODE_GAZETTEER_PATH if gazetteer_path is None else gazetteer_path
+        self.gazetteer: Dict[str, Dict[str, float]] = {}
+        self.memory_hits = 0
+        self.gazetteer_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        if self.gazetteer_path:
+            try:
+                self.gazetteer = load_gazetteer(self.gazetteer_path)
+            except (OSError, KeyError, ValueError) as e:
+                logging.warning(f"Could not load gazetteer {self.gazetteer_path}: {str(e)}")
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "key TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL, query TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """Coordinates for a normalized key, or None if it has to be geocoded"""
+        with self._lock:
+            coords = self._entries.get(key)
+            if coords is not None:
+                self.memory_hits += 1
+                return coords
+            coords = self.gazetteer.get(key)
+            if coords is not None:
+                self.gazetteer_hits += 1
+            else:
+                row = self._conn.execute("SELECT lat, lon FROM geocode WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.disk_hits += 1
+                coords = {"lat": row[0], "lon": row[1]}
+            self._entries[key] = coords
+            return coords
+
+    def put(self, key: str, coords: Dict[str, float], query: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = coords
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (key, lat, lon, query) VALUES (?, ?, ?, ?)",
+                (key, coords["lat"], coords["lon"], query),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        return {
+            "memory_entries": len(self._entries),
+            "gazetteer_entries": len(self.gazetteer),
+            "stored_entries": stored,
+            "memory_hits": self.memory_hits,
+            "gazetteer_hits": self.gazetteer_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Geocoder:
+    """
+    Cached front end to the OpenWeatherMap geocoding endpoint.
+
+    Each normalized location is geocoded at most once: concurrent requests
+    for the same location share one in-flight lookup, and results are kept
+    in the GeocodingCache. Locations that cannot be found are not cached.
+    """
+
+    def __init__(self, http_client: Optional[AsyncHttpClient] = None, api_key: Optional[str] = None,
+                 geo_url: Optional[str] = None, cache: Optional[GeocodingCache] = None):
+        self.http_client = http_client or get_http_client()
+        self.api_key = api_key or OPENWEATHER_API_KEY
+        self.geo_url = geo_url or OPENWEATHER_GEO_URL
+        self.cache = cache or GeocodingCache()
+        self.lookups = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _lookup(self, key: str, location: str) -> Dict[str, float]:
+        self.lookups += 1
+        params = {"q": location, "limit": 1, "appid": self.api_key}
+        location_data = await self.http_client.get_json(self.geo_url, params=params)
+        if not location_data:
+            raise ValueError(f"Location not found: {location}")
+        coords = {"lat": location_data[0]["lat"], "lon": location_data[0]["lon"]}
+        self.cache.put(key, coords, query=location)
+        return coords
+
+    async def resolve(self, location: str) -> Dict[str, float]:
+        """Latitude and longitude for a location; raises ValueError if it is unknown"""
+        key = normalize_location(location)
+        if not key:
+            raise ValueError(f"Location not found: {location}")
+        coords = self.cache.get(key)
+        if coords is not None:
+            return coords
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(key, location))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def resolve_many(self, locations: Iterable[str], return_exceptions: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Resolve many locations at once, keyed by the strings passed in.
+
+        Spelling variants of one place cost a single lookup, and all cache
+        misses are geocoded concurrently. With return_exceptions, failures
+        are returned as the exception instead of aborting the batch.
+        """
+        locations = list(dict.fromkeys(locations))
+        by_key: Dict[str, str] = {}
+        for location in locations:
+            by_key.setdefault(normalize_location(location), location)
+        results = await asyncio.gather(
+            *[self.resolve(location) for location in by_key.values()], return_exceptions=return_exceptions
+        )
+        resolved = dict(zip(by_key, results))
+        return {location: resolved[normalize_location(location)] for location in locations}
+
+    def stats(self) -> Dict:
+        return {"lookups": self.lookups, "inflight": len(self._inflight), **self.cache.stats()}
+
+
+_geocoder: Optional[Geocoder] = None
+
+
+def get_geocoder() -> Geocoder:
+    """Shared geocoder, so every service reuses one cache"""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = Geocoder()
+    return _geocoder
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import HTTP_MAX_CONNECTIONS, HTTP_MAX_RETRIES, HTTP_PER_HOST_LIMIT, HTTP_TIMEOUT
+from .telemetry import count, span
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AsyncHttpClient:
+    """
+    Shared async HTTP client for all external data sources.
+
+    Wraps a pooled httpx.AsyncClient (keep-alive connections), caps the number
+    of in-flight requests per host, and retries transient failures with
+    exponential backoff.
+    """
+
+    def __init__(self,
+                 timeout: float = HTTP_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 per_host_limit: int = HTTP_PER_HOST_LIMIT,
+                 max_connections: int = HTTP_MAX_CONNECTIONS,
+                 backoff: float = 0.5):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.per_host_limit = per_host_limit
+        self.max_connections = max_connections
+        self.backoff = backoff
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pools and semaphores belong to one event loop; rebuild them if the
+        # client is reused from a different loop (e.g. separate asyncio.run calls)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._discard_client()
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._host_limits = {}
+            self._loop = loop
+        return self._client
+
+    def _discard_client(self):
+        """Release the client built on another loop: closed there if that loop still runs, else dropped"""
+        client, loop = self._client, self._loop
+        self._client = None
+        if client is None:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        # A finished loop has already torn down the pool's transports; nothing left to await there
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  raise_for_status: bool = True) -> httpx.Response:
+        """GET with per-host concurrency limit, timeout and retry"""
+        host = urlsplit(url).netloc
+        with span("http", host=host):
+            return await self._get(url, host, params, raise_for_status)
+
+    async def _get(self, url: str, host: str, params: Optional[Dict], raise_for_status: bool) -> httpx.Response:
+        client = self._get_client()
+        limit = self._host_limit(url)
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with limit:
+                    response = await client.get(url, params=params)
+                count("external_requests_total", host=host, status=response.status_code)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    if raise_for_status:
+                        response.raise_for_status()
+                    return response
+                if attempt == self.max_retries:
+                    break
+            except httpx.TransportError as e:
+                count("external_requests_total", host=host, status="error")
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(f"Request to {url} failed ({e!r}), retrying")
+
+            count("external_request_retries_total", host=host)
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+
+    async def get_json(self, url: str, params: Optional[Dict] = None) -> Any:
+        response = await self.get(url, params=params)
+        return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._host_limits = {}
+
+
+_http_client: Optional[AsyncHttpClient] = None
+
+
+def get_http_client() -> AsyncHttpClient:
+    """Return the process-wide HTTP client"""
+    global _http_client
+    if _http_client is None:
+        _http_client = AsyncHttpClient()
+    return _http_client
@@ -0,0 +1,360 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+import pandas as pd
+from fastapi import WebSocket, WebSocketDisconnect
+
+from ..config import LIVE_HISTORY_DAYS, LIVE_NEWS_POLL_SECONDS, LIVE_POLL_SECONDS, LIVE_WINDOWS
+from .alignment import align_sources
+from .rolling_correlation import RollingCorrelationEngine
+from .sentiment_service import fetch_news_articles
+from .websocket_service import WebSocketManager, topic_name
+
+# Numeric weather fields correlated against returns
+LIVE_WEATHER_VARIABLES = ["temperature", "humidity", "wind_speed"]
+
+
+def location_key(location: str) -> str:
+    return " ".join(location.split()).casefold()
+
+
+def pair_topic(ticker: str, location: str) -> str:
+    """Topic carrying correlation updates for one (ticker, location) subscription"""
+    return f"{topic_name('ticker', ticker)}|{topic_name('location', location)}"
+
+
+def _rounded(stats: Dict) -> Dict:
+    return {key: (round(value, 6) if isinstance(value, float) else value) for key, value in stats.items()}
+
+
+class LiveAnalyticsStream:
+    """
+    Background scheduler that keeps rolling weather/return statistics for
+    every watched (ticker, location) pair and pushes changes over WebSocket.
+
+    Polling is per unique key, not per subscriber: each cycle makes one
+    batched price call for all watched tickers, one weather call per
+    watched location and (less often) one news call per ticker, however
+    many clients share them. New completed days feed the
+    RollingCorrelationEngine, which reports exactly which pairs changed;
+    only those pairs are re-read and sent, as compact messages on their own
+    topics:
+
+        {"type": "bar", "ticker", "date", "close", "change"}            ticker:<T>
+        {"type": "weather", "location", "date", <changed fields>}      location:<l>
+        {"type": "headline", "ticker", "title", "sentiment", "score"}  ticker:<T>
+        {"type": "correlation", "ticker", "location", "variable",
+         "windows": {window: {"n", "correlation", "slope", ...}}}     ticker:<T>|location:<l>
+
+    A new client first receives a snapshot of its pair.
+    """
+
+    def __init__(self, manager: WebSocketManager, finance_analyzer, weather_analyzer,
+                 nlp_analyzer=None,
+                 news_fetcher: Callable[..., Awaitable[List[Dict]]] = fetch_news_articles,
+                 windows: Iterable[int] = LIVE_WINDOWS,
+                 history_days: int = LIVE_HISTORY_DAYS,
+                 poll_seconds: float = LIVE_POLL_SECONDS,
+                 news_poll_seconds: float = LIVE_NEWS_POLL_SECONDS):
+        self.manager = manager
+        self.finance_analyzer = finance_analyzer
+        self.weather_analyzer = weather_analyzer
+        self.nlp_analyzer = nlp_analyzer
+        self.news_fetcher = news_fetcher
+        self.history_days = history_days
+        self.poll_seconds = poll_seconds
+        self.news_poll_seconds = news_poll_seconds
+        self.engine = RollingCorrelationEngine(windows)
+
+        self.watchers: Dict[Tuple[str, str], int] = {}
+        self._queries: Dict[str, str] = {}
+        self._seeding: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._price_day: Dict[str, pd.Timestamp] = {}
+        self._weather_day: Dict[str, pd.Timestamp] = {}
+        self._last_bar: Dict[str, Dict] = {}
+        self._last_weather: Dict[str, Dict] = {}
+        self._pushed: Dict[Tuple[str, str], Dict] = {}
+        self._seen_headlines: Dict[str, "OrderedDict[str, None]"] = {}
+        self.polls = {"price": 0, "weather": 0, "news": 0}
+
+    @property
+    def tickers(self) -> Set[str]:
+        return {ticker for ticker, _ in self.watchers}
+
+    @property
+    def locations(self) -> Set[str]:
+        return {location for _, location in self.watchers}
+
+    @staticmethod
+    def _today() -> pd.Timestamp:
+        return pd.Timestamp.now().normalize()
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # Subscriptions
+
+    async def watch(self, ticker: str, location: str) -> Dict:
+        """Register one more watcher of a pair, seeding it on first use; returns its snapshot"""
+        key = (ticker.strip().upper(), location_key(location))
+        self._queries.setdefault(key[1], location.strip())
+        self.watchers[key] = self.watchers.get(key, 0) + 1
+        seeding = self._seeding.get(key)
+        if seeding is None:
+            seeding = self._seeding[key] = asyncio.ensure_future(self._seed(*key))
+        try:
+            await asyncio.shield(seeding)
+        except Exception:
+            if self._seeding.get(key) is seeding:
+                del self._seeding[key]
+            raise
+        return self.snapshot(*key)
+
+    def unwatch(self, ticker: str, location: str):
+        key = (ticker.strip().upper(), location_key(location))
+        if key not in self.watchers:
+            return
+        self.watchers[key] -= 1
+        if self.watchers[key] > 0:
+            return
+        del self.watchers[key]
+        self._seeding.pop(key, None)
+        for variable in LIVE_WEATHER_VARIABLES:
+            self.engine.untrack(key[0], f"{key[1]}/{variable}")
+            self._pushed.pop((key[0], f"{key[1]}/{variable}"), None)
+
+    async def _seed(self, ticker: str, location: str):
+        """Fill the pair's windows from recent history"""
+        today = self._today()
+        start = (today - timedelta(days=self.history_days)).to_pydatetime()
+        stock, weather = await asyncio.gather(
+            self._run_blocking(self.finance_analyzer.fetch_stock_data, ticker, start, datetime.now()),
+            self.weather_analyzer.fetch_weather_data(self._queries[location], start, datetime.now()),
+        )
+        stock = stock[stock.index < today]
+        weather = weather[pd.to_datetime(weather["date"]) < today] if len(weather) else weather
+        aligned = align_sources(stock, weather).to_frame()
+        for variable in LIVE_WEATHER_VARIABLES:
+            if variable in aligned.columns:
+                self.engine.seed_pair(ticker, f"{location}/{variable}", aligned[["return", variable]])
+
+        # Start live feeding after the history just used
+        if ticker not in self._price_day and len(stock):
+            self._price_day[ticker] = stock.index[-1]
+            self.engine.add_price(ticker, stock.index[-1], float(stock["Close"].iloc[-1]))
+        if location not in self._weather_day and len(weather):
+            self._weather_day[location] = pd.Timestamp(weather["date"].iloc[-1]).normalize()
+
+    def snapshot(self, ticker: str, location: str) -> Dict:
+        correlations = {}
+        for variable in LIVE_WEATHER_VARIABLES:
+            key = (ticker, f"{location}/{variable}")
+            if key in self.engine.pairs:
+                correlations[variable] = {
+                    str(window): _rounded(stats) for window, stats in self.engine.result(*key).items()
+                }
+        return {
+            "type": "snapshot",
+            "ticker": ticker,
+            "location": location,
+            "correlations": correlations,
+            "bar": self._last_bar.get(ticker),
+            "weather": self._last_weather.get(location),
+        }
+
+    # Polling
+
+    async def poll_once(self, news: bool = True):
+        """One cycle over every unique ticker and location"""
+        polls = [self.poll_prices(), self.poll_weather()]
+        if news:
+            polls.append(self.poll_news())
+        for result in await asyncio.gather(*polls, return_exceptions=True):
+            if isinstance(result, Exception):
+                logging.error(f"Live poll failed: {result}")
+
+    async def poll_prices(self):
+        tickers = sorted(self.tickers)
+        if not tickers:
+            return
+        today = self._today()
+        frames = await self._run_blocking(
+            self.finance_analyzer.fetch_many_stock_data, tickers,
+            (today - timedelta(days=7)).to_pydatetime(), (today + timedelta(days=1)).to_pydatetime(),
+        )
+        self.polls["price"] += 1
+        changed = set()
+        for ticker in tickers:
+            frame = frames.get(ticker)
+            if frame is None or frame.empty:
+                continue
+            # Only completed sessions enter the statistics; today's bar is still moving
+            last_fed = self._price_day.get(ticker)
+            for day, close in frame["Close"].items():
+                if day < today and (last_fed is None or day > last_fed):
+                    changed.update(self.engine.add_price(ticker, day, float(close)))
+                    self._price_day[ticker] = last_fed = day
+
+            closes = frame["Close"].to_numpy(dtype=float)
+            bar = {
+                "date": frame.index[-1].strftime("%Y-%m-%d"),
+                "close": round(closes[-1], 6),
+                "change": round(closes[-1] / closes[-2] - 1, 6) if len(closes) > 1 else None,
+            }
+            if bar != self._last_bar.get(ticker):
+                self._last_bar[ticker] = bar
+                await self._publish(topic_name("ticker", ticker), {"type": "bar", "ticker": ticker, **bar},
+                                    coalesce_key=("bar", ticker))
+        await self._push_correlations(changed)
+
+    async def poll_weather(self):
+        locations = sorted(self.locations)
+        if not locations:
+            return
+        now = datetime.now()
+        frames = await asyncio.gather(*[
+            self.weather_analyzer.fetch_weather_data(self._queries[location], now - timedelta(days=3), now)
+            for location in locations
+        ], return_exceptions=True)
+        today = self._today()
+        changed = set()
+        for location, frame in zip(locations, frames):
+            self.polls["weather"] += 1
+            if isinstance(frame, Exception):
+                logging.error(f"Live weather poll for {location} failed: {frame}")
+                continue
+            if frame.empty:
+                continue
+            days = pd.to_datetime(frame["date"]).dt.normalize()
+            last_fed = self._weather_day.get(location)
+            for day, (_, row) in zip(days, frame.iterrows()):
+                if day < today and (last_fed is None or day > last_fed):
+                    for variable in LIVE_WEATHER_VARIABLES:
+                        changed.update(self.engine.add_weather(f"{location}/{variable}", day, row.get(variable)))
+                    self._weather_day[location] = last_fed = day
+
+            latest = {
+                variable: frame[variable].iloc[-1] for variable in LIVE_WEATHER_VARIABLES if variable in frame
+            }
+            latest = {k: (None if pd.isna(v) else round(float(v), 3)) for k, v in latest.items()}
+            previous = self._last_weather.get(location, {})
+            diff = {k: v for k, v in latest.items() if previous.get(k) != v}
+            date = days.iloc[-1].strftime("%Y-%m-%d")
+            if diff or previous.get("date") != date:
+                self._last_weather[location] = {"date": date, **latest}
+                await self._publish(topic_name("location", location),
+                                    {"type": "weather", "location": location, "date": date, **diff},
+                                    coalesce_key=None)
+        await self._push_correlations(changed)
+
+    async def poll_news(self):
+        tickers = sorted(self.tickers)
+        if not tickers:
+            return
+        now = datetime.now()
+        results = await asyncio.gather(*[
+            self.news_fetcher(ticker, now - timedelta(days=1), now) for ticker in tickers
+        ], return_exceptions=True)
+        fresh = []
+        for ticker, articles in zip(tickers, results):
+            self.polls["news"] += 1
+            if isinstance(articles, Exception):
+                logging.error(f"Live news poll for {ticker} failed: {articles}")
+                continue
+            seen = self._seen_headlines.setdefault(ticker, OrderedDict())
+            for article in articles:
+                title = article.get("title")
+                if not title or title in seen:
+                    continue
+                seen[title] = None
+                while len(seen) > 1000:
+                    seen.popitem(last=False)
+                fresh.append((ticker, article))
+        if not fresh:
+            return
+
+        # One batched inference call for every new headline across tickers
+        if self.nlp_analyzer is None:
+            from ..nlp.sentiment import NLPAnalyzer
+            self.nlp_analyzer = NLPAnalyzer()
+        sentiments = await self._run_blocking(
+            self.nlp_analyzer.analyze_texts, [article["title"] for _, article in fresh]
+        )
+        for (ticker, article), sentiment in zip(fresh, sentiments):
+            await self._publish(topic_name("ticker", ticker), {
+                "type": "headline",
+                "ticker": ticker,
+                "title": article["title"],
+                "published_at": article.get("publishedAt"),
+                "sentiment": sentiment["sentiment"],
+                "score": round(sentiment["score"], 4),
+            })
+
+    async def _push_correlations(self, changed: Iterable[Tuple[str, str]]):
+        for ticker, variable in changed:
+            if (ticker, variable) not in self.engine.pairs:
+                continue
+            location, name = variable.rsplit("/", 1)
+            windows = {
+                str(window): _rounded(stats) for window, stats in self.engine.result(ticker, variable).items()
+            }
+            if windows == self._pushed.get((ticker, variable)):
+                continue
+            self._pushed[(ticker, variable)] = windows
+            # Later updates of the same pair supersede earlier ones still queued for a slow client
+            await self._publish(pair_topic(ticker, location), {
+                "type": "correlation", "ticker": ticker, "location": location,
+                "variable": name, "windows": windows,
+            }, coalesce_key=("correlation", ticker, variable))
+
+    async def _publish(self, topic: str, data: Dict, coalesce_key=None):
+        await self.manager.broadcast(json.dumps(data, default=str), topic, coalesce_key)
+
+    async def run(self):
+        """Poll forever; cycles are skipped while nobody is watching"""
+        next_news = 0.0
+        while True:
+            if self.watchers:
+                news = time.monotonic() >= next_news
+                await self.poll_once(news=news)
+                if news:
+                    next_news = time.monotonic() + self.news_poll_seconds
+            await asyncio.sleep(self.poll_seconds)
+
+    # WebSocket endpoint
+
+    async def serve(self, websocket: WebSocket, ticker: str, location: str):
+        """Stream one pair to a client until it disconnects"""
+        topics = [pair_topic(ticker, location), topic_name("ticker", ticker), topic_name("location", location)]
+        client = await self.manager.connect(websocket, topics)
+        # Lets the manager's sender cancel this loop when it drops a slow client
+        client.receiver = asyncio.current_task()
+        try:
+            client.enqueue(json.dumps(await self.watch(ticker, location), default=str))
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        except asyncio.CancelledError:
+            if not client.closed:
+                raise
+            asyncio.current_task().uncancel()
+        except Exception as e:
+            logging.error(f"Live stream for {ticker}/{location} failed: {e}")
+        finally:
+            self.manager.disconnect(websocket)
+            self.unwatch(ticker, location)
+
+    def stats(self) -> Dict:
+        return {
+            "pairs": len(self.watchers),
+            "watchers": sum(self.watchers.values()),
+            "tickers": len(self.tickers),
+            "locations": len(self.locations),
+            "polls": dict(self.polls),
+        }
@@ -0,0 +1,213 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..config import PRICE_FIXTURE_DIR, PRICE_PROVIDER, PRICE_REFRESH_SECONDS, PRICE_STORE_DIR
+from .telemetry import count, span
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Daily OHLCV with a tz-naive, date-normalized 'Date' index"""
+    frame = frame[[column for column in PRICE_COLUMNS if column in frame.columns]].copy()
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize().rename("Date")
+    return frame.dropna(how="all").sort_index()
+
+
+class PriceProvider(ABC):
+    """Source of daily OHLCV bars for many tickers"""
+
+    @abstractmethod
+    def fetch(self, tickers: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        """Return bars for each ticker with start <= day < end"""
+
+
+class YFinanceProvider(PriceProvider):
+    """Downloads many tickers in one batched yfinance call"""
+
+    def fetch(self, tickers: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        data = yf.download(
+            tickers, start=start, end=end, group_by="ticker",
+            auto_adjust=True, actions=False, threads=True, progress=False,
+        )
+        if data is None or data.empty:
+            return {ticker: pd.DataFrame(columns=PRICE_COLUMNS) for ticker in tickers}
+        result = {}
+        for ticker in tickers:
+            frame = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+            result[ticker] = _normalize(frame)
+        return result
+
+
+class FixtureProvider(PriceProvider):
+    """Serves bars from local <TICKER>.csv files; never touches the network"""
+
+    def __init__(self, directory: str = PRICE_FIXTURE_DIR):
+        self.directory = directory
+        self.calls = 0
+
+    def fetch(self, tickers: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        self.calls += 1
+        result = {}
+        for ticker in tickers:
+            path = os.path.join(self.directory, f"{ticker}.csv")
+            if not os.path.exists(path):
+                result[ticker] = pd.DataFrame(columns=PRICE_COLUMNS)
+                continue
+            frame = _normalize(pd.read_csv(path, index_col=0, parse_dates=True))
+            result[ticker] = frame.loc[pd.Timestamp(start):pd.Timestamp(end) - pd.Timedelta(days=1)]
+        return result
+
+
+def make_price_provider(name: str = PRICE_PROVIDER) -> PriceProvider:
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "fixture":
+        return FixtureProvider()
+    raise ValueError(f"Unknown price provider: {name}")
+
+
+class PriceStore:
+    """
+    Local columnar OHLCV store, one Parquet partition per ticker.
+
+    Each partition records the contiguous day range it covers, so a request
+    only fetches the days outside that range. Ranges that reach today are
+    refetched once the cached copy is older than refresh_seconds.
+    """
+
+    def __init__(self, provider: Optional[PriceProvider] = None, root: str = PRICE_STORE_DIR,
+                 refresh_seconds: float = PRICE_REFRESH_SECONDS):
+        self.provider = provider or make_price_provider()
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _partition(self, ticker: str) -> str:
+        return os.path.join(self.root, f"ticker={ticker}")
+
+    def _read_coverage(self, ticker: str) -> Optional[Dict]:
+        path = os.path.join(self._partition(ticker), "_coverage.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _read(self, ticker: str) -> pd.DataFrame:
+        path = os.path.join(self._partition(ticker), "data.parquet")
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+        return pd.read_parquet(path)
+
+    def _write(self, ticker: str, frame: pd.DataFrame, first: date, last: date):
+        partition = self._partition(ticker)
+        os.makedirs(partition, exist_ok=True)
+        tmp = os.path.join(partition, "data.parquet.tmp")
+        frame.to_parquet(tmp)
+        os.replace(tmp, os.path.join(partition, "data.parquet"))
+        with open(os.path.join(partition, "_coverage.json"), "w") as f:
+            json.dump({"first": first.isoformat(), "last": last.isoformat(), "fetched_at": time.time()}, f)
+
+    def _missing(self, ticker: str, start: date, last: date) -> List[Tuple[date, date]]:
+        """Day ranges (inclusive) to fetch so coverage spans [start, last] contiguously"""
+        coverage = self._read_coverage(ticker)
+        if coverage is None:
+            return [(start, last)]
+        first_covered = date.fromisoformat(coverage["first"])
+        last_covered = date.fromisoformat(coverage["last"])
+        if last_covered >= date.today() and time.time() - coverage["fetched_at"] > self.refresh_seconds:
+            last_covered = date.today() - timedelta(days=1)
+
+        # Gaps always adjoin the stored range (a request wholly before or after
+        # it also fetches the days in between) so coverage stays one span
+        gaps = []
+        if start < first_covered:
+            gaps.append((start, first_covered - timedelta(days=1)))
+        if last > last_covered:
+            gaps.append((last_covered + timedelta(days=1), last))
+        return gaps
+
+    def get(self, ticker: str, start, end) -> pd.DataFrame:
+        """Bars for start <= day < end, fetching only what is not stored"""
+        return self.get_many([ticker], start, end)[ticker]
+
+    def get_many(self, tickers: List[str], start, end) -> Dict[str, pd.DataFrame]:
+        """
+        Bars for many tickers. Tickers missing the same day range are fetched
+        together in one provider call.
+        """
+        start = _to_date(start)
+        last = min(_to_date(end) - timedelta(days=1), date.today())
+        tickers = list(dict.fromkeys(tickers))
+        if last < start:
+            return {ticker: self._read(ticker).iloc[0:0] for ticker in tickers}
+
+        locks = [self._lock(ticker) for ticker in sorted(tickers)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            gaps_by_range: Dict[Tuple[date, date], List[str]] = {}
+            for ticker in tickers:
+                for gap in self._missing(ticker, start, last):
+                    gaps_by_range.setdefault(gap, []).append(ticker)
+
+            missing = {ticker for gap_tickers in gaps_by_range.values() for ticker in gap_tickers}
+            count("price_store_requests_total", len(tickers) - len(missing), result="hit")
+            count("price_store_requests_total", len(missing), result="miss")
+
+            fetched: Dict[str, List[pd.DataFrame]] = {}
+            provider = type(self.provider).__name__
+            for (gap_start, gap_last), gap_tickers in gaps_by_range.items():
+                count("price_provider_calls_total", provider=provider)
+                with span("prices.provider", provider=provider):
+                    frames = self.provider.fetch(gap_tickers, gap_start, gap_last + timedelta(days=1))
+                for ticker in gap_tickers:
+                    fetched.setdefault(ticker, []).append(frames.get(ticker, pd.DataFrame(columns=PRICE_COLUMNS)))
+
+            result = {}
+            for ticker in tickers:
+                stored = self._read(ticker)
+                if ticker in fetched:
+                    stored = self._merge(ticker, stored, fetched[ticker], start, last)
+                result[ticker] = stored.loc[pd.Timestamp(start):pd.Timestamp(last)]
+            return result
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def _merge(self, ticker: str, stored: pd.DataFrame, frames: List[pd.DataFrame],
+               start: date, last: date) -> pd.DataFrame:
+        parts = [frame for frame in [stored, *frames] if not frame.empty]
+        merged = pd.concat(parts) if parts else stored
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        coverage = self._read_coverage(ticker)
+        first = start if coverage is None else min(start, date.fromisoformat(coverage["first"]))
+        newest = last if coverage is None else max(last, date.fromisoformat(coverage["last"]))
+        self._write(ticker, merged, first, newest)
+        return merged
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import RESULT_CACHE_HISTORICAL_TTL, RESULT_CACHE_LIVE_TTL, RESULT_CACHE_SIZE
+
+
+def _day(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def request_key(endpoint: str, ticker: str, location: str, start=None, end=None) -> Tuple:
+    """
+    Cache key for an analysis request. Tickers are upper-cased, locations
+    case- and whitespace-folded, and dates truncated to days since every
+    source is daily. An open-ended range is pinned to today's date.
+    """
+    return (
+        endpoint,
+        ticker.strip().upper(),
+        " ".join(location.split()).casefold(),
+        _day(start),
+        _day(end) or date.today(),
+    )
+
+
+def includes_today(end=None) -> bool:
+    """Whether a range ending at end (None meaning now) still covers data that can change"""
+    end = _day(end)
+    return end is None or end >= date.today()
+
+
+class ResultCache:
+    """
+    In-process TTL cache of computed API results with single-flight
+    coalescing.
+
+    The first request for a key starts the computation as its own task;
+    identical requests arriving while it runs await that same task rather
+    than starting another. Successful results are kept for live_ttl seconds
+    when the range reaches today and historical_ttl otherwise; failures are
+    not cached, so the next request retries.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE,
+                 live_ttl: float = RESULT_CACHE_LIVE_TTL,
+                 historical_ttl: float = RESULT_CACHE_HISTORICAL_TTL):
+        self.max_entries = max_entries
+        self.live_ttl = live_ttl
+        self.historical_ttl = historical_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """(found, value) for a fresh entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: Hashable, value: Any, ttl: float):
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]],
+                             live: bool = True) -> Any:
+        """Cached value for key, else the result of compute(), shared with concurrent callers"""
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, live))
+        # Shield so one caller disconnecting does not cancel the work the others wait on
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task, live: bool):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result(), self.live_ttl if live else self.historical_ttl)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or everything"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
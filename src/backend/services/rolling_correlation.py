@@ -0,0 +1,213 @@
+import math
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+def _missing(value) -> bool:
+    """None, NaN and infinities never enter the co-moments: they could not be removed again"""
+    return value is None or not math.isfinite(value)
+
+
+class RollingPairStats:
+    """
+    Fixed-window co-moments of one (x, y) series pair.
+
+    Means and second moments are maintained Welford-style, so adding a new
+    observation and dropping the oldest are both O(1) and numerically stable.
+    x is the weather variable and y the return, so slope is the return's
+    sensitivity to the weather variable.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2x = 0.0
+        self.m2y = 0.0
+        self.cxy = 0.0
+
+    def _add(self, x: float, y: float):
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2x += dx * (x - self.mean_x)
+        self.m2y += dy * (y - self.mean_y)
+        self.cxy += dx * (y - self.mean_y)
+
+    def _remove(self, x: float, y: float):
+        if self.n == 1:
+            self.n, self.mean_x, self.mean_y, self.m2x, self.m2y, self.cxy = 0, 0.0, 0.0, 0.0, 0.0, 0.0
+            return
+        old_mean_x, old_mean_y = self.mean_x, self.mean_y
+        self.n -= 1
+        self.mean_x = (old_mean_x * (self.n + 1) - x) / self.n
+        self.mean_y = (old_mean_y * (self.n + 1) - y) / self.n
+        self.m2x -= (x - self.mean_x) * (x - old_mean_x)
+        self.m2y -= (y - self.mean_y) * (y - old_mean_y)
+        self.cxy -= (x - self.mean_x) * (y - old_mean_y)
+
+    def update(self, x: float, y: float):
+        self.values.append((x, y))
+        self._add(x, y)
+        if len(self.values) > self.window:
+            self._remove(*self.values.popleft())
+
+    def result(self, min_periods: Optional[int] = None) -> Dict:
+        min_periods = self.window if min_periods is None else min_periods
+        stats = {"n": self.n, "correlation": None, "slope": None, "intercept": None, "r_squared": None}
+        if self.n < max(min_periods, 2) or self.m2x <= 0:
+            return stats
+        slope = self.cxy / self.m2x
+        stats["slope"] = slope
+        stats["intercept"] = self.mean_y - slope * self.mean_x
+        if self.m2y > 0:
+            correlation = max(-1.0, min(1.0, self.cxy / math.sqrt(self.m2x * self.m2y)))
+            stats["correlation"] = correlation
+            stats["r_squared"] = correlation * correlation
+        return stats
+
+
+class RollingCorrelationEngine:
+    """
+    Streaming rolling correlation/regression of ticker returns against
+    weather variables.
+
+    Price bars and weather observations arrive independently; each daily
+    return is paired with the same day's weather value as soon as both are
+    known, and every tracked (ticker, variable, window) is updated in O(1).
+    Observations for a pair must arrive in date order; stale dates are ignored.
+    """
+
+    def __init__(self, windows: Sequence[int] = (20, 60), pending_days: int = 10):
+        self.windows = tuple(windows)
+        self.pending_days = pending_days
+        self.pairs: Dict[Tuple[str, str], Dict[int, RollingPairStats]] = {}
+        self._last_paired: Dict[Tuple[str, str], pd.Timestamp] = {}
+        self._variables_by_ticker: Dict[str, List[str]] = {}
+        self._tickers_by_variable: Dict[str, List[str]] = {}
+        self._last_close: Dict[str, Tuple[pd.Timestamp, float]] = {}
+        self._returns: Dict[str, "OrderedDict[pd.Timestamp, float]"] = {}
+        self._weather: Dict[str, "OrderedDict[pd.Timestamp, float]"] = {}
+
+    def track(self, ticker: str, variable: str):
+        """Start maintaining statistics for a (ticker, weather variable) pair"""
+        key = (ticker, variable)
+        if key in self.pairs:
+            return
+        self.pairs[key] = {window: RollingPairStats(window) for window in self.windows}
+        self._variables_by_ticker.setdefault(ticker, []).append(variable)
+        self._tickers_by_variable.setdefault(variable, []).append(ticker)
+
+    def untrack(self, ticker: str, variable: str):
+        key = (ticker, variable)
+        if self.pairs.pop(key, None) is None:
+            return
+        self._last_paired.pop(key, None)
+        self._variables_by_ticker[ticker].remove(variable)
+        self._tickers_by_variable[variable].remove(ticker)
+
+    @staticmethod
+    def _remember(series: "OrderedDict", day: pd.Timestamp, value: float, limit: int):
+        series[day] = value
+        while len(series) > limit:
+            series.popitem(last=False)
+
+    def _pair(self, ticker: str, variable: str, day: pd.Timestamp) -> bool:
+        key = (ticker, variable)
+        last = self._last_paired.get(key)
+        if last is not None and day <= last:
+            return False
+        ret = self._returns.get(ticker, {}).get(day)
+        value = self._weather.get(variable, {}).get(day)
+        if ret is None or value is None:
+            return False
+        for stats in self.pairs[key].values():
+            stats.update(value, ret)
+        self._last_paired[key] = day
+        return True
+
+    def add_return(self, ticker: str, date, value: float) -> List[Tuple[str, str]]:
+        """Add a daily return; returns the (ticker, variable) pairs that changed"""
+        if _missing(value):
+            return []
+        day = pd.Timestamp(date).normalize()
+        self._remember(self._returns.setdefault(ticker, OrderedDict()), day, float(value), self.pending_days)
+        return [
+            (ticker, variable)
+            for variable in self._variables_by_ticker.get(ticker, [])
+            if self._pair(ticker, variable, day)
+        ]
+
+    def add_price(self, ticker: str, date, close: float) -> List[Tuple[str, str]]:
+        """Add a daily close; the return against the previous close is paired"""
+        if _missing(close):  # a missing close is skipped; the next return spans the gap
+            return []
+        day = pd.Timestamp(date).normalize()
+        previous = self._last_close.get(ticker)
+        if previous is not None and day <= previous[0]:
+            return []
+        self._last_close[ticker] = (day, float(close))
+        if previous is None or previous[1] == 0:
+            return []
+        return self.add_return(ticker, day, float(close) / previous[1] - 1)
+
+    def add_weather(self, variable: str, date, value: float) -> List[Tuple[str, str]]:
+        """Add a daily weather observation; returns the pairs that changed"""
+        if _missing(value):  # skip missing observations
+            return []
+        day = pd.Timestamp(date).normalize()
+        self._remember(self._weather.setdefault(variable, OrderedDict()), day, float(value), self.pending_days)
+        return [
+            (ticker, variable)
+            for ticker in self._tickers_by_variable.get(variable, [])
+            if self._pair(ticker, variable, day)
+        ]
+
+    def result(self, ticker: str, variable: str, window: Optional[int] = None) -> Dict:
+        """Current statistics for a pair, per window (or for one window)"""
+        stats = self.pairs[(ticker, variable)]
+        if window is not None:
+            return stats[window].result()
+        return {window: stat.result() for window, stat in stats.items()}
+
+    def results(self, keys: Optional[Iterable[Tuple[str, str]]] = None) -> Dict:
+        keys = self.pairs.keys() if keys is None else keys
+        return {key: self.result(*key) for key in keys}
+
+    def seed_pair(self, ticker: str, variable: str, history: pd.DataFrame):
+        """
+        Track a pair and fill its windows from aligned history, a (date x
+        [return, value]) frame. Lets a pair join while its ticker and
+        variable are already streaming for other pairs.
+        """
+        self.track(ticker, variable)
+        key = (ticker, variable)
+        history = history.dropna().sort_index()
+        last = self._last_paired.get(key)
+        if last is not None:
+            history = history[history.index > last]
+        for day, (ret, value) in zip(history.index, history.to_numpy(dtype=float)):
+            for stats in self.pairs[key].values():
+                stats.update(value, ret)
+            self._last_paired[key] = pd.Timestamp(day).normalize()
+
+    def bootstrap(self, returns: pd.DataFrame, weather: pd.DataFrame):
+        """
+        Seed the engine from aligned history: returns is (date x ticker),
+        weather is (date x variable). Every ticker x variable pair is tracked.
+        """
+        for ticker in returns.columns:
+            for variable in weather.columns:
+                self.track(ticker, variable)
+        returns, weather = returns.align(weather, join="inner", axis=0)
+        for day, ret_row, weather_row in zip(returns.index, returns.to_numpy(), weather.to_numpy()):
+            for variable, value in zip(weather.columns, weather_row):
+                self.add_weather(variable, day, value)
+            for ticker, value in zip(returns.columns, ret_row):
+                self.add_return(ticker, day, value)
@@ -1,50 +1,54 @@
-from transformers import pipeline
-import pandas as pd
-from typing import List, Dict
-import yfinance as yf
-import requests
+from typing import List, Dict, Optional
+import os
 from datetime import datetime, timedelta
 
+from ..config import NEWS_API_URL
+from ..nlp.sentiment import NLPAnalyzer
+from .http_client import AsyncHttpClient, get_http_client
+
+async def fetch_news_articles(query: str, start_date: datetime, end_date: datetime,
+                              api_key: Optional[str] = None,
+                              http_client: Optional[AsyncHttpClient] = None) -> List[Dict]:
+    """Fetch NewsAPI articles matching a query within a date range"""
+    http_client = http_client or get_http_client()
+    params = {
+        "q": query,
+        "from": start_date.strftime("%Y-%m-%d"),
+        "to": end_date.strftime("%Y-%m-%d"),
+        "language": "en",
+        "sortBy": "publishedAt",
+        "apiKey": api_key or os.getenv('NEWS_API_KEY')
+    }
+    
+    response = await http_client.get(NEWS_API_URL, params=params, raise_for_status=False)
+    if response.status_code == 200:
+        return response.json()['articles']
+    return []
+
 class SentimentAnalyzer:
-    def __init__(self):
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="ProsusAI/finbert"
-        )
+    def __init__(self, http_client: Optional[AsyncHttpClient] = None):
+        self.nlp_analyzer = NLPAnalyzer()
         self.news_api_key = os.getenv('NEWS_API_KEY')
+        self.http_client = http_client or get_http_client()
     
-    def analyze_news(self, ticker: str, days: int = 7) -> List[Dict]:
+    async def analyze_news(self, ticker: str, days: int = 7) -> List[Dict]:
         """Analyze news sentiment for a stock"""
-        news_articles = self._fetch_news(ticker, days)
-        sentiments = []
+        news_articles = await self._fetch_news(ticker, days)
+        results = self.nlp_analyzer.analyze_texts(
+            [article['title'] for article in news_articles]
+        )
         
-        for article in news_articles:
-            sentiment = self.sentiment_analyzer(article['title'])[0]
-            sentiments.append({
-                'date': article['publishedAt'],
-                'title': article['title'],
-                'sentiment': sentiment['label'],
-                'score': sentiment['score']
-            })
-            
-        return sentiments
+        return [{
+            'date': article['publishedAt'],
+            'title': article['title'],
+            'sentiment': sentiment['sentiment'],
+            'score': sentiment['score']
+        } for article, sentiment in zip(news_articles, results)]
     
-    def _fetch_news(self, ticker: str, days: int) -> List[Dict]:
+    async def _fetch_news(self, ticker: str, days: int) -> List[Dict]:
         """Fetch news articles for a stock"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
-        
-        url = "https://newsapi.org/v2/everything"
-        params = {
-            "q": ticker,
-            "from": start_date.strftime("%Y-%m-%d"),
-            "to": end_date.strftime("%Y-%m-%d"),
-            "language": "en",
-            "sortBy": "publishedAt",
-            "apiKey": self.news_api_key
-        }
-        
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json()['articles']
-        return []
\ No newline at end of file
+        return await fetch_news_articles(
+            ticker, start_date, end_date, self.news_api_key, self.http_client
+        )
@@ -0,0 +1,161 @@
+import io
+import json
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from starlette.responses import StreamingResponse
+
+from ..config import STREAM_CHUNK_ROWS
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MEDIA_TYPES = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    ARROW_MEDIA_TYPE: "arrow",
+}
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Response format for an Accept header: "json", "ndjson" or "arrow".
+
+    The acceptable media type with the highest q wins (ties keep header
+    order); JSON is the answer when the header is missing, is a wildcard or
+    names nothing streamable.
+    """
+    candidates = []
+    for position, part in enumerate((accept or "").split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type.lower() in MEDIA_TYPES and quality > 0:
+            candidates.append((-quality, position, MEDIA_TYPES[media_type.lower()]))
+    return min(candidates)[2] if candidates else "json"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    return str(value)
+
+
+def _dumps(value) -> bytes:
+    # NaN is not JSON; NumPy scalars and timestamps come out as plain values
+    return json.dumps(value, default=_json_default, allow_nan=False).encode() + b"\n"
+
+
+def _clean(value):
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    if isinstance(value, (float, np.floating)) and not np.isfinite(value):
+        return None
+    return value
+
+
+def _with_index(frame: pd.DataFrame) -> pd.DataFrame:
+    """The frame with a meaningful index (dates) moved into a leading column"""
+    if isinstance(frame.index, pd.RangeIndex):
+        return frame
+    return frame.reset_index(names=frame.index.name or "date")
+
+
+def _chunks(frame: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def ndjson_stream(summary: Dict, series: Dict[str, pd.DataFrame],
+                  chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    NDJSON lines: a {"type": "summary"} line, then per series a
+    {"type": "series"} header naming its columns and row count followed by
+    that many row objects. Rows are serialised a chunk at a time by pandas'
+    columnar JSON writer.
+    """
+    yield _dumps({"type": "summary", "data": _clean(summary)})
+    for name, frame in series.items():
+        frame = _with_index(frame)
+        yield _dumps({"type": "series", "name": name, "columns": [str(c) for c in frame.columns], "rows": len(frame)})
+        for chunk in _chunks(frame, chunk_rows):
+            text = chunk.to_json(orient="records", lines=True, date_format="iso", date_unit="s")
+            yield text.encode() if text.endswith("\n") else text.encode() + b"\n"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever the IPC writer produced since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def arrow_stream(summary: Dict, frame: pd.DataFrame, metadata: Optional[Dict] = None,
+                 chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    One frame as an Arrow IPC stream, a record batch per chunk. The summary
+    (and any extra metadata) travels as JSON in the schema metadata.
+    """
+    import pyarrow as pa
+
+    frame = _with_index(frame)
+    schema_metadata = {"summary": json.dumps(_clean(summary), default=_json_default)}
+    for key, value in (metadata or {}).items():
+        schema_metadata[key] = json.dumps(value, default=_json_default)
+    schema = pa.Schema.from_pandas(frame, preserve_index=False).with_metadata(schema_metadata)
+
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.drain()
+        for chunk in _chunks(frame, chunk_rows):
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_response(fmt: str, summary: Dict, series: Dict[str, pd.DataFrame],
+                    name: Optional[str] = None) -> StreamingResponse:
+    """
+    Streamed response for a negotiated non-JSON format. NDJSON carries every
+    series; an Arrow stream has a single schema, so it carries the named
+    series (the first by default) and lists the others in its metadata.
+    The generators are synchronous, so Starlette drains them in its
+    threadpool rather than on the event loop.
+    """
+    if fmt == "ndjson":
+        return StreamingResponse(ndjson_stream(summary, series), media_type=NDJSON_MEDIA_TYPE)
+    if fmt == "arrow":
+        name = name or next(iter(series), None)
+        if name not in series:
+            raise ValueError(f"Unknown series {name!r}; available: {', '.join(series) or 'none'}")
+        return StreamingResponse(
+            arrow_stream(summary, series[name], {"series": name, "available_series": list(series)}),
+            media_type=ARROW_MEDIA_TYPE,
+            headers={"Content-Disposition": f'inline; filename="{name}.arrows"'},
+        )
+    raise ValueError(f"Unsupported stream format: {fmt}")
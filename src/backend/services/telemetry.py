@@ -0,0 +1,244 @@
+import asyncio
+import functools
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers cache hits through slow upstream calls and model loads
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms, plus collectors that export the
+    stats() dicts components already keep (caches, batcher, WebSocket
+    manager) as gauges. Rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Tuple[str, Callable[[], Dict]]] = []
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def register_stats(self, prefix: str, stats: Callable[[], Dict]):
+        """
+        Export every number in stats() as a {prefix}_{key} gauge. A nested
+        dict becomes one gauge with its keys as the "key" label, e.g.
+        sentiment_batcher_batch_size_histogram{key="8"}.
+        """
+        self._collectors.append((prefix, stats))
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    @staticmethod
+    def _flatten(prefix: str, values: Dict, out: Dict[str, Dict[LabelKey, float]], path: Optional[str] = None):
+        # path is None for top-level keys (part of the name) and the "key" label built so far inside nested dicts
+        for key, value in values.items():
+            if path is None:
+                name, key_label = f"{prefix}_{key}", None
+            else:
+                name, key_label = prefix, f"{path}.{key}" if path else str(key)
+            if isinstance(value, dict):
+                MetricsRegistry._flatten(name, value, out, key_label or "")
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                labels = _label_key({} if key_label is None else {"key": key_label})
+                out.setdefault(_metric_name(name), {})[labels] = float(value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += count
+                        le = f'le="{bound}"'
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        gauges: Dict[str, Dict[LabelKey, float]] = {}
+        for prefix, stats in self._collectors:
+            try:
+                self._flatten(prefix, stats(), gauges)
+            except Exception:
+                continue  # one broken collector should not take the endpoint down
+        for name, series in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class Profile:
+    """Stage timings for one request, collected while profiling() is active"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: List[Dict] = []
+
+    def record(self, stage: str, start: float, duration: float, labels: Dict):
+        self.stages.append({
+            "stage": stage,
+            **{name: str(value) for name, value in labels.items()},
+            "start_ms": round((start - self.started) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+        })
+
+    def summary(self) -> Dict:
+        """
+        Every span in start order, plus total time per stage name. Stages
+        that ran concurrently overlap, so per-stage totals can exceed total_ms.
+        """
+        by_stage: Dict[str, float] = {}
+        for entry in self.stages:
+            by_stage[entry["stage"]] = round(by_stage.get(entry["stage"], 0.0) + entry["duration_ms"], 3)
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "by_stage": by_stage,
+            "stages": sorted(self.stages, key=lambda entry: entry["start_ms"]),
+        }
+
+
+_metrics = MetricsRegistry()
+_metrics.describe("stage_duration_seconds", "Time spent in each pipeline stage")
+_metrics.describe("stage_errors_total", "Pipeline stages that raised")
+_metrics.describe("external_requests_total", "Outbound HTTP requests by host and status")
+_metrics.describe("price_provider_calls_total", "Batched price provider fetches by provider")
+_metrics.describe("http_request_duration_seconds", "API request latency by route")
+_profile: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+
+
+def get_metrics() -> MetricsRegistry:
+    return _metrics
+
+
+def count(name: str, value: float = 1.0, **labels):
+    _metrics.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    _metrics.observe(name, value, **labels)
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """
+    Time a block into stage_duration_seconds{stage=...}, and into the
+    current request's profile if one is active. Works in sync and async
+    code; the profile follows asyncio tasks but not executor threads, so
+    wrap run_in_executor calls from the awaiting side.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        _metrics.inc("stage_errors_total", stage=stage, **labels)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _metrics.observe("stage_duration_seconds", duration, stage=stage, **labels)
+        profile = _profile.get()
+        if profile is not None:
+            profile.record(stage, start, duration, labels)
+
+
+def traced(stage: str):
+    """Decorator form of span() for sync and async functions"""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def profiling():
+    """Collect every span in this context (and tasks started from it) into a Profile"""
+    profile = Profile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
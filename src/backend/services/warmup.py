@@ -0,0 +1,59 @@
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def preload_modules(names: Iterable[str]) -> Callable[[], None]:
+    """A warm-up step importing heavy modules that request paths import lazily"""
+    names = list(names)
+
+    def step():
+        for name in names:
+            importlib.import_module(name)
+    return step
+
+
+class Warmup:
+    """
+    Named start-up steps (module imports, model loads) run in order off the
+    event loop, with per-step state so health and readiness checks can
+    report progress without waiting for it.
+    """
+
+    def __init__(self, steps: Optional[Dict[str, Callable[[], Any]]] = None):
+        self.steps: Dict[str, Callable[[], Any]] = {}
+        self.results: Dict[str, Dict] = {}
+        self.state = "idle"
+        for name, step in (steps or {}).items():
+            self.add(name, step)
+
+    def add(self, name: str, step: Callable[[], Any]):
+        self.steps[name] = step
+        self.results[name] = {"state": "pending"}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    async def run(self):
+        """Run every step; a failing step is recorded and the rest still run"""
+        self.state = "running"
+        loop = asyncio.get_running_loop()
+        for name, step in self.steps.items():
+            self.results[name] = {"state": "running"}
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(None, step)
+                self.results[name] = {"state": "ready", "seconds": round(time.perf_counter() - start, 3)}
+            except Exception as e:
+                logging.error(f"Warm-up step {name} failed: {str(e)}")
+                self.results[name] = {
+                    "state": "failed", "seconds": round(time.perf_counter() - start, 3), "error": str(e)
+                }
+        failed = any(result["state"] == "failed" for result in self.results.values())
+        self.state = "failed" if failed else "ready"
+
+    def status(self) -> Dict:
+        return {"state": self.state, "steps": dict(self.results)}
@@ -1,58 +1,68 @@
-import requests
+import asyncio
 from datetime import datetime, timedelta
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional
 import os
+import httpx
 from dotenv import load_dotenv
 
+from ..config import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_GEO_URL
+from .geocoding import Geocoder, get_geocoder
+from .http_client import AsyncHttpClient, get_http_client
+
 load_dotenv()
 
 class WeatherService:
-    def __init__(self):
-        self.api_key = os.getenv('837e3aa3e9bd23e14852820651a8b516')
-        self.base_url = "http://api.openweathermap.org/data/2.5"
+    def __init__(self, http_client: Optional[AsyncHttpClient] = None, geocoder: Optional[Geocoder] = None):
+        self.api_key = OPENWEATHER_API_KEY
+        self.base_url = OPENWEATHER_BASE_URL
+        self.geo_url = OPENWEATHER_GEO_URL
+        self.http_client = http_client or get_http_client()
+        self.geocoder = geocoder or get_geocoder()
         
-    def fetch_historical_weather(self, location: str, days: int = 30) -> List[Dict]:
+    async def fetch_historical_weather(self, location: str, days: int = 30) -> List[Dict]:
         """Fetch historical weather data"""
-        lat, lon = self._get_coordinates(location)
+        lat, lon = await self._get_coordinates(location)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        weather_data = []
-        current_date = start_date
+        dates = [start_date + timedelta(days=offset) for offset in range(days + 1)]
+        results = await asyncio.gather(*[
+            self._fetch_day(lat, lon, current_date) for current_date in dates
+        ])
+        return [result for result in results if result is not None]
 
-        while current_date <= end_date:
-            timestamp = int(current_date.timestamp())
-            url = f"{self.base_url}/onecall/timemachine"
-            params = {
-                "lat": lat,
-                "lon": lon,
-                "dt": timestamp,
-                "appid": self.api_key,
-                "units": "metric"
-            }
-            
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                weather_data.append(self._process_weather_data(data, current_date))
-            
-            current_date += timedelta(days=1)
-            
-        return weather_data
-    
-    def _get_coordinates(self, location: str) -> tuple:
-        """Get coordinates for a location"""
-        url = "http://api.openweathermap.org/geo/1.0/direct"
+    async def _fetch_day(self, lat: float, lon: float, current_date: datetime) -> Optional[Dict]:
+        """Fetch a single day, skipping days the API does not return"""
+        url = f"{self.base_url}/onecall/timemachine"
         params = {
-            "q": location,
-            "limit": 1,
-            "appid": self.api_key
+            "lat": lat,
+            "lon": lon,
+            "dt": int(current_date.timestamp()),
+            "appid": self.api_key,
+            "units": "metric"
         }
         
-        response = requests.get(url, params=params)
+        response = await self.http_client.get(url, params=params, raise_for_status=False)
         if response.status_code == 200:
-            data = response.json()
-            if data:
-                return data[0]["lat"], data[0]["lon"]
-        raise Exception(f"Could not find coordinates for {location}")
\ No newline at end of file
+            return self._process_weather_data(response.json(), current_date)
+        return None
+    
+    async def _get_coordinates(self, location: str) -> tuple:
+        """Get coordinates for a location"""
+        try:
+            coords = await self.geocoder.resolve(location)
+        except (ValueError, httpx.HTTPError):
+            raise Exception(f"Could not find coordinates for {location}")
+        return coords["lat"], coords["lon"]
+
+    def _process_weather_data(self, data: Dict, date: datetime) -> Dict:
+        """Process raw weather data into structured format"""
+        current = data.get("current", {})
+        return {
+            "date": date,
+            "temperature": current.get("temp"),
+            "humidity": current.get("humidity"),
+            "wind_speed": current.get("wind_speed"),
+            "weather_main": current.get("weather", [{}])[0].get("main")
+        }
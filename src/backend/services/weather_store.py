@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+from typing import Dict, List, Optional
+
+from ..config import WEATHER_STORE_PATH
+
+WEATHER_FIELDS = [
+    "temperature",
+    "feels_like",
+    "humidity",
+    "clouds",
+    "wind_speed",
+    "weather_main",
+    "weather_description",
+]
+
+
+class WeatherHistoryStore:
+    """
+    Persistent daily weather history keyed by (lat, lon, day).
+
+    Backed by a single SQLite file so repeated and overlapping date ranges
+    are served from disk, and only missing days go to the API.
+    """
+
+    def __init__(self, path: Optional[str] = None, precision: int = 2):
+        self.path = path or WEATHER_STORE_PATH
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(WEATHER_FIELDS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS weather_daily ("
+            f"lat REAL NOT NULL, lon REAL NOT NULL, day TEXT NOT NULL, {columns}, "
+            f"PRIMARY KEY (lat, lon, day))"
+        )
+        self._conn.commit()
+
+    def _key(self, coords: Dict[str, float]) -> tuple:
+        return round(coords["lat"], self.precision), round(coords["lon"], self.precision)
+
+    def get_days(self, coords: Dict[str, float], days: List[date]) -> Dict[date, Dict]:
+        """Return stored records for the requested days, keyed by day"""
+        if not days:
+            return {}
+        lat, lon = self._key(coords)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, {', '.join(WEATHER_FIELDS)} FROM weather_daily "
+                f"WHERE lat = ? AND lon = ? AND day BETWEEN ? AND ?",
+                (lat, lon, min(days).isoformat(), max(days).isoformat()),
+            ).fetchall()
+
+            wanted = set(days)
+            found = {}
+            for row in rows:
+                day = date.fromisoformat(row[0])
+                if day in wanted:
+                    found[day] = dict(zip(WEATHER_FIELDS, row[1:]))
+
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_days(self, coords: Dict[str, float], records: Dict[date, Dict]):
+        """Insert or replace daily records"""
+        if not records:
+            return
+        lat, lon = self._key(coords)
+        rows = [
+            (lat, lon, day.isoformat(), *[record.get(field) for field in WEATHER_FIELDS])
+            for day, record in records.items()
+        ]
+        placeholders = ", ".join("?" for _ in range(len(WEATHER_FIELDS) + 3))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO weather_daily VALUES ({placeholders})", rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Cache hit/miss counts in days"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
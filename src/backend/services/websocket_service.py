@@ -1,23 +1,244 @@
-from fastapi import WebSocket
-from typing import List
+from fastapi import WebSocket, WebSocketDisconnect
+from collections import OrderedDict
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Set
 import asyncio
 import json
+import logging
+
+from ..config import WS_CLIENT_QUEUE_SIZE, WS_SEND_TIMEOUT
+
+ALL_TOPICS = "*"
+
+
+def topic_name(kind: str, value: str) -> str:
+    """Normalized topic name, e.g. topic_name("ticker", "aapl") -> "ticker:AAPL" """
+    value = " ".join(value.split())
+    return f"{kind}:{value.upper() if kind == 'ticker' else value.casefold()}"
+
+
+def normalize_topic(name: str) -> Optional[str]:
+    """
+    Client-supplied topic in the form publishers use, e.g. "ticker:aapl" ->
+    "ticker:AAPL"; pair topics ("ticker:...|location:...") are normalized
+    part by part. None for anything that is not a known topic.
+    """
+    if name == ALL_TOPICS:
+        return name
+    parts = []
+    for part in name.split("|"):
+        kind, sep, value = part.partition(":")
+        kind = kind.strip().casefold()
+        if not sep or kind not in ("ticker", "location") or not value.strip():
+            return None
+        parts.append(topic_name(kind, value))
+    return "|".join(parts)
+
+
+class ClientConnection:
+    """
+    One WebSocket client with a bounded queue of outgoing messages, drained
+    by its own sender task so a slow client only ever delays itself.
+
+    A message enqueued with a coalesce key replaces a still-pending message
+    with the same key (e.g. the previous update for the same topic); when
+    the queue is full the oldest pending message is dropped.
+    """
+
+    _ids = count()
+
+    def __init__(self, websocket: WebSocket, max_queue: int = WS_CLIENT_QUEUE_SIZE,
+                 send_timeout: float = WS_SEND_TIMEOUT):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.topics: Set[str] = set()
+        self.pending: "OrderedDict[object, str]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.task: Optional[asyncio.Task] = None
+        self.receiver: Optional[asyncio.Task] = None
+
+    def enqueue(self, message: str, coalesce_key=None):
+        if self.closed:
+            return
+        if coalesce_key is not None and coalesce_key in self.pending:
+            del self.pending[coalesce_key]
+            self.coalesced += 1
+        key = coalesce_key if coalesce_key is not None else next(self._ids)
+        self.pending[key] = message
+        while len(self.pending) > self.max_queue:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.ready.set()
+
+    async def run(self):
+        """Send queued messages until the connection fails or is closed"""
+        while not self.closed:
+            if not self.pending:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            _, message = self.pending.popitem(last=False)
+            await asyncio.wait_for(self.websocket.send_text(message), timeout=self.send_timeout)
+            self.sent += 1
+
 
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        
-    async def connect(self, websocket: WebSocket):
+    """
+    Fan-out of JSON updates to many WebSocket clients.
+
+    broadcast() only appends the (already serialized) message to each
+    subscriber's queue and returns; every client's sender task then writes
+    at its own pace. Clients subscribe to topics such as "ticker:AAPL" or
+    "location:new york", or to "*" for everything. Connections whose sends
+    fail or time out are removed automatically.
+    """
+
+    def __init__(self, max_queue: int = WS_CLIENT_QUEUE_SIZE, send_timeout: float = WS_SEND_TIMEOUT):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        self.removed = 0
+        self.messages = 0
+        # Counts of disconnected clients, so totals in stats() never go backwards
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    async def connect(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None) -> ClientConnection:
         await websocket.accept()
-        self.active_connections.append(websocket)
-        
+        client = ClientConnection(websocket, self.max_queue, self.send_timeout)
+        self.connections[websocket] = client
+        self.subscribe(websocket, topics if topics is not None else [ALL_TOPICS])
+        client.task = asyncio.create_task(self._sender(client))
+        return client
+
+    async def _sender(self, client: ClientConnection):
+        try:
+            await client.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.info(f"Dropping WebSocket client: {type(e).__name__}: {e}")
+            self.disconnect(client.websocket)
+            # Close the socket as well, and stop serve() waiting on this client's next message
+            try:
+                await asyncio.wait_for(client.websocket.close(code=1011), timeout=self.send_timeout)
+            except Exception:
+                pass
+            if client.receiver is not None and not client.receiver.done():
+                client.receiver.cancel()
+
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-            
-    async def send_update(self, data: dict):
-        message = json.dumps(data)
-        await self.broadcast(message)
\ No newline at end of file
+        client = self.connections.pop(websocket, None)
+        if client is None:
+            return
+        client.closed = True
+        client.ready.set()
+        for name in client.topics:
+            subscribers = self.subscribers.get(name)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[name]
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        self.sent += client.sent
+        self.dropped += client.dropped
+        self.coalesced += client.coalesced
+        self.removed += 1
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        client = self.connections[websocket]
+        for name in topics:
+            client.topics.add(name)
+            self.subscribers.setdefault(name, set()).add(client)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        client = self.connections[websocket]
+        for name in topics:
+            client.topics.discard(name)
+            subscribers = self.subscribers.get(name)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[name]
+
+    async def broadcast(self, message: str, topic: Optional[str] = None, coalesce_key=None) -> int:
+        """Queue a serialized message for every subscriber of topic (every client if None)"""
+        if topic is None:
+            clients = self.connections.values()
+        else:
+            clients = self.subscribers.get(topic, set()) | self.subscribers.get(ALL_TOPICS, set())
+        for client in clients:
+            client.enqueue(message, coalesce_key)
+        self.messages += 1
+        return len(clients)
+
+    async def send_update(self, data: dict, topic: Optional[str] = None, coalesce: bool = True) -> int:
+        """
+        Serialize once and fan out. With coalesce, a client that has not yet
+        received the previous update for this topic only gets the newest.
+        """
+        message = json.dumps(data, default=str)
+        return await self.broadcast(message, topic, topic if coalesce and topic is not None else None)
+
+    async def serve(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None):
+        """
+        Run a client connection: accept it, then apply
+        {"action": "subscribe"|"unsubscribe", "topics": [...]} messages until
+        it disconnects. Topic names are normalized as publishers spell them;
+        unknown topics and malformed messages are ignored.
+        """
+        client = await self.connect(websocket, topics)
+        client.receiver = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = json.loads(await websocket.receive_text())
+                except json.JSONDecodeError:
+                    continue
+                # Anything but {"action": ..., "topics": [...]} is ignored
+                if not isinstance(request, dict) or not isinstance(request.get("topics", []), list):
+                    continue
+                names = [normalize_topic(name) for name in request.get("topics", []) if isinstance(name, str)]
+                names = [name for name in names if name is not None]
+                if request.get("action") == "subscribe":
+                    self.subscribe(websocket, names)
+                elif request.get("action") == "unsubscribe":
+                    self.unsubscribe(websocket, names)
+        except (WebSocketDisconnect, KeyError):
+            pass
+        except asyncio.CancelledError:
+            # The sender dropped this client after a failed send; any other cancellation propagates
+            if not client.closed:
+                raise
+            asyncio.current_task().uncancel()
+        finally:
+            self.disconnect(websocket)
+
+    async def close(self):
+        for websocket in list(self.connections):
+            self.disconnect(websocket)
+
+    def stats(self) -> Dict:
+        clients = list(self.connections.values())
+        return {
+            "connections": len(clients),
+            "topics": len(self.subscribers),
+            "messages": self.messages,
+            "queued": sum(len(client.pending) for client in clients),
+            "sent": self.sent + sum(client.sent for client in clients),
+            "dropped": self.dropped + sum(client.dropped for client in clients),
+            "coalesced": self.coalesced + sum(client.coalesced for client in clients),
+            "removed": self.removed,
+        }
@@ -0,0 +1,51 @@
+"""Run from the repository root: python -m pytest src/backend/tests"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.backend.services.price_store import FixtureProvider, PriceStore
+
+
+def write_price_fixtures(directory, tickers, start, end):
+    """Daily OHLCV as <TICKER>.csv, the format FixtureProvider reads"""
+    directory.mkdir(parents=True, exist_ok=True)
+    days = pd.bdate_range(start, end, name="Date")
+    close = 100 + np.arange(len(days), dtype=float)
+    for ticker in tickers:
+        frame = pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000}, index=days
+        )
+        frame.to_csv(directory / f"{ticker}.csv")
+
+
+def make_store(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    write_price_fixtures(fixtures, ["AAPL"], date(2019, 1, 1), date(2023, 1, 1))
+    provider = FixtureProvider(str(fixtures))
+    return PriceStore(provider=provider, root=str(tmp_path / "store"), refresh_seconds=0), provider
+
+
+def test_disjoint_requests_keep_coverage_contiguous(tmp_path):
+    store, provider = make_store(tmp_path)
+    store.get("AAPL", date(2020, 1, 1), date(2020, 2, 1))
+    store.get("AAPL", date(2022, 1, 1), date(2022, 2, 1))
+
+    expected = provider.fetch(["AAPL"], date(2020, 1, 1), date(2022, 2, 1))["AAPL"]
+    calls = provider.calls
+    bars = store.get("AAPL", date(2020, 1, 1), date(2022, 2, 1))
+
+    assert provider.calls == calls  # fully covered by now, so served from the store
+    assert len(bars) == len(expected)
+    assert bars.index.equals(expected.index)
+
+
+def test_request_before_coverage_fetches_only_the_front_gap(tmp_path):
+    store, provider = make_store(tmp_path)
+    store.get("AAPL", date(2022, 1, 1), date(2022, 2, 1))
+    store.get("AAPL", date(2020, 1, 1), date(2020, 2, 1))
+
+    expected = provider.fetch(["AAPL"], date(2020, 1, 1), date(2022, 2, 1))["AAPL"]
+    calls = provider.calls
+    assert len(store.get("AAPL", date(2020, 1, 1), date(2022, 2, 1))) == len(expected)
+    assert provider.calls == calls
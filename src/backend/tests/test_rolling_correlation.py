@@ -0,0 +1,53 @@
+"""Run from the repository root: python -m pytest src/backend/tests"""
+import numpy as np
+import pandas as pd
+
+from src.backend.services.rolling_correlation import RollingCorrelationEngine
+
+WINDOW = 20
+
+
+def feed(engine, closes, temperatures, days):
+    for day, close, temperature in zip(days, closes, temperatures):
+        engine.add_weather("temperature", day, temperature)
+        engine.add_price("AAPL", day, close)
+
+
+def test_incremental_matches_batch_over_window():
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2024-01-01", periods=300)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    temperatures = rng.normal(15, 5, len(days))
+    engine = RollingCorrelationEngine(windows=(WINDOW,))
+    engine.track("AAPL", "temperature")
+
+    for i, (day, close, temperature) in enumerate(zip(days, closes, temperatures)):
+        engine.add_weather("temperature", day, temperature)
+        engine.add_price("AAPL", day, close)
+        if i < WINDOW:
+            continue
+        returns = closes[i - WINDOW + 1:i + 1] / closes[i - WINDOW:i] - 1
+        window_temperatures = temperatures[i - WINDOW + 1:i + 1]
+        result = engine.result("AAPL", "temperature", WINDOW)
+        expected = np.corrcoef(window_temperatures, returns)[0, 1]
+        slope, intercept = np.polyfit(window_temperatures, returns, 1)
+        assert result["n"] == WINDOW
+        assert abs(result["correlation"] - expected) < 1e-9
+        assert abs(result["slope"] - slope) < 1e-9
+        assert abs(result["intercept"] - intercept) < 1e-9
+
+
+def test_missing_closes_do_not_poison_the_window():
+    rng = np.random.default_rng(1)
+    days = pd.bdate_range("2024-01-01", periods=120)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    closes[30] = np.nan
+    closes[31] = np.inf
+    engine = RollingCorrelationEngine(windows=(WINDOW,))
+    engine.track("AAPL", "temperature")
+    feed(engine, closes, rng.normal(15, 5, len(days)), days)
+
+    result = engine.result("AAPL", "temperature", WINDOW)
+    assert result["n"] == WINDOW
+    assert result["correlation"] is not None and np.isfinite(result["correlation"])
+    assert engine.add_return("AAPL", days[-1] + pd.Timedelta(days=1), float("nan")) == []